@@ -1,3 +1,5 @@
+import os
+
 # Configurações da aplicação
 APP_CONFIG = {
     'title': 'Análise do Titanic',
@@ -20,7 +22,98 @@ PLOT_CONFIG = {
     'style': 'seaborn',
     'palette': ['#1e3a8a', '#3b82f6', '#60a5fa', '#93c5fd'],
     'background': '#ffffff',
-    'grid_color': '#f3f4f6'
+    'grid_color': '#f3f4f6',
+    'chart_backend': 'vega-lite'
+}
+
+# Qualidade de renderização: pré-visualização rápida por omissão, resolução total a pedido
+RENDER_QUALITIES = {
+    'Pré-visualização': {'format': 'png', 'dpi': 80},
+    'Vectorial (SVG)': {'format': 'svg', 'dpi': 72},
+    'Alta resolução': {'format': 'png', 'dpi': 200},
+}
+DEFAULT_RENDER_QUALITY = 'Pré-visualização'
+
+# Cache de gráficos renderizados (memória e, opcionalmente, disco)
+CHART_CACHE_CONFIG = {
+    'max_items': 256,
+    'max_bytes': 64 * 1024 * 1024,
+    'disk_dir': os.environ.get('TITANIC_CHART_CACHE_DIR'),
+}
+
+# Renderização paralela de figuras ('thread' ou 'process')
+RENDER_CONFIG = {
+    'mode': os.environ.get('TITANIC_RENDER_MODE', 'thread'),
+    'max_workers': 4,
+}
+
+# Cache de modelos treinados (por dados, tipo de modelo, hiperparâmetros e semente)
+MODEL_CACHE_CONFIG = {
+    'max_items': 64,
+    # Alguns resultados incluem modelos e índices ajustados em conjuntos sintéticos de milhões de linhas
+    'max_bytes': 256 * 1024 * 1024,
+}
+
+# Pré-cálculo da grelha de hiperparâmetros num pool de processos
+GRID_CONFIG = {
+    'max_workers': None,
+    'max_jobs': 4,
+}
+
+# Auto-ajuste por divisões sucessivas: factor de eliminação, fracção inicial do treino
+# e número de configurações por tarefa do pool
+AUTO_TUNE_CONFIG = {
+    'eta': 3,
+    'min_fraction': 0.1,
+    'chunk_size': 20,
+}
+
+# Validação cruzada: número de partições e threads do pool partilhado
+CV_CONFIG = {
+    'folds': 5,
+    'max_workers': 4,
+}
+
+# Índice aproximado de vizinhos do KNN (floresta de projecções aleatórias)
+ANN_CONFIG = {
+    'n_trees': 8,
+    'leaf_size': 32,
+    'scale_rows': [100_000, 1_000_000],
+}
+
+# Gradient boosting com histogramas (paragem antecipada e tamanhos da comparação de tempo e memória)
+HGB_CONFIG = {
+    'validation_fraction': 0.1,
+    'n_iter_no_change': 10,
+    'benchmark_rows': [100_000, 1_000_000],
+}
+
+# Treino incremental (partial_fit) sobre fluxos de blocos
+OUT_OF_CORE_CONFIG = {
+    'chunksize': 100_000,
+    'holdout_fraction': 0.1,
+    'max_holdout_rows': 50_000,
+    'stream_rows': [100_000, 1_000_000, 10_000_000],
+}
+
+# Pipeline de preparação das características (as transformações ajustadas ficam em cache no disco)
+FEATURE_PIPELINE_CONFIG = {
+    'memory_dir': os.environ.get('TITANIC_PIPELINE_CACHE_DIR', 'pipeline_cache'),
+    'max_matrices': 4,
+}
+
+# Registo local de modelos treinados (limitado em tamanho; remove os usados há mais tempo)
+REGISTRY_CONFIG = {
+    'dir': os.environ.get('TITANIC_MODEL_REGISTRY_DIR', 'model_registry'),
+    'max_bytes': 200 * 1024 * 1024,
+}
+
+# Bundle de recursos estáticos (python -m utils.static_assets build)
+STATIC_ASSETS_CONFIG = {
+    'dir': os.environ.get('TITANIC_STATIC_DIR', 'static_build'),
+    'modules': [
+        'pages.exploratory_analysis_data.survival.general_survival',
+    ],
 }
 
 # Variáveis globais
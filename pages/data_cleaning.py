@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from utils.data_loader import load_data
+from utils.downloads import download_dataframe
+from utils.tables import paginated_table
+from utils.layout import lazy_tabs
 
 def show_initial_state(data):
     st.subheader("Estado Inicial dos Dados")
@@ -15,35 +18,84 @@ def show_initial_state(data):
         'Percentagem (%)': (data.isnull().sum() / len(data) * 100).round(2)
     }).reset_index(drop=True)
 
-    styled_missing_values = (
-        missing_values.style
-        .background_gradient(subset=['Valores em Falta'], cmap='Reds')
-        .format({'Percentagem (%)': "{:.2f}%"})
-        .set_table_styles([
-            {'selector': 'thead th', 'props': [('background-color', '#f7f7f7'), ('font-weight', 'bold')]},
-            {'selector': 'tbody td', 'props': [('text-align', 'center')]},
-        ])
-    )
+    paginated_table(missing_values, key='initial_state_table',
+                    gradients={'Valores em Falta': 'Reds'},
+                    formats={'Percentagem (%)': "{:.2f}%"})
 
-    st.dataframe(styled_missing_values, use_container_width=True)
+def handle_missing_values(data):
+    """Trata os valores em falta e devolve os dados e um resumo das alterações"""
+    data = data.copy()
 
-def process_missing_values(data):
-    st.subheader("Tratamento de Valores em Falta")
-
-    st.subheader("Variável 'Age'")
     age_median = data['Age'].median()
     data['Age'] = data['Age'].fillna(age_median)
-    st.metric("Idade Mediana Utilizada", f"{age_median:.2f}")
 
-    st.subheader("Variável 'Embarked'")
     n_missing_embarked = data['Embarked'].isnull().sum()
     data = data.dropna(subset=['Embarked'])
-    st.metric("Registos Removidos (Embarked)", n_missing_embarked)
 
-    st.subheader("Variável 'Cabin'")
     n_missing_cabin = data['Cabin'].isnull().sum()
     data.loc[:, 'Cabin'] = data['Cabin'].fillna('Desconhecido')
-    st.metric("Valores Substituídos por 'Desconhecido'", n_missing_cabin)
+
+    return data, {
+        'age_median': age_median,
+        'n_missing_embarked': n_missing_embarked,
+        'n_missing_cabin': n_missing_cabin,
+    }
+
+def encode_categorical(data):
+    """Codifica 'Sex' (0/1) e cria as variáveis dummy de 'Embarked'"""
+    data = data.copy()
+    data['Sex'] = data['Sex'].map({'male': 0, 'female': 1})
+    data = pd.get_dummies(data, columns=['Embarked'], prefix='Embarked', drop_first=False)
+    return data
+
+def add_derived_variables(data):
+    """Cria as variáveis 'FamilySize' e 'IsAlone'"""
+    data = data.copy()
+    data['FamilySize'] = data['SibSp'] + data['Parch']
+    data['IsAlone'] = (data['FamilySize'] == 0).astype(int)
+    return data
+
+def categorize_age(age):
+    if age <= 17:
+        return 'Criança (0-17)'
+    elif age <= 64:
+        return 'Adulto (18-64)'
+    else:
+        return 'Idoso (65+)'
+
+def add_age_category(data):
+    """Cria a variável 'FaixaEtaria' a partir da idade"""
+    data = data.copy()
+    data['FaixaEtaria'] = data['Age'].apply(categorize_age)
+    return data
+
+# Transformações aplicadas em sequência pelos separadores da página
+TRANSFORMATIONS = [
+    lambda data: handle_missing_values(data)[0],
+    encode_categorical,
+    add_derived_variables,
+    add_age_category,
+]
+
+def apply_transformations(data, n_steps):
+    """Aplica, sem apresentar nada, as primeiras `n_steps` transformações"""
+    for transform in TRANSFORMATIONS[:n_steps]:
+        data = transform(data)
+    return data
+
+def process_missing_values(data):
+    st.subheader("Tratamento de Valores em Falta")
+
+    data, summary = handle_missing_values(data)
+
+    st.subheader("Variável 'Age'")
+    st.metric("Idade Mediana Utilizada", f"{summary['age_median']:.2f}")
+
+    st.subheader("Variável 'Embarked'")
+    st.metric("Registos Removidos (Embarked)", summary['n_missing_embarked'])
+
+    st.subheader("Variável 'Cabin'")
+    st.metric("Valores Substituídos por 'Desconhecido'", summary['n_missing_cabin'])
 
     st.metric("Número de Registos Após Tratamento", len(data))
     return data
@@ -51,31 +103,29 @@ def process_missing_values(data):
 def encode_categorical_variables(data):
     st.subheader("Codificação de Variáveis Categóricas")
 
+    data = encode_categorical(data)
+
     st.subheader("Variável 'Sex'")
-    data['Sex'] = data['Sex'].map({'male': 0, 'female': 1})
     st.metric("Masculino (0)", data['Sex'].value_counts()[0])
     st.metric("Feminino (1)", data['Sex'].value_counts()[1])
 
     st.subheader("Variável 'Embarked'")
-    data = pd.get_dummies(data, columns=['Embarked'], prefix='Embarked', drop_first=False)
     dummy_columns = [col for col in data.columns if 'Embarked_' in col]
     st.write("**Novas Colunas Criadas:**", ', '.join(dummy_columns))
     st.dataframe(data.head())
 
     return data
 
-import matplotlib.pyplot as plt
-
 def create_derived_variables(data):
     st.subheader("Criação de Variáveis Derivadas")
 
+    data = add_derived_variables(data)
+
     st.subheader("Variável 'FamilySize'")
-    data['FamilySize'] = data['SibSp'] + data['Parch']
     st.write("**Exemplo de Registos com a Nova Variável 'FamilySize':**")
     st.dataframe(data[['SibSp', 'Parch', 'FamilySize']].head())
 
     st.subheader("Variável 'IsAlone'")
-    data['IsAlone'] = (data['FamilySize'] == 0).astype(int)
     st.write("**Exemplo de Registos com a Nova Variável 'IsAlone':**")
     st.dataframe(data[['FamilySize', 'IsAlone']].head())
 
@@ -86,15 +136,7 @@ def create_derived_variables(data):
 def create_age_category(data):
     st.subheader("Criação de Variável 'Faixa Etária'")
 
-    def categorize_age(age):
-        if age <= 17:
-            return 'Criança (0-17)'
-        elif age <= 64:
-            return 'Adulto (18-64)'
-        else:
-            return 'Idoso (65+)'
-
-    data['FaixaEtaria'] = data['Age'].apply(categorize_age)
+    data = add_age_category(data)
 
     st.write("**Exemplo de Registos com a Nova Variável 'Faixa Etária':**")
     st.dataframe(data[['Age', 'FaixaEtaria']].head())
@@ -111,12 +153,8 @@ def show_final_summary(data):
     - Variáveis derivadas criadas (FamilySize, IsAlone, FaixaEtaria)
     """)
 
-    st.download_button(
-        label="📥 Transferir Dados Processados (CSV)",
-        data=data.to_csv(index=False).encode('utf-8'),
-        file_name='titanic_processed.csv',
-        mime='text/csv',
-    )
+    download_dataframe("📥 Transferir Dados Processados", data,
+                       file_name='titanic_processed', key='download_processed_data')
 
 def show():
     st.title("🧹 Limpeza e Transformação de Dados")
@@ -131,25 +169,14 @@ def show():
 
     data = load_data()
 
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "Valores em Falta",
-        "Codificação de Variáveis",
-        "Variáveis Derivadas",
-        "Faixa Etária",
-        "Resumo Final"
-    ])
-
-    with tab1:
-        show_initial_state(data)
-    with tab2:
-        data = process_missing_values(data)
-    with tab3:
-        data = encode_categorical_variables(data)
-    with tab4:
-        data = create_derived_variables(data)
-        data = create_age_category(data)
-    with tab5:
-        show_final_summary(data)
+    # Cada separador aplica silenciosamente os passos anteriores e só apresenta o seu
+    lazy_tabs({
+        "Valores em Falta": lambda: show_initial_state(data),
+        "Codificação de Variáveis": lambda: process_missing_values(data),
+        "Variáveis Derivadas": lambda: encode_categorical_variables(apply_transformations(data, 1)),
+        "Faixa Etária": lambda: create_age_category(create_derived_variables(apply_transformations(data, 2))),
+        "Resumo Final": lambda: show_final_summary(apply_transformations(data, 4)),
+    }, key='data_cleaning_tabs')
 
 if __name__ == "__main__":
     show()
\ No newline at end of file
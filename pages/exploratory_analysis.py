@@ -1,22 +1,30 @@
 import streamlit as st
 from utils.data_loader import load_data
 from utils.data_processor import clean_data
-from pages.exploratory_analysis_data.distributions import (
-    age_analysis,
-    fare_analysis,
-    family_analysis,
-    gender_analysis
-)
-from pages.exploratory_analysis_data.survival import (
-    general_survival,
-    age_survival,
-    gender_survival,
-    class_survival,
-    family_survival,
-    port_survival,
-    combined_survival
-)
-from pages.exploratory_analysis_data import correlation_analysis
+from utils.layout import lazy_tabs
+from utils.lazy_loader import import_timed
+
+# Cada análise só é importada (com o matplotlib/seaborn) quando é seleccionada
+_PACKAGE = 'pages.exploratory_analysis_data'
+
+DISTRIBUTION_MODULES = {
+    "Idade": f"{_PACKAGE}.distributions.age_analysis",
+    "Tarifas": f"{_PACKAGE}.distributions.fare_analysis",
+    "Dimensão das Famílias": f"{_PACKAGE}.distributions.family_analysis",
+    "Sexo": f"{_PACKAGE}.distributions.gender_analysis",
+}
+
+SURVIVAL_MODULES = {
+    "Geral": f"{_PACKAGE}.survival.general_survival",
+    "Por Faixa Etária": f"{_PACKAGE}.survival.age_survival",
+    "Por Sexo": f"{_PACKAGE}.survival.gender_survival",
+    "Por Classe": f"{_PACKAGE}.survival.class_survival",
+    "Por Dimensão de Família": f"{_PACKAGE}.survival.family_survival",
+    "Por Porto de Embarque": f"{_PACKAGE}.survival.port_survival",
+    "Análise Combinada": f"{_PACKAGE}.survival.combined_survival",
+}
+
+CORRELATION_MODULE = f"{_PACKAGE}.correlation_analysis"
 
 def show():
     st.title("📊 Análise Exploratória")
@@ -32,20 +40,11 @@ def show():
     data = load_data()
     data = clean_data(data)
 
-    tab1, tab2, tab3 = st.tabs([
-        "Distribuições",
-        "Relações de Sobrevivência",
-        "Correlações"
-    ])
-
-    with tab1:
-        _show_distributions_analysis(data)
-
-    with tab2:
-        _show_survival_analysis(data)
-
-    with tab3:
-        correlation_analysis.show(data)
+    lazy_tabs({
+        "Distribuições": lambda: _show_distributions_analysis(data),
+        "Relações de Sobrevivência": lambda: _show_survival_analysis(data),
+        "Correlações": lambda: import_timed(CORRELATION_MODULE).show(data),
+    }, key='exploratory_analysis_tabs')
 
     return data
 
@@ -57,17 +56,10 @@ def _show_distributions_analysis(data):
 
     distribution_type = st.selectbox(
         "Escolha a distribuição para analisar:",
-        ["Idade", "Tarifas", "Dimensão das Famílias", "Sexo"]
+        list(DISTRIBUTION_MODULES.keys())
     )
 
-    if distribution_type == "Idade":
-        age_analysis.show(data)
-    elif distribution_type == "Tarifas":
-        fare_analysis.show(data)
-    elif distribution_type == "Dimensão das Famílias":
-        family_analysis.show(data)
-    elif distribution_type == "Sexo":
-        gender_analysis.show(data)
+    import_timed(DISTRIBUTION_MODULES[distribution_type]).show(data)
 
 def _show_survival_analysis(data):
     st.subheader("Análise de Sobrevivência")
@@ -77,31 +69,10 @@ def _show_survival_analysis(data):
 
     survival_type = st.selectbox(
         "Escolha o tipo de análise de sobrevivência:",
-        [
-            "Geral",
-            "Por Faixa Etária",
-            "Por Sexo",
-            "Por Classe",
-            "Por Dimensão de Família",
-            "Por Porto de Embarque",
-            "Análise Combinada"
-        ]
+        list(SURVIVAL_MODULES.keys())
     )
 
-    if survival_type == "Geral":
-        general_survival.show(data)
-    elif survival_type == "Por Faixa Etária":
-        age_survival.show(data)
-    elif survival_type == "Por Sexo":
-        gender_survival.show(data)
-    elif survival_type == "Por Classe":
-        class_survival.show(data)
-    elif survival_type == "Por Dimensão de Família":
-        family_survival.show(data)
-    elif survival_type == "Por Porto de Embarque":
-        port_survival.show(data)
-    else:
-        combined_survival.show(data)
+    import_timed(SURVIVAL_MODULES[survival_type]).show(data)
 
 if __name__ == "__main__":
     show()
\ No newline at end of file
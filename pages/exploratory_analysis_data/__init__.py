@@ -1,21 +1,20 @@
-from pages.exploratory_analysis_data.distributions import (
-    age_analysis,
-    fare_analysis,
-    family_analysis,
-    gender_analysis
-)
+from utils.lazy_loader import lazy_submodules
 
-from pages.exploratory_analysis_data.survival import (
-    general_survival,
-    age_survival,
-    gender_survival,
-    class_survival,
-    family_survival,
-    port_survival,
-    combined_survival
-)
-
-from pages.exploratory_analysis_data import correlation_analysis
+# Submódulos expostos pelo pacote, com o caminho relativo de cada um
+_SUBMODULES = {
+    'age_analysis': 'distributions.age_analysis',
+    'fare_analysis': 'distributions.fare_analysis',
+    'family_analysis': 'distributions.family_analysis',
+    'gender_analysis': 'distributions.gender_analysis',
+    'general_survival': 'survival.general_survival',
+    'age_survival': 'survival.age_survival',
+    'gender_survival': 'survival.gender_survival',
+    'class_survival': 'survival.class_survival',
+    'family_survival': 'survival.family_survival',
+    'port_survival': 'survival.port_survival',
+    'combined_survival': 'survival.combined_survival',
+    'correlation_analysis': 'correlation_analysis',
+}
 
 __all__ = [
     'age_analysis',
@@ -30,4 +29,7 @@ __all__ = [
     'port_survival',
     'combined_survival',
     'correlation_analysis'
-]
\ No newline at end of file
+]
+
+# Os submódulos só são importados quando acedidos
+__getattr__ = lazy_submodules(__name__, _SUBMODULES)
@@ -2,9 +2,10 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage, new_offscreen_figure
+from utils.render_executor import figure_spec, render_async, show_rendered
+from utils.layout import lazy_tabs, selected_section
 
 
 def show(data):
@@ -22,48 +23,39 @@ def show(data):
                     'Fare', 'FamilySize', 'IsAlone']
     correlation_data = data[numeric_vars]
 
-    # Secção de Visualizações Principais
-    st.markdown("### Visualizações Principais")
-    tab1, tab2 = st.tabs(["Matriz de Correlação", "Correlações com Sobrevivência"])
-
-    with tab1:
-        _show_correlation_matrix(correlation_data)
+    # Só os gráficos dos separadores seleccionados são rasterizados, todos de uma vez no
+    # executor de renderização; cada separador espera apenas pelo seu
+    main = selected_section(MAIN_SECTIONS, 'correlation_analysis_main')
+    detail = selected_section(DETAIL_SECTIONS, 'correlation_analysis_details')
+    specs = {'detail': _detail_spec(detail, data)}
+    if main == "Matriz de Correlação":
+        specs['heatmap'] = figure_spec('correlation_analysis.heatmap', _build_correlation_heatmap,
+                                       correlation_data.corr())
+    charts = dict(zip(specs, render_async(list(specs.values()))))
 
-    with tab2:
-        _show_survival_correlations(correlation_data)
+    st.markdown("### Visualizações Principais")
+    lazy_tabs({
+        "Matriz de Correlação": lambda: _show_correlation_matrix(charts['heatmap']),
+        "Correlações com Sobrevivência": lambda: _show_survival_correlations(correlation_data),
+    }, key='correlation_analysis_main')
 
     # Análises Detalhadas
     st.markdown("### Análises Detalhadas")
-    _show_detailed_analysis(data)
+    lazy_tabs({label: lambda: _show_detail(charts['detail'], DETAIL_SECTIONS[detail]['observations'])
+               for label in DETAIL_SECTIONS}, key='correlation_analysis_details')
 
     # Conclusões
     st.markdown("### Conclusões")
     _show_insights()
 
 
-def _show_correlation_matrix(correlation_data):
+def _show_correlation_matrix(heatmap):
     """Apresenta matriz de correlação entre todas as variáveis"""
     st.markdown("#### Matriz de Correlação Geral")
-
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        # Calcular matriz de correlação
-        correlation_matrix = correlation_data.corr()
-
-        # Criar mapa de calor
-        fig, ax = plt.subplots(figsize=(10, 8))
-        sns.heatmap(correlation_matrix,
-                    annot=True,
-                    cmap='RdYlBu_r',
-                    center=0,
-                    fmt='.2f',
-                    square=True)
-
-        plt.title('Matriz de Correlação entre Variáveis',
-                  pad=20, fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        st.pyplot(fig)
+        show_rendered(heatmap)
 
     with col2:
         st.markdown("""
@@ -135,54 +127,41 @@ def _show_survival_correlations(correlation_data):
         """)
 
 
-def _show_detailed_analysis(data):
-    """Apresenta análise detalhada das correlações mais importantes"""
-    tab1, tab2, tab3 = st.tabs([
-        "Sexo vs. Classe",
-        "Idade vs. Tarifa",
-        "Família vs. Tarifa"
-    ])
-
-    with tab1:
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            _plot_sex_class_correlation(data)
-        with col2:
-            st.markdown("""
-            **Observações:**
-            - Maior proporção de mulheres na 1.ª classe
-            - 3.ª classe predominantemente masculina
-            - Distribuição mais equilibrada na 2.ª classe
-            """)
-
-    with tab2:
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            _plot_age_fare_correlation(data)
-        with col2:
-            st.markdown("""
-            **Observações:**
-            - Tarifas mais elevadas para passageiros mais velhos
-            - Maior variação de tarifas na 1.ª classe
-            - Padrão de sobrevivência mais claro por faixa de preço
-            """)
-
-    with tab3:
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            _plot_family_fare_correlation(data)
-        with col2:
-            st.markdown("""
-            **Observações:**
-            - Famílias maiores tendem a pagar tarifas mais elevadas
-            - Possível relação com cabinas maiores
-            - Descontos para grupos podem influenciar
-            """)
+def _detail_spec(label, data):
+    """Especificação do gráfico da análise detalhada seleccionada"""
+    section = DETAIL_SECTIONS[label]
+    return figure_spec(section['chart_id'], section['builder'], data[section['columns']])
 
 
-def _plot_sex_class_correlation(data):
-    """Apresenta correlação entre sexo e classe"""
-    fig, ax = plt.subplots(figsize=(10, 6))
+def _show_detail(chart, observations):
+    """Apresenta um gráfico de detalhe com as respectivas observações ao lado"""
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        show_rendered(chart)
+    with col2:
+        st.markdown(observations)
+
+
+def _build_correlation_heatmap(correlation_matrix):
+    """Constrói o mapa de calor da matriz de correlação"""
+    fig, ax = new_offscreen_figure(figsize=(10, 8))
+    sns.heatmap(correlation_matrix,
+                annot=True,
+                cmap='RdYlBu_r',
+                center=0,
+                fmt='.2f',
+                square=True,
+                ax=ax)
+
+    ax.set_title('Matriz de Correlação entre Variáveis',
+                 pad=20, fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+def _build_sex_class_correlation(data):
+    """Constrói a correlação entre sexo e classe"""
+    fig, ax = new_offscreen_figure(figsize=(10, 6))
 
     # Verificar e limpar dados, removendo valores nulos
     data_cleaned = data[['Pclass', 'Sex']].dropna()
@@ -213,16 +192,15 @@ def _plot_sex_class_correlation(data):
     # Ajustar estilo do gráfico
     ax.grid(True, linestyle='--', alpha=0.7, color='#CCCCCC')
 
-    # Apresentar gráfico no Streamlit
-    st.pyplot(fig)
+    return fig
 
 
-def _plot_age_fare_correlation(data):
-    """Apresenta correlação entre idade e tarifa"""
-    fig, ax = plt.subplots(figsize=(10, 6))
+def _build_age_fare_correlation(data):
+    """Constrói a correlação entre idade e tarifa"""
+    fig, ax = new_offscreen_figure(figsize=(10, 6))
 
-    # Certificar-se de que 'Survived' tem valores consistentes
-    data['Survived'] = data['Survived'].map({0: 'Não Sobreviveu', 1: 'Sobreviveu'})
+    # Rótulos legíveis para a legenda, sem alterar os dados originais
+    data = data.assign(Survived=data['Survived'].map({0: 'Não Sobreviveu', 1: 'Sobreviveu'}))
 
     # Usar uma paleta de cores que combine com a legenda
     sns.scatterplot(data=data,
@@ -230,7 +208,8 @@ def _plot_age_fare_correlation(data):
                     y='Fare',
                     hue='Survived',
                     palette=[COLORS['negative'], COLORS['primary']],
-                    alpha=0.6)
+                    alpha=0.6,
+                    ax=ax)
 
     set_plot_style(
         ax,
@@ -238,14 +217,14 @@ def _plot_age_fare_correlation(data):
         'Idade',
         'Tarifa (£)'
     )
-    plt.legend(title='Sobrevivência')
+    ax.legend(title='Sobrevivência')
 
-    st.pyplot(fig)
+    return fig
 
 
-def _plot_family_fare_correlation(data):
-    """Apresenta correlação entre dimensão da família e tarifa"""
-    fig, ax = plt.subplots(figsize=(10, 6))
+def _build_family_fare_correlation(data):
+    """Constrói a correlação entre dimensão da família e tarifa"""
+    fig, ax = new_offscreen_figure(figsize=(10, 6))
 
     # Verificar a relação entre FamilySize e Fare
     family_fare = data.groupby('FamilySize')['Fare'].mean().reset_index()
@@ -280,8 +259,47 @@ def _plot_family_fare_correlation(data):
     ax.tick_params(axis='y', labelsize=10)
     ax.grid(True, linestyle='--', alpha=0.7, color='#CCCCCC')
 
-    # Apresentar gráfico no Streamlit
-    st.pyplot(fig)
+    return fig
+
+
+MAIN_SECTIONS = ("Matriz de Correlação", "Correlações com Sobrevivência")
+
+# Análises detalhadas: gráfico (identificador, builder e colunas usadas) e observações
+DETAIL_SECTIONS = {
+    "Sexo vs. Classe": {
+        'chart_id': 'correlation_analysis.sex_class',
+        'builder': _build_sex_class_correlation,
+        'columns': ['Pclass', 'Sex'],
+        'observations': """
+            **Observações:**
+            - Maior proporção de mulheres na 1.ª classe
+            - 3.ª classe predominantemente masculina
+            - Distribuição mais equilibrada na 2.ª classe
+            """,
+    },
+    "Idade vs. Tarifa": {
+        'chart_id': 'correlation_analysis.age_fare',
+        'builder': _build_age_fare_correlation,
+        'columns': ['Age', 'Fare', 'Survived'],
+        'observations': """
+            **Observações:**
+            - Tarifas mais elevadas para passageiros mais velhos
+            - Maior variação de tarifas na 1.ª classe
+            - Padrão de sobrevivência mais claro por faixa de preço
+            """,
+    },
+    "Família vs. Tarifa": {
+        'chart_id': 'correlation_analysis.family_fare',
+        'builder': _build_family_fare_correlation,
+        'columns': ['FamilySize', 'Fare'],
+        'observations': """
+            **Observações:**
+            - Famílias maiores tendem a pagar tarifas mais elevadas
+            - Possível relação com cabinas maiores
+            - Descontos para grupos podem influenciar
+            """,
+    },
+}
 
 
 def _show_insights():
@@ -1,6 +1,6 @@
-from pages.exploratory_analysis_data.distributions import age_analysis
-from pages.exploratory_analysis_data.distributions import fare_analysis
-from pages.exploratory_analysis_data.distributions import family_analysis
-from pages.exploratory_analysis_data.distributions import gender_analysis
+from utils.lazy_loader import lazy_submodules
 
-__all__ = ['age_analysis', 'fare_analysis', 'family_analysis', 'gender_analysis']
\ No newline at end of file
+__all__ = ['age_analysis', 'fare_analysis', 'family_analysis', 'gender_analysis']
+
+# Os submódulos só são importados quando acedidos
+__getattr__ = lazy_submodules(__name__, __all__)
@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS
+from utils.visualization import get_color_palette, COLORS, new_figure
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 def show(data):
     st.markdown("### Distribuição por Idade")
@@ -72,16 +74,16 @@ def show(data):
 
 def _show_visualizations(data):
     st.markdown("#### Visualizações da Distribuição de Idade")
-    tab1, tab2 = st.tabs(["Distribuição Geral", "Por Faixa Etária"])
-
-    with tab1:
-        _plot_age_distribution(data)
-
-    with tab2:
-        _plot_age_groups(data)
+    lazy_tabs({
+        "Distribuição Geral": lambda: _plot_age_distribution(data),
+        "Por Faixa Etária": lambda: _plot_age_groups(data),
+    }, key='age_analysis_visualizations')
 
 def _plot_age_distribution(data):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('age_analysis.age_distribution', _build_age_distribution, data)
+
+def _build_age_distribution(data):
+    fig, ax = new_figure(figsize=(12, 6))
     colors = plt.cm.tab20(np.linspace(0, 1, 20))
 
     sns.histplot(data=data,
@@ -112,12 +114,15 @@ def _plot_age_distribution(data):
     plt.ylabel('Número de Passageiros', fontsize=12)
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.legend()
-    st.pyplot(fig)
+    return fig
 
 def _plot_age_groups(data):
+    cached_chart('age_analysis.age_groups', _build_age_groups, data)
+
+def _build_age_groups(data):
     age_distribution = data['FaixaEtaria'].value_counts().sort_index()
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_figure(figsize=(10, 6))
     colors = plt.cm.tab20(np.linspace(0, 1, 20))
     pie_colors = [colors[0], colors[2], colors[4]]
 
@@ -130,7 +135,7 @@ def _plot_age_groups(data):
 
     plt.title('Distribuição de Passageiros por Faixa Etária',
               pad=20, fontsize=14, fontweight='bold')
-    st.pyplot(fig)
+    return fig
 
 def _show_insights():
     st.divider()
@@ -3,7 +3,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style
+from utils.visualization import (get_color_palette, COLORS, set_plot_style, new_figure,
+                                  bar_chart_spec, show_chart)
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 def show(data):
     st.markdown("### Distribuição por Dimensão de Família")
@@ -65,16 +68,23 @@ def show(data):
 
 def _show_visualizations(data, family_dist):
     st.markdown("#### Visualizações")
-    tab1, tab2 = st.tabs(["Distribuição Geral", "Proporção Sozinho vs. Família"])
-
-    with tab1:
-        _plot_family_distribution(family_dist)
-
-    with tab2:
-        _plot_alone_vs_family(data)
+    lazy_tabs({
+        "Distribuição Geral": lambda: _plot_family_distribution(family_dist),
+        "Proporção Sozinho vs. Família": lambda: _plot_alone_vs_family(data),
+    }, key='family_analysis_visualizations')
 
 def _plot_family_distribution(family_dist):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    chart_data = pd.DataFrame({'Dimensão': family_dist.index.astype(str),
+                               'Passageiros': family_dist.values})
+    spec = bar_chart_spec(chart_data, 'Dimensão', 'Passageiros',
+                          'Distribuição da Dimensão das Famílias',
+                          'Dimensão da Família', 'Número de Passageiros',
+                          color=get_color_palette(20)[0])
+    show_chart(chart_data, spec, lambda: cached_chart('family_analysis.family_distribution',
+                                                      _build_family_distribution, family_dist))
+
+def _build_family_distribution(family_dist):
+    fig, ax = new_figure(figsize=(12, 6))
     colors = get_color_palette(20)
 
     sns.barplot(x=family_dist.index,
@@ -91,10 +101,13 @@ def _plot_family_distribution(family_dist):
     for i, v in enumerate(family_dist.values):
         plt.text(i, v, str(v), ha='center', va='bottom')
 
-    st.pyplot(fig)
+    return fig
 
 def _plot_alone_vs_family(data):
-    fig, ax = plt.subplots(figsize=(10, 6))
+    cached_chart('family_analysis.alone_vs_family', _build_alone_vs_family, data)
+
+def _build_alone_vs_family(data):
+    fig, ax = new_figure(figsize=(10, 6))
     colors = get_color_palette(20)
 
     alone_vs_family = data['IsAlone'].value_counts()
@@ -107,7 +120,7 @@ def _plot_alone_vs_family(data):
 
     plt.title('Proporção de Passageiros: Sozinhos vs. Com Família',
               pad=20, fontsize=14, fontweight='bold')
-    st.pyplot(fig)
+    return fig
 
 def _show_insights(data):
     st.divider()
@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS
+from utils.visualization import get_color_palette, COLORS, new_figure
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 def show(data):
     st.markdown("### Distribuição por Tarifas")
@@ -79,23 +81,17 @@ def _show_class_stats(data):
 
 def _show_visualizations(data):
     st.markdown("#### Visualizações")
-    tab1, tab2, tab3 = st.tabs([
-        "Distribuição Geral",
-        "Estatísticas por Classe",
-        "Densidade por Classe"
-    ])
-
-    with tab1:
-        _plot_fare_distribution(data)
-
-    with tab2:
-        _plot_class_statistics(data)
-
-    with tab3:
-        _plot_class_density(data)
+    lazy_tabs({
+        "Distribuição Geral": lambda: _plot_fare_distribution(data),
+        "Estatísticas por Classe": lambda: _plot_class_statistics(data),
+        "Densidade por Classe": lambda: _plot_class_density(data),
+    }, key='fare_analysis_visualizations')
 
 def _plot_fare_distribution(data):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('fare_analysis.fare_distribution', _build_fare_distribution, data)
+
+def _build_fare_distribution(data):
+    fig, ax = new_figure(figsize=(12, 6))
     colors = plt.cm.tab20(np.linspace(0, 5, 20))
 
     sns.histplot(data=data,
@@ -122,10 +118,13 @@ def _plot_fare_distribution(data):
     plt.ylabel('Número de Passageiros', fontsize=12)
     plt.legend()
     plt.grid(True, linestyle='--', alpha=0.7)
-    st.pyplot(fig)
+    return fig
 
 def _plot_class_statistics(data):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('fare_analysis.class_statistics', _build_class_statistics, data)
+
+def _build_class_statistics(data):
+    fig, ax = new_figure(figsize=(12, 6))
     x = np.arange(3)
     width = 0.25
     colors = plt.cm.tab20(np.linspace(0, 1, 20))
@@ -149,10 +148,13 @@ def _plot_class_statistics(data):
     plt.xticks(x, ['1ª Classe', '2ª Classe', '3ª Classe'])
     plt.legend()
     plt.grid(True, linestyle='--', alpha=0.7)
-    st.pyplot(fig)
+    return fig
 
 def _plot_class_density(data):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('fare_analysis.class_density', _build_class_density, data)
+
+def _build_class_density(data):
+    fig, ax = new_figure(figsize=(12, 6))
     colors = sns.color_palette('Set2', n_colors=3)
 
     for pclass, color in zip([1, 2, 3], colors):
@@ -170,7 +172,7 @@ def _plot_class_density(data):
     plt.ylabel('Densidade', fontsize=12)
     plt.legend(title='Classes')
     plt.grid(True, linestyle='--', alpha=0.7)
-    st.pyplot(fig)
+    return fig
 
 def _show_insights():
     st.divider()
@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage, new_figure
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 def show(data):
     st.markdown("### Distribuição por Sexo")
@@ -72,18 +74,18 @@ def show(data):
 
 def _show_visualizations(data):
     st.markdown("#### Visualizações da Distribuição por Sexo")
-    tab1, tab2 = st.tabs(["Distribuição Geral", "Por Classe Social"])
-
-    with tab1:
-        _plot_gender_distribution(data)
-
-    with tab2:
-        _plot_class_distribution(data)
+    lazy_tabs({
+        "Distribuição Geral": lambda: _plot_gender_distribution(data),
+        "Por Classe Social": lambda: _plot_class_distribution(data),
+    }, key='gender_analysis_visualizations')
 
 def _plot_gender_distribution(data):
+    cached_chart('gender_analysis.gender_distribution', _build_gender_distribution, data)
+
+def _build_gender_distribution(data):
     sex_dist = data['Sex'].value_counts()
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_figure(figsize=(10, 6))
     colors = get_color_palette(20)
 
     plt.pie(sex_dist.values,
@@ -95,10 +97,13 @@ def _plot_gender_distribution(data):
 
     plt.title('Distribuição de Passageiros por Sexo',
               pad=20, fontsize=14, fontweight='bold')
-    st.pyplot(fig)
+    return fig
 
 def _plot_class_distribution(data):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('gender_analysis.class_distribution', _build_class_distribution, data)
+
+def _build_class_distribution(data):
+    fig, ax = new_figure(figsize=(12, 6))
     class_sex_dist = pd.crosstab(data['Pclass'], data['Sex'])
     colors = get_color_palette(20)
 
@@ -130,7 +135,7 @@ def _plot_class_distribution(data):
                  str(class_sex_dist[1][i + 1]),
                  ha='center', va='bottom')
 
-    st.pyplot(fig)
+    return fig
 
 def _show_insights(data):
     st.divider()
@@ -1,10 +1,4 @@
-from pages.exploratory_analysis_data.survival import general_survival
-from pages.exploratory_analysis_data.survival import age_survival
-from pages.exploratory_analysis_data.survival import gender_survival
-from pages.exploratory_analysis_data.survival import class_survival
-from pages.exploratory_analysis_data.survival import family_survival
-from pages.exploratory_analysis_data.survival import port_survival
-from pages.exploratory_analysis_data.survival import combined_survival
+from utils.lazy_loader import lazy_submodules
 
 __all__ = [
     'general_survival',
@@ -14,4 +8,7 @@ __all__ = [
     'family_survival',
     'port_survival',
     'combined_survival'
-]
\ No newline at end of file
+]
+
+# Os submódulos só são importados quando acedidos
+__getattr__ = lazy_submodules(__name__, __all__)
@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage, new_figure
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 def show(data):
     st.markdown("### Análise de Sobrevivência por Faixa Etária")
@@ -62,17 +64,17 @@ def _create_survival_stats_df(survival_by_age, survival_rate_age):
 
 def _show_visualizations(data, survival_rate_age):
     st.markdown("#### Visualizações da Sobrevivência por Idade")
-    tab1, tab2, tab3 = st.tabs(["Taxa de Sobrevivência", "Distribuição por Idade", "Análise Detalhada"])
-
-    with tab1:
-        _plot_survival_rate(survival_rate_age)
-    with tab2:
-        _plot_age_distribution(data)
-    with tab3:
-        _plot_detailed_analysis(data)
+    lazy_tabs({
+        "Taxa de Sobrevivência": lambda: _plot_survival_rate(survival_rate_age),
+        "Distribuição por Idade": lambda: _plot_age_distribution(data),
+        "Análise Detalhada": lambda: _plot_detailed_analysis(data),
+    }, key='age_survival_visualizations')
 
 def _plot_survival_rate(survival_rate_age):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('age_survival.survival_rate', _build_survival_rate, survival_rate_age)
+
+def _build_survival_rate(survival_rate_age):
+    fig, ax = new_figure(figsize=(12, 6))
     survival_rate_sorted = survival_rate_age.sort_values(by=1, ascending=False)
 
     colors = get_color_palette(20)
@@ -108,10 +110,13 @@ def _plot_survival_rate(survival_rate_age):
 
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 def _plot_age_distribution(data):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('age_survival.age_distribution', _build_age_distribution, data)
+
+def _build_age_distribution(data):
+    fig, ax = new_figure(figsize=(12, 6))
 
     colors = get_color_palette(20)
     sns.kdeplot(data=data[data['Survived'] == 0], x='Age',
@@ -128,10 +133,13 @@ def _plot_age_distribution(data):
 
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 def _plot_detailed_analysis(data):
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('age_survival.detailed_analysis', _build_detailed_analysis, data)
+
+def _build_detailed_analysis(data):
+    fig, ax = new_figure(figsize=(12, 6))
 
     survival_by_group = data.groupby('FaixaEtaria')['Survived'].agg(['count', 'mean'])
     survival_by_group['mean'] *= 100
@@ -156,7 +164,7 @@ def _plot_detailed_analysis(data):
 
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 def _show_insights(data):
     st.divider()
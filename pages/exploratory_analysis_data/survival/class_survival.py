@@ -3,7 +3,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import (get_color_palette, COLORS, set_plot_style, format_percentage, new_figure,
+                                  bar_chart_spec, show_chart)
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 
 def show(data):
@@ -69,21 +72,33 @@ def _create_survival_stats_df(survival_by_class, survival_rate_class):
 def _show_visualizations(data, survival_by_class):
     """Apresenta visualizações da sobrevivência por classe"""
     st.markdown("#### Visualizações da Sobrevivência por Classe")
-    tab1, tab2, tab3 = st.tabs(["Distribuição Geral", "Por Faixa Etária", "Análise Detalhada"])
-
-    with tab1:
-        _plot_survival_distribution(data, survival_by_class)
-
-    with tab2:
-        _plot_age_distribution(data)
-
-    with tab3:
-        _plot_detailed_analysis(data)
+    lazy_tabs({
+        "Distribuição Geral": lambda: _plot_survival_distribution(data, survival_by_class),
+        "Por Faixa Etária": lambda: _plot_age_distribution(data),
+        "Análise Detalhada": lambda: _plot_detailed_analysis(data),
+    }, key='class_survival_visualizations')
 
 
 def _plot_survival_distribution(data, survival_by_class):
     """Apresenta a distribuição geral de sobrevivência por classe"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    colors = get_color_palette(20)
+    class_labels = ['1.ª Classe', '2.ª Classe', '3.ª Classe']
+    chart_data = pd.DataFrame({
+        'Classe': class_labels * 2,
+        'Estado': ['Não Sobreviveu'] * 3 + ['Sobreviveu'] * 3,
+        'Passageiros': [survival_by_class.loc[pclass, survived] for survived in [0, 1] for pclass in [1, 2, 3]],
+    })
+    spec = bar_chart_spec(chart_data, 'Classe', 'Passageiros',
+                          'Distribuição de Sobrevivência por Classe',
+                          'Classe', 'Número de Passageiros', group='Estado',
+                          group_colors={'Não Sobreviveu': colors[3], 'Sobreviveu': colors[0]})
+    show_chart(chart_data, spec, lambda: cached_chart('class_survival.survival_distribution',
+                                                      _build_survival_distribution, data, survival_by_class))
+
+
+def _build_survival_distribution(data, survival_by_class):
+    """Constrói a distribuição geral de sobrevivência por classe"""
+    fig, ax = new_figure(figsize=(12, 6))
     colors = get_color_palette(20)
 
     x = np.arange(3)
@@ -118,12 +133,17 @@ def _plot_survival_distribution(data, survival_by_class):
     autolabel(survivors)
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_age_distribution(data):
     """Apresenta a distribuição de idade por classe"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('class_survival.age_distribution', _build_age_distribution, data)
+
+
+def _build_age_distribution(data):
+    """Constrói a distribuição de idade por classe"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Criar violin plot
     sns.violinplot(data=data, x='Pclass', y='Age', hue='Survived',
@@ -142,12 +162,17 @@ def _plot_age_distribution(data):
     plt.grid(True, linestyle='--', alpha=0.7)
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_detailed_analysis(data):
     """Apresenta análise detalhada por classe"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('class_survival.detailed_analysis', _build_detailed_analysis, data)
+
+
+def _build_detailed_analysis(data):
+    """Constrói análise detalhada por classe"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Calcular contagens e percentagens
     class_survival = pd.crosstab(data['Pclass'], data['Survived'])
@@ -198,7 +223,7 @@ def _plot_detailed_analysis(data):
                 color='black', fontweight='bold')
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _show_insights(data):
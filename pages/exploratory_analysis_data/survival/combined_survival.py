@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage, new_figure
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 
 def show(data):
@@ -78,21 +80,21 @@ def _create_importance_df(data):
 def _show_visualizations(data):
     """Apresenta visualizações das interacções"""
     st.markdown("#### Visualizações das Interacções")
-    tab1, tab2, tab3 = st.tabs(["Importância Relativa", "Género e Classe", "Idade e Classe"])
-
-    with tab1:
-        _plot_feature_importance(data)
-
-    with tab2:
-        _plot_gender_class_interaction(data)
-
-    with tab3:
-        _plot_age_class_interaction(data)
+    lazy_tabs({
+        "Importância Relativa": lambda: _plot_feature_importance(data),
+        "Género e Classe": lambda: _plot_gender_class_interaction(data),
+        "Idade e Classe": lambda: _plot_age_class_interaction(data),
+    }, key='combined_survival_visualizations')
 
 
 def _plot_feature_importance(data):
     """Apresenta a importância relativa das características"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('combined_survival.feature_importance', _build_feature_importance, data)
+
+
+def _build_feature_importance(data):
+    """Constrói a importância relativa das características"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Calcular impactos
     impacts = {
@@ -127,12 +129,17 @@ def _plot_feature_importance(data):
 
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_gender_class_interaction(data):
     """Apresenta a interacção entre género e classe"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('combined_survival.gender_class_interaction', _build_gender_class_interaction, data)
+
+
+def _build_gender_class_interaction(data):
+    """Constrói a interacção entre género e classe"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Calcular taxas de sobrevivência
     survival_rates = pd.crosstab([data['Sex'], data['Pclass']],
@@ -177,12 +184,20 @@ def _plot_gender_class_interaction(data):
     autolabel(bars2)
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_age_class_interaction(data):
     """Apresenta a interacção entre idade e classe"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('combined_survival.age_class_interaction', _build_age_class_interaction, data)
+
+
+def _build_age_class_interaction(data):
+    """Constrói a interacção entre idade e classe"""
+    fig, ax = new_figure(figsize=(12, 6))
+
+    # Trabalhar sobre uma cópia: o gráfico é guardado em cache e não deve alterar os dados
+    data = data.copy()
 
     # Criar grupos de idade
     data['AgeGroup'] = pd.cut(data['Age'],
@@ -213,7 +228,7 @@ def _plot_age_class_interaction(data):
     plt.ylabel('Grupo de Idade')
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _show_insights(data):
@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage, new_figure
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 
 def show(data):
@@ -101,21 +103,21 @@ def _create_survival_stats_df(survival_by_family, survival_rate_family):
 def _show_visualizations(data):
     """Apresenta visualizações da sobrevivência por estrutura familiar"""
     st.markdown("#### Visualizações da Sobrevivência por Estrutura Familiar")
-    tab1, tab2, tab3 = st.tabs(["Distribuição Geral", "Análise Detalhada", "Relações Familiares"])
-
-    with tab1:
-        _plot_survival_distribution(data)
-
-    with tab2:
-        _plot_detailed_analysis(data)
-
-    with tab3:
-        _plot_family_relations(data)
+    lazy_tabs({
+        "Distribuição Geral": lambda: _plot_survival_distribution(data),
+        "Análise Detalhada": lambda: _plot_detailed_analysis(data),
+        "Relações Familiares": lambda: _plot_family_relations(data),
+    }, key='family_survival_visualizations')
 
 
 def _plot_survival_distribution(data):
     """Apresenta a distribuição geral de sobrevivência por estrutura familiar"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    cached_chart('family_survival.survival_distribution', _build_survival_distribution, data)
+
+
+def _build_survival_distribution(data):
+    """Constrói a distribuição geral de sobrevivência por estrutura familiar"""
+    fig, (ax1, ax2) = new_figure(1, 2, figsize=(15, 6))
     colors = get_color_palette(20)
 
     # Gráfico 1: Barras de sobrevivência por dimensão
@@ -147,12 +149,20 @@ def _plot_survival_distribution(data):
                   pad=20, fontsize=14, fontweight='bold')
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_detailed_analysis(data):
     """Apresenta análise detalhada por estrutura familiar"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('family_survival.detailed_analysis', _build_detailed_analysis, data)
+
+
+def _build_detailed_analysis(data):
+    """Constrói análise detalhada por estrutura familiar"""
+    fig, ax = new_figure(figsize=(12, 6))
+
+    # Trabalhar sobre uma cópia: o gráfico é guardado em cache e não deve alterar os dados
+    data = data.copy()
 
     # Calcular contagens e percentagens por categoria de família
     data['FamilyCategory'] = pd.cut(data['FamilySize'],
@@ -201,12 +211,17 @@ def _plot_detailed_analysis(data):
                 color='black', fontweight='bold')
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_family_relations(data):
     """Apresenta análise das relações familiares"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('family_survival.family_relations', _build_family_relations, data)
+
+
+def _build_family_relations(data):
+    """Constrói análise das relações familiares"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Criar matriz de sobrevivência por SibSp e Parch
     survival_matrix = pd.crosstab(
@@ -231,7 +246,7 @@ def _plot_family_relations(data):
     plt.ylabel('Pais/Filhos (Parch)')
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _show_insights(data):
@@ -3,7 +3,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import (get_color_palette, COLORS, set_plot_style, format_percentage, new_figure,
+                                  bar_chart_spec, show_chart)
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 
 def show(data):
@@ -73,21 +76,32 @@ def _create_survival_stats_df(survival_by_sex, survival_rate_sex):
 def _show_visualizations(data, survival_by_sex):
     """Apresenta visualizações da sobrevivência por género"""
     st.markdown("#### Visualizações da Sobrevivência por Género")
-    tab1, tab2, tab3 = st.tabs(["Distribuição Geral", "Por Classe Social", "Análise Detalhada"])
-
-    with tab1:
-        _plot_survival_distribution(data, survival_by_sex)
-
-    with tab2:
-        _plot_class_distribution(data)
-
-    with tab3:
-        _plot_detailed_analysis(data)
+    lazy_tabs({
+        "Distribuição Geral": lambda: _plot_survival_distribution(data, survival_by_sex),
+        "Por Classe Social": lambda: _plot_class_distribution(data),
+        "Análise Detalhada": lambda: _plot_detailed_analysis(data),
+    }, key='gender_survival_visualizations')
 
 
 def _plot_survival_distribution(data, survival_by_sex):
     """Apresenta a distribuição geral de sobrevivência por género"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    colors = get_color_palette(20)
+    chart_data = pd.DataFrame({
+        'Género': ['Masculino', 'Feminino'] * 2,
+        'Estado': ['Não Sobreviveu'] * 2 + ['Sobreviveu'] * 2,
+        'Passageiros': [survival_by_sex.loc[sex, survived] for survived in [0, 1] for sex in [0, 1]],
+    })
+    spec = bar_chart_spec(chart_data, 'Género', 'Passageiros',
+                          'Distribuição de Sobrevivência por Género',
+                          'Género', 'Número de Passageiros', group='Estado',
+                          group_colors={'Não Sobreviveu': colors[3], 'Sobreviveu': colors[0]})
+    show_chart(chart_data, spec, lambda: cached_chart('gender_survival.survival_distribution',
+                                                      _build_survival_distribution, data, survival_by_sex))
+
+
+def _build_survival_distribution(data, survival_by_sex):
+    """Constrói a distribuição geral de sobrevivência por género"""
+    fig, ax = new_figure(figsize=(12, 6))
     colors = get_color_palette(20)
 
     x = np.arange(2)
@@ -122,12 +136,17 @@ def _plot_survival_distribution(data, survival_by_sex):
     autolabel(survivors)
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_class_distribution(data):
     """Apresenta a distribuição de sobrevivência por género e classe"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('gender_survival.class_distribution', _build_class_distribution, data)
+
+
+def _build_class_distribution(data):
+    """Constrói a distribuição de sobrevivência por género e classe"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     class_gender_survival = pd.crosstab([data['Pclass'], data['Sex']], data['Survived'], normalize='index') * 100
     class_gender_survival = class_gender_survival[1].unstack()  # Obter apenas taxa de sobrevivência
@@ -151,12 +170,17 @@ def _plot_class_distribution(data):
         ax.bar_label(i, fmt='%.1f%%', padding=3)
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_detailed_analysis(data):
     """Apresenta análise detalhada por género"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('gender_survival.detailed_analysis', _build_detailed_analysis, data)
+
+
+def _build_detailed_analysis(data):
+    """Constrói análise detalhada por género"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Calcular contagens e percentagens
     counts = pd.crosstab(data['Sex'], data['Survived'])
@@ -207,7 +231,7 @@ def _plot_detailed_analysis(data):
                 color='black', fontweight='bold')
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _show_insights(data):
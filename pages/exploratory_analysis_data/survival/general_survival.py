@@ -3,7 +3,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import (get_color_palette, COLORS, set_plot_style, format_percentage, new_figure,
+                                  pie_chart_spec, show_chart)
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
+from utils.static_assets import static_asset, show_static_asset
 
 
 def show(data):
@@ -77,81 +81,93 @@ def _show_timeline_analysis():
 
     with col1:
         st.markdown("#### Cronologia do Desastre")
-        timeline = pd.DataFrame({
-            'Hora': ['23:40', '00:00', '00:15', '00:45', '01:15', '01:45', '02:05', '02:20'],
-            'Acontecimento': [
-                'Colisão com icebergue',
-                'Avaliação de danos',
-                'Preparação dos botes',
-                'Primeiros botes lançados',
-                'Evacuação principal',
-                'Últimos botes regulares',
-                'Botes desmontáveis',
-                'Naufrágio completo'
-            ],
-            'Evacuados': ['0', '~20', '~35', '~130', '~270', '~315', '~340', '340'],
-            'Fase': [
-                'Inicial',
-                'Avaliação',
-                'Preparação',
-                'Evacuação Inicial',
-                'Evacuação Principal',
-                'Evacuação Final',
-                'Fase Crítica',
-                'Naufrágio'
-            ]
-        })
-        st.table(timeline)
+        show_static_asset('general_survival.timeline')
 
     with col2:
         st.markdown("#### Capacidade de Salvamento")
-        capacity_df = pd.DataFrame({
-            'Recurso': [
-                'Botes regulares',
-                'Botes desmontáveis',
-                'Capacidade total',
-                'Capacidade utilizada',
-                'Eficiência de utilização',
-                'Défice de capacidade',
-                'Impacto na sobrevivência',
-                'Tempo médio de evacuação'
-            ],
-            'Valor': [
-                '16 unidades (1048 pessoas)',
-                '4 unidades (130 pessoas)',
-                '1178 pessoas',
-                '340 pessoas',
-                '28,9% da capacidade',
-                '838 lugares não utilizados',
-                'Decisivo para 61,6% das mortes',
-                '~8 minutos por bote'
-            ]
-        })
-        st.table(capacity_df)
+        show_static_asset('general_survival.capacity')
 
 
-def _show_visualizations(data):
-    """Mostra visualizações detalhadas da sobrevivência"""
-    st.markdown("#### Visualizações da Sobrevivência")
-    tab1, tab2, tab3 = st.tabs([
-        "Evolução Temporal",
-        "Análise por Classe e Sobrevivência",
-        "Distribuição de Idade e Tarifa"
-    ])
+@static_asset('general_survival.timeline', kind='table')
+def _build_timeline_table():
+    """Constrói a tabela da cronologia do desastre"""
+    return pd.DataFrame({
+        'Hora': ['23:40', '00:00', '00:15', '00:45', '01:15', '01:45', '02:05', '02:20'],
+        'Acontecimento': [
+            'Colisão com icebergue',
+            'Avaliação de danos',
+            'Preparação dos botes',
+            'Primeiros botes lançados',
+            'Evacuação principal',
+            'Últimos botes regulares',
+            'Botes desmontáveis',
+            'Naufrágio completo'
+        ],
+        'Evacuados': ['0', '~20', '~35', '~130', '~270', '~315', '~340', '340'],
+        'Fase': [
+            'Inicial',
+            'Avaliação',
+            'Preparação',
+            'Evacuação Inicial',
+            'Evacuação Principal',
+            'Evacuação Final',
+            'Fase Crítica',
+            'Naufrágio'
+        ]
+    })
 
-    with tab1:
-        _plot_evacuation_timeline()
 
-    with tab2:
-        _plot_survival_factors(data)
+@static_asset('general_survival.capacity', kind='table')
+def _build_capacity_table():
+    """Constrói a tabela da capacidade de salvamento"""
+    return pd.DataFrame({
+        'Recurso': [
+            'Botes regulares',
+            'Botes desmontáveis',
+            'Capacidade total',
+            'Capacidade utilizada',
+            'Eficiência de utilização',
+            'Défice de capacidade',
+            'Impacto na sobrevivência',
+            'Tempo médio de evacuação'
+        ],
+        'Valor': [
+            '16 unidades (1048 pessoas)',
+            '4 unidades (130 pessoas)',
+            '1178 pessoas',
+            '340 pessoas',
+            '28,9% da capacidade',
+            '838 lugares não utilizados',
+            'Decisivo para 61,6% das mortes',
+            '~8 minutos por bote'
+        ]
+    })
 
-    with tab3:
-        _plot_age_fare_distribution(data)
+
+def _show_visualizations(data):
+    """Mostra visualizações detalhadas da sobrevivência"""
+    st.markdown("#### Visualizações da Sobrevivência")
+    lazy_tabs({
+        "Evolução Temporal": _plot_evacuation_timeline,
+        "Análise por Classe e Sobrevivência": lambda: _plot_survival_factors(data),
+        "Distribuição de Idade e Tarifa": lambda: _plot_age_fare_distribution(data),
+    }, key='general_survival_visualizations')
 
 
 def _plot_survival_distribution(data, survivors):
     """Apresenta a distribuição geral de sobrevivência"""
-    fig, ax = plt.subplots(figsize=(10, 6))
+    chart_data = pd.DataFrame({'Estado': ['Não Sobreviveu', 'Sobreviveu'],
+                               'Passageiros': survivors.values})
+    spec = pie_chart_spec(chart_data, 'Estado', 'Passageiros',
+                          'Taxa de Sobrevivência dos Passageiros',
+                          {'Não Sobreviveu': COLORS['negative'], 'Sobreviveu': COLORS['primary']})
+    show_chart(chart_data, spec, lambda: cached_chart('general_survival.survival_distribution',
+                                                      _build_survival_distribution, data, survivors))
+
+
+def _build_survival_distribution(data, survivors):
+    """Constrói a distribuição geral de sobrevivência"""
+    fig, ax = new_figure(figsize=(10, 6))
     colors = get_color_palette(20)
 
     plt.pie(survivors.values,
@@ -163,12 +179,18 @@ def _plot_survival_distribution(data, survivors):
 
     plt.title('Taxa de Sobrevivência dos Passageiros',
               pad=20, fontsize=14, fontweight='bold')
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_evacuation_timeline():
     """Apresenta a evolução temporal detalhada da evacuação"""
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    show_static_asset('general_survival.evacuation_timeline')
+
+
+@static_asset('general_survival.evacuation_timeline', kind='figure')
+def _build_evacuation_timeline():
+    """Constrói a evolução temporal detalhada da evacuação"""
+    fig, (ax1, ax2) = new_figure(2, 1, figsize=(12, 10))
 
     # Dados temporais
     times = ['23:40', '00:00', '00:15', '00:45', '01:15', '01:45', '02:05', '02:20']
@@ -196,12 +218,17 @@ def _plot_evacuation_timeline():
         ax2.text(i, v, str(v), ha='center', va='bottom')
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_survival_factors(data):
     """Apresenta análise detalhada dos factores de sobrevivência"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('general_survival.survival_factors', _build_survival_factors, data)
+
+
+def _build_survival_factors(data):
+    """Constrói análise detalhada dos factores de sobrevivência"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     survival_by_class = pd.crosstab(data['Pclass'], data['Survived'], normalize='index') * 100
     x = np.arange(len(['1.ª Classe', '2.ª Classe', '3.ª Classe']))
@@ -237,12 +264,17 @@ def _plot_survival_factors(data):
     autolabel(bars2)
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_age_fare_distribution(data):
     """Apresenta distribuição de idade e tarifa por sobrevivência"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    cached_chart('general_survival.age_fare_distribution', _build_age_fare_distribution, data)
+
+
+def _build_age_fare_distribution(data):
+    """Constrói distribuição de idade e tarifa por sobrevivência"""
+    fig, (ax1, ax2) = new_figure(1, 2, figsize=(15, 6))
 
     # Distribuição de idade
     sns.kdeplot(data=data[data['Survived'] == 0], x='Age',
@@ -271,7 +303,7 @@ def _plot_age_fare_distribution(data):
     ax2.legend()
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _show_insights(data):
@@ -301,60 +333,64 @@ def _show_insights(data):
 
     with col2:
         st.markdown("#### **Factores Críticos**")
-        st.markdown("""
-        - **Capacidade de Salvamento**:
-            - 20 botes disponíveis
-            - 1.178 lugares totais
-            - 28,9% de utilização
-        - **Condições do Desastre**:
-            - Tempo total: 2h 40min
-            - Temperatura: -2°C
-            - Sobrevivência na água: 15-30 min
-        """)
+        show_static_asset('general_survival.critical_factors')
 
     st.divider()
-
-    st.markdown("### ⏰ Fases do Desastre")
-    st.markdown("""
-    **Cronologia Crítica:**
-    - **23:40-00:15**: Fase inicial de avaliação
-    - **00:15-01:15**: Evacuação principal
-    - **01:15-02:20**: Fase final e naufrágio
-    - **Tempo médio de evacuação**: ~8 min/bote
-    """)
-
+    show_static_asset('general_survival.insights')
     st.divider()
 
-    st.markdown("### 🔍 Factores Determinantes")
-    st.markdown("""
-    **Elementos Críticos:**
-    - Capacidade limitada dos botes
-    - Tempo limitado de evacuação
-    - Condições ambientais severas
-    - Organização da evacuação
-    """)
 
-    st.divider()
-
-    st.markdown("### 📊 Padrões Identificados")
-    st.markdown("""
-    **Observações Principais:**
-    - Maior sobrevivência nas classes superiores
-    - Impacto significativo da tarifa paga
-    - Relação idade-sobrevivência
-    - Eficiência da evacuação por fase
-    """)
-
-    st.divider()
-
-    # Legado Histórico
-    st.markdown("### 📚 Legado e Impacto Histórico")
-    st.markdown("""
-    **Mudanças e Consequências:**
-    - Revisão completa das regulamentações marítimas
-    - Novos protocolos de segurança implementados
-    - Maior conscientização sobre segurança marítima
-    - Influência na cultura e história moderna
-    """)
+@static_asset('general_survival.critical_factors', kind='markdown')
+def _build_critical_factors():
+    """Texto fixo dos factores críticos"""
+    return """
+- **Capacidade de Salvamento**:
+    - 20 botes disponíveis
+    - 1.178 lugares totais
+    - 28,9% de utilização
+- **Condições do Desastre**:
+    - Tempo total: 2h 40min
+    - Temperatura: -2°C
+    - Sobrevivência na água: 15-30 min
+"""
+
+
+@static_asset('general_survival.insights', kind='markdown')
+def _build_insights():
+    """Texto fixo das fases, factores, padrões e legado do desastre"""
+    return """
+### ⏰ Fases do Desastre
+**Cronologia Crítica:**
+- **23:40-00:15**: Fase inicial de avaliação
+- **00:15-01:15**: Evacuação principal
+- **01:15-02:20**: Fase final e naufrágio
+- **Tempo médio de evacuação**: ~8 min/bote
+
+---
+
+### 🔍 Factores Determinantes
+**Elementos Críticos:**
+- Capacidade limitada dos botes
+- Tempo limitado de evacuação
+- Condições ambientais severas
+- Organização da evacuação
+
+---
+
+### 📊 Padrões Identificados
+**Observações Principais:**
+- Maior sobrevivência nas classes superiores
+- Impacto significativo da tarifa paga
+- Relação idade-sobrevivência
+- Eficiência da evacuação por fase
+
+---
+
+### 📚 Legado e Impacto Histórico
+**Mudanças e Consequências:**
+- Revisão completa das regulamentações marítimas
+- Novos protocolos de segurança implementados
+- Maior conscientização sobre segurança marítima
+- Influência na cultura e história moderna
+"""
 
-    st.divider()
\ No newline at end of file
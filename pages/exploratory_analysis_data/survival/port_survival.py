@@ -3,7 +3,9 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage
+from utils.visualization import get_color_palette, COLORS, set_plot_style, format_percentage, new_figure
+from utils.chart_cache import cached_chart
+from utils.layout import lazy_tabs
 
 
 def show(data):
@@ -88,21 +90,21 @@ def _create_survival_stats_df(data):
 def _show_visualizations(data):
     """Apresenta visualizações da sobrevivência por porto"""
     st.markdown("#### Visualizações da Sobrevivência por Porto")
-    tab1, tab2, tab3 = st.tabs(["Distribuição Geral", "Por Classe", "Análise Detalhada"])
-
-    with tab1:
-        _plot_survival_distribution(data)
-
-    with tab2:
-        _plot_class_distribution(data)
-
-    with tab3:
-        _plot_detailed_analysis(data)
+    lazy_tabs({
+        "Distribuição Geral": lambda: _plot_survival_distribution(data),
+        "Por Classe": lambda: _plot_class_distribution(data),
+        "Análise Detalhada": lambda: _plot_detailed_analysis(data),
+    }, key='port_survival_visualizations')
 
 
 def _plot_survival_distribution(data):
     """Apresenta a distribuição geral de sobrevivência por porto"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('port_survival.survival_distribution', _build_survival_distribution, data)
+
+
+def _build_survival_distribution(data):
+    """Constrói a distribuição geral de sobrevivência por porto"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Calcular contagens e percentagens
     ports = {
@@ -152,12 +154,17 @@ def _plot_survival_distribution(data):
     add_labels(top_bars)
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_class_distribution(data):
     """Apresenta a distribuição de sobrevivência por porto e classe"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('port_survival.class_distribution', _build_class_distribution, data)
+
+
+def _build_class_distribution(data):
+    """Constrói a distribuição de sobrevivência por porto e classe"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Calcular taxas de sobrevivência por porto e classe
     survival_rates = pd.DataFrame(index=['1.ª Classe', '2.ª Classe', '3.ª Classe'])
@@ -188,12 +195,17 @@ def _plot_class_distribution(data):
               pad=20, fontsize=14, fontweight='bold')
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _plot_detailed_analysis(data):
     """Apresenta análise detalhada por porto"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cached_chart('port_survival.detailed_analysis', _build_detailed_analysis, data)
+
+
+def _build_detailed_analysis(data):
+    """Constrói análise detalhada por porto"""
+    fig, ax = new_figure(figsize=(12, 6))
 
     # Preparar dados para análise de tarifa média por porto e sobrevivência
     ports = {
@@ -231,7 +243,7 @@ def _plot_detailed_analysis(data):
     )
 
     plt.tight_layout()
-    st.pyplot(fig)
+    return fig
 
 
 def _show_insights(data):
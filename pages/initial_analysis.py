@@ -4,6 +4,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from utils.data_loader import load_data
+from utils.downloads import download_dataframe
+from utils.visualization import new_figure, new_offscreen_figure, show_figure
+from utils.render_executor import figure_spec, render_async, show_rendered
+from utils.tables import paginated_table
+from utils.layout import lazy_tabs
 from config import PLOT_CONFIG
 
 def show_data_overview():
@@ -43,23 +48,21 @@ def show_data_overview():
                   f"{data['Pclass'].mode().iloc[0]}ª Classe",
                   f"({(data['Pclass'] == data['Pclass'].mode().iloc[0]).mean() * 100:.1f}% dos passageiros)")
 
+    # Os dois gráficos são rasterizados em paralelo no executor de renderização
+    ports, family = render_async([
+        figure_spec('initial_analysis.ports', _build_port_counts, data['Embarked'].value_counts()),
+        figure_spec('initial_analysis.family', _build_family_size, data['SibSp'] + data['Parch']),
+    ])
+
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("#### 🚢 Portos de Embarque")
-        port_counts = data['Embarked'].value_counts()
-        fig, ax = plt.subplots(figsize=(8, 4))
-        sns.barplot(x=port_counts.index, y=port_counts.values)
-        plt.title('Distribuição dos Portos de Embarque')
-        st.pyplot(fig)
+        show_rendered(ports)
 
     with col2:
         st.markdown("#### 👨‍👩‍👧‍👦 Distribuição de Família")
-        family_size = data['SibSp'] + data['Parch']
-        fig, ax = plt.subplots(figsize=(8, 4))
-        sns.histplot(family_size, bins=range(max(family_size) + 2), discrete=True)
-        plt.title('Tamanho das Famílias')
-        st.pyplot(fig)
+        show_rendered(family)
 
     st.markdown("""
     #### 🔍 Resumo Rápido:
@@ -70,6 +73,18 @@ def show_data_overview():
     - Os preços das passagens variavam significativamente
     """)
 
+def _build_port_counts(port_counts):
+    fig, ax = new_offscreen_figure(figsize=(8, 4))
+    sns.barplot(x=port_counts.index, y=port_counts.values, ax=ax)
+    ax.set_title('Distribuição dos Portos de Embarque')
+    return fig
+
+def _build_family_size(family_size):
+    fig, ax = new_offscreen_figure(figsize=(8, 4))
+    sns.histplot(family_size, bins=range(max(family_size) + 2), discrete=True, ax=ax)
+    ax.set_title('Tamanho das Famílias')
+    return fig
+
 def show_data_sample():
     data = load_data()
     st.markdown("### 🔍 Amostra dos Dados")
@@ -87,21 +102,11 @@ def show_data_sample():
 
     st.dataframe(data_display)
 
-    col1, col2 = st.columns(2)
-    with col1:
-        st.download_button(
-            label="⬇️ Transferir Conjunto de Dados Completo (CSV)",
-            data=data.to_csv(index=False).encode('utf-8'),
-            file_name='titanic_data.csv',
-            mime='text/csv',
-        )
-    with col2:
-        st.download_button(
-            label="⬇️ Transferir Amostra (CSV)",
-            data=data_display.to_csv(index=False).encode('utf-8'),
-            file_name='titanic_sample.csv',
-            mime='text/csv',
-        )
+    st.markdown("#### ⬇️ Transferências")
+    download_dataframe("⬇️ Transferir Conjunto de Dados Completo", data,
+                       file_name='titanic_data', key='download_full_data')
+    download_dataframe("⬇️ Transferir Amostra", data_display,
+                       file_name='titanic_sample', key='download_sample')
 
 def show_data_types():
     data = load_data()
@@ -118,38 +123,34 @@ def show_data_types():
         'Memória (KB)': data.memory_usage(deep=True) / 1024
     })
 
-    styled_var_info = var_info.style.background_gradient(subset=['% Nulos'], cmap='RdYlGn_r') \
-        .background_gradient(subset=['Valores Únicos'], cmap='YlOrRd')
-
-    st.dataframe(styled_var_info, use_container_width=True)
+    paginated_table(var_info, key='data_types_table',
+                    gradients={'% Nulos': 'RdYlGn_r', 'Valores Únicos': 'YlOrRd'})
 
     st.markdown("#### 📊 Distribuição dos Tipos de Dados")
     type_counts = data.dtypes.value_counts()
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig, ax = new_figure(figsize=(8, 4))
     sns.barplot(x=type_counts.index.astype(str), y=type_counts.values)
     plt.title('Distribuição dos Tipos de Dados')
     plt.xticks(rotation=45)
-    st.pyplot(fig)
+    show_figure(fig)
 
 def show_missing_values():
     data = load_data()
     st.markdown("### ⚠️ Análise de Valores em Falta")
 
+    missing = data.isnull().sum()
+    heatmap, counts = render_async([
+        figure_spec('initial_analysis.missing_map', _build_missing_map, data.isnull()),
+        figure_spec('initial_analysis.missing_counts', _build_missing_counts, missing[missing > 0]),
+    ])
+
     col1, col2 = st.columns(2)
 
     with col1:
-        fig, ax = plt.subplots(figsize=PLOT_CONFIG['figure_size'])
-        sns.heatmap(data.isnull(), yticklabels=False, cbar=False, cmap='viridis')
-        plt.title('Mapa de Valores em Falta')
-        st.pyplot(fig)
+        show_rendered(heatmap)
 
     with col2:
-        missing = data.isnull().sum()
-        missing = missing[missing > 0]
-        fig, ax = plt.subplots(figsize=PLOT_CONFIG['figure_size'])
-        sns.barplot(x=missing.values, y=missing.index)
-        plt.title('Quantidade de Valores em Falta por Variável')
-        st.pyplot(fig)
+        show_rendered(counts)
 
     missing_stats = pd.DataFrame({
         'Valores em Falta': data.isnull().sum(),
@@ -157,8 +158,20 @@ def show_missing_values():
         'Tipo de Dado': data.dtypes.astype(str)
     }).sort_values('Valores em Falta', ascending=False)
 
-    st.dataframe(missing_stats.style.background_gradient(subset=['Percentagem (%)'], cmap='RdYlGn_r'),
-                 use_container_width=True)
+    paginated_table(missing_stats, key='missing_values_table',
+                    gradients={'Percentagem (%)': 'RdYlGn_r'})
+
+def _build_missing_map(is_null):
+    fig, ax = new_offscreen_figure(figsize=PLOT_CONFIG['figure_size'])
+    sns.heatmap(is_null, yticklabels=False, cbar=False, cmap='viridis', ax=ax)
+    ax.set_title('Mapa de Valores em Falta')
+    return fig
+
+def _build_missing_counts(missing):
+    fig, ax = new_offscreen_figure(figsize=PLOT_CONFIG['figure_size'])
+    sns.barplot(x=missing.values, y=missing.index, ax=ax)
+    ax.set_title('Quantidade de Valores em Falta por Variável')
+    return fig
 
 def show_basic_stats():
     data = load_data()
@@ -200,7 +213,7 @@ def show_basic_stats():
 
     with col2:
         st.markdown("#### 📉 Distribuição")
-        fig, ax = plt.subplots(figsize=PLOT_CONFIG['figure_size'])
+        fig, ax = new_figure(figsize=PLOT_CONFIG['figure_size'])
 
         if plot_type == "Histograma":
             sns.histplot(data=data, x=selected_col, kde=True)
@@ -210,7 +223,7 @@ def show_basic_stats():
             sns.violinplot(data=data, y=selected_col)
 
         plt.title(f'{plot_type} de {selected_col}')
-        st.pyplot(fig)
+        show_figure(fig)
 
         Q1 = data[selected_col].quantile(0.25)
         Q3 = data[selected_col].quantile(0.75)
@@ -233,24 +246,13 @@ def show():
     - 📈 Estatísticas avançadas e visualizações
     """)
 
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "Visão Geral",
-        "Amostra",
-        "Tipos de Dados",
-        "Valores em Falta",
-        "Estatísticas"
-    ])
-
-    with tab1:
-        show_data_overview()
-    with tab2:
-        show_data_sample()
-    with tab3:
-        show_data_types()
-    with tab4:
-        show_missing_values()
-    with tab5:
-        show_basic_stats()
+    lazy_tabs({
+        "Visão Geral": show_data_overview,
+        "Amostra": show_data_sample,
+        "Tipos de Dados": show_data_types,
+        "Valores em Falta": show_missing_values,
+        "Estatísticas": show_basic_stats,
+    }, key='initial_analysis_tabs')
 
 if __name__ == "__main__":
     show()
\ No newline at end of file
@@ -1,24 +1,43 @@
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
 import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.model_selection import train_test_split, KFold, cross_val_score
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.metrics import accuracy_score, f1_score, confusion_matrix, classification_report
-from sklearn.model_selection import GridSearchCV
-from sklearn.model_selection import learning_curve
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import confusion_matrix
 from sklearn.preprocessing import LabelEncoder
+from config import ANN_CONFIG, HGB_CONFIG, OUT_OF_CORE_CONFIG
+from utils.downloads import download_dataframe
+from utils.visualization import new_figure, show_figure, bar_chart_spec, show_chart
+from utils.tables import paginated_table
+from utils.layout import lazy_tabs
+from utils.model_cache import cached_fit
+from utils.models import (MODEL_GRIDS, MODEL_LABELS, benchmark_models, build_model, evaluate_model,
+                          run_isolated)
+from utils.learning_curve import learning_curve_futures
+from utils.auto_tune import best_params, successive_halving
+from utils.model_registry import load_model, model_version, save_model
+from utils.cache import make_key
+from utils.data_processor import MODEL_FEATURES, MODEL_INPUTS
+from utils.feature_pipeline import feature_matrix, model_pipeline
+from utils.knn_sweep import knn_sweep
+from utils.ann_index import compare_search
+from utils.out_of_core import INCREMENTAL_MODELS, train_stream
+from utils.tree_paths import tree_depth_sweep
+from utils.cv_runner import fold_indices
+from utils.grid_precompute import grid_job, show_grid_progress, start_grid_job
+
+# Divisão treino/teste (também usada como semente da árvore de decisão)
+TEST_SIZE = 0.2
+SPLIT_SEED = 42
+SPLIT_PARAMS = (SPLIT_SEED, TEST_SIZE)
 
 
 def show(data):
-    def ensure_dummies(data):
-        if 'Embarked_C' not in data.columns or 'Embarked_Q' not in data.columns or 'Embarked_S' not in data.columns:
-            data = pd.get_dummies(data, columns=['Embarked'], prefix='Embarked')
-        return data
-
-    # Criar cópia dos dados para não modificar o original
+    # Cópia local: os dados em sessão são partilhados com as outras páginas
     data = data.copy()
 
     # Converter 'Survived' para valores numéricos
@@ -27,34 +46,28 @@ def show(data):
         if data['Survived'].dtype == 'object':
             data['Survived'] = le.fit_transform(data['Survived'])
 
-    # Garantir que as variáveis dummy estão presentes
-    data = ensure_dummies(data)
-
-    # Converter 'Sex' para numérico se necessário
-    if 'Sex' in data.columns and data['Sex'].dtype == 'object':
-        data['Sex'] = le.fit_transform(data['Sex'])
-
     # Definir as características para o modelo
-    features = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked_C', 'Embarked_Q', 'Embarked_S']
+    features = MODEL_FEATURES
 
-    # Verificar características
-    missing_features = [feature for feature in features if feature not in data.columns]
+    # Verificar as colunas de entrada
+    missing_features = [column for column in MODEL_INPUTS if column not in data.columns]
     if missing_features:
         st.error(f"Colunas em falta no conjunto de dados: {', '.join(missing_features)}")
         return
 
-    # Preparar dados
-    X = data[features]
+    # Preparar dados (a mesma preparação do registo, do scoring em lote e do serviço,
+    # feita uma vez por versão dos dados)
+    X = feature_matrix(data[MODEL_INPUTS])
     y = data['Survived']
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
+        X, y, test_size=TEST_SIZE, random_state=SPLIT_SEED, stratify=y
     )
 
     # Cabeçalho com título e descrição
     st.title("🤖 Modelação Preditiva")
 
     st.markdown("""
-    Esta análise utiliza dois modelos de aprendizagem automática diferentes para prever a sobrevivência 
+    Esta análise utiliza cinco modelos de aprendizagem automática diferentes para prever a sobrevivência 
     dos passageiros do Titanic. Compare os resultados e explore as conclusões geradas por cada modelo.
 
     #### 🎯 Objectivos:
@@ -63,259 +76,681 @@ def show(data):
     - Comparar métricas e resultados
     """)
 
-    # Criar separadores principais com ícones e descrições
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📊 Visão Geral dos Dados",
-        "🌳 Árvore de Decisão",
-        "🎯 KNN",
-        "📈 Comparação e Conclusões"
-    ])
-
-    # Separador 1: Visão Geral dos Dados
-    with tab1:
-        st.header("📊 Visão Geral dos Dados de Treino e Teste")
-
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.metric(
-                label="📝 Total de Amostras",
-                value=len(X),
-                delta=f"{len(X_train)} treino / {len(X_test)} teste"
-            )
-
-        with col2:
-            survival_rate = (y == 1).mean() * 100
-            st.metric(
-                label="💫 Taxa de Sobrevivência",
-                value=f"{survival_rate:.1f}%",
-                delta=f"{len(features)} características utilizadas"
-            )
-
-        with col3:
-            class_balance = f"{(y_train == 1).mean() * 100:.1f}% / {(y_test == 1).mean() * 100:.1f}%"
-            st.metric(
-                label="⚖️ Equilíbrio das Classes",
-                value=class_balance
-            )
-
-        st.subheader("🔍 Características Utilizadas no Modelo")
-
-        feature_df = pd.DataFrame({
-            'Característica': features,
-            'Tipo': [X[f].dtype for f in features],
-            'Valores Únicos': [X[f].nunique() for f in features],
-            'Valores em Falta': [X[f].isnull().sum() for f in features]
-        })
-
-        st.dataframe(
-            feature_df.style.background_gradient(subset=['Valores Únicos'], cmap='YlOrRd')
-            .background_gradient(subset=['Valores em Falta'], cmap='RdYlGn_r'),
-            hide_index=True
+    split = (X_train, X_test, y_train, y_test)
+
+    # Avalia toda a grelha de hiperparâmetros em segundo plano (uma vez por versão dos dados)
+    job = start_grid_job(X, y, split, fold_indices(X, y), SPLIT_PARAMS)
+
+    # Só o separador seleccionado é executado (e só os modelos de que precisa são treinados)
+    lazy_tabs({
+        "📊 Visão Geral dos Dados": lambda: _show_data_overview(X, y, split, features),
+        "🌳 Árvore de Decisão": lambda: _show_decision_tree(X, y, split, features),
+        "🎯 KNN": lambda: _show_knn(X, y, split),
+        "🚀 Gradient Boosting": lambda: _show_gradient_boosting(X, y, split),
+        "💾 Treino Incremental": lambda: _show_out_of_core(split),
+        "📚 Curvas de Aprendizagem": lambda: _show_learning_curves(X, y),
+        "🤖 Auto-ajuste": lambda: _show_auto_tune(X, y),
+        "📈 Comparação e Conclusões": lambda: _show_comparison(X, y, split, features),
+    }, key='modeling_tabs')
+
+    show_grid_progress(job)
+
+
+def _dt_params():
+    """Hiperparâmetros da árvore, preservados mesmo quando o separador não é apresentado"""
+    return st.session_state.setdefault('modeling_dt_params', {'max_depth': 5, 'min_samples_split': 2})
+
+
+def _knn_params():
+    """Hiperparâmetros do KNN, preservados mesmo quando o separador não é apresentado"""
+    return st.session_state.setdefault('modeling_knn_params', {'n_neighbors': 5, 'weights': 'uniform'})
+
+
+def _hgb_params():
+    """Hiperparâmetros do gradient boosting, preservados mesmo quando o separador não é apresentado"""
+    return st.session_state.setdefault('modeling_hgb_params', {
+        'learning_rate': 0.1, 'max_iter': 200, 'max_leaf_nodes': 31, 'early_stopping': True})
+
+
+def _depth_curve(X, y, split, min_samples_split):
+    """Resultados da árvore para todas as profundidades, a partir de um único ajuste por partição"""
+    depths = MODEL_GRIDS['decision_tree']['max_depth']
+    job = grid_job(X, y, SPLIT_PARAMS)
+    if job:
+        curve = {depth: job.lookup('decision_tree', {'max_depth': depth,
+                                                     'min_samples_split': min_samples_split})
+                 for depth in depths}
+        if all(result is not None for result in curve.values()):
+            return curve
+
+    params = {'min_samples_split': min_samples_split, 'max_depth': max(depths)}
+    return cached_fit('decision_tree_paths', params, X, y, SPLIT_PARAMS,
+                      lambda: tree_depth_sweep(X, y, split, fold_indices(X, y), min_samples_split,
+                                               max_depth=max(depths), seed=SPLIT_SEED))
+
+
+def _train_decision_tree(X, y, split):
+    params = _dt_params()
+    registered = _registered_result('decision_tree', params, split)
+    if registered is not None:
+        return registered
+    return _depth_curve(X, y, split, params['min_samples_split'])[params['max_depth']]
+
+
+def _train_knn(X, y, split):
+    """O KNN é avaliado para todos os k e pesos de uma vez (uma consulta de vizinhos por partição)"""
+    params = _knn_params()
+    registered = _registered_result('knn', params, split)
+    if registered is not None:
+        return registered
+    job = grid_job(X, y, SPLIT_PARAMS)
+    result = job.lookup('knn', params) if job else None
+    if result is not None:
+        return result
+    max_k = max(MODEL_GRIDS['knn']['n_neighbors'])
+    sweep = cached_fit('knn_sweep', {'max_k': max_k}, X, y, SPLIT_PARAMS,
+                       lambda: knn_sweep(X, y, split, fold_indices(X, y), max_k=max_k))
+    return sweep[(params['n_neighbors'], params['weights'])]
+
+
+def _show_data_overview(X, y, split, features):
+    X_train, X_test, y_train, y_test = split
+    st.header("📊 Visão Geral dos Dados de Treino e Teste")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric(
+            label="📝 Total de Amostras",
+            value=len(X),
+            delta=f"{len(X_train)} treino / {len(X_test)} teste"
         )
 
-# Separador 2: Árvore de Decisão
-    with tab2:
-        st.header("🌳 Modelo: Árvore de Decisão")
-
-        # Parâmetros ajustáveis na mesma página
-        col1, col2 = st.columns(2)
-        with col1:
-            max_depth = st.slider("Profundidade Máxima", 1, 20, 5)
-        with col2:
-            min_samples_split = st.slider("Mínimo para Divisão", 2, 20, 2)
-
-        # Treino com parâmetros ajustáveis
-        dt_model = DecisionTreeClassifier(
-            random_state=42,
-            max_depth=max_depth,
-            min_samples_split=min_samples_split
+    with col2:
+        survival_rate = (y == 1).mean() * 100
+        st.metric(
+            label="💫 Taxa de Sobrevivência",
+            value=f"{survival_rate:.1f}%",
+            delta=f"{len(features)} características utilizadas"
         )
-        dt_model.fit(X_train, y_train)
-        dt_pred = dt_model.predict(X_test)
-
-        # Métricas
-        col1, col2 = st.columns([1, 1])
-
-        with col1:
-            st.subheader("📊 Métricas de Desempenho")
-            dt_accuracy = accuracy_score(y_test, dt_pred)
-            dt_f1 = f1_score(y_test, dt_pred)
-
-            metrics_col1, metrics_col2 = st.columns(2)
-            with metrics_col1:
-                st.metric("🎯 Precisão", f"{dt_accuracy:.3f}")
-            with metrics_col2:
-                st.metric("📈 Pontuação F1", f"{dt_f1:.3f}")
-
-        with col2:
-            st.subheader("🔄 Validação Cruzada")
-            cv_scores = cross_val_score(dt_model, X, y, cv=5)
-            st.metric("🔄 Média VC", f"{cv_scores.mean():.3f}")
-            st.metric("📊 Desvio Padrão VC", f"{cv_scores.std():.3f}")
-
-        # Matriz de Confusão
-        st.subheader("📊 Matriz de Confusão")
-        dt_conf_matrix = confusion_matrix(y_test, dt_pred)
-        fig, ax = plt.subplots(figsize=(8, 6))
-        sns.heatmap(dt_conf_matrix, annot=True, fmt='d', cmap='RdYlBu_r',
-                    xticklabels=['Não Sobreviveu', 'Sobreviveu'],
-                    yticklabels=['Não Sobreviveu', 'Sobreviveu'])
-        plt.title('Matriz de Confusão - Árvore de Decisão', pad=20)
-        st.pyplot(fig)
-
-        # Importância das Características
-        st.subheader("🔍 Importância das Características")
-        feature_importance = pd.DataFrame({
-            'Característica': features,
-            'Importância': dt_model.feature_importances_
-        }).sort_values('Importância', ascending=True)
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.barh(feature_importance['Característica'], feature_importance['Importância'])
-        ax.set_title('Importância das Características na Árvore de Decisão')
-
-        for i, v in enumerate(feature_importance['Importância']):
-            ax.text(v, i, f'{v:.3f}', va='center')
-
-        sm = plt.cm.ScalarMappable(cmap='viridis',
-                                   norm=plt.Normalize(0, max(feature_importance['Importância'])))
-        for bar, importance in zip(bars, feature_importance['Importância']):
-            bar.set_color(sm.to_rgba(importance))
-
-        plt.tight_layout()
-        st.pyplot(fig)
-
-    # Separador 3: KNN
-    with tab3:
-        st.header("🎯 Modelo: K-Vizinhos Mais Próximos (KNN)")
-
-        # Parâmetros ajustáveis na mesma página
-        col1, col2 = st.columns(2)
-        with col1:
-            n_neighbors = st.slider("Número de Vizinhos (K)", 1, 20, 5)
-        with col2:
-            weights = st.selectbox("Peso dos Vizinhos", ['uniforme', 'distância'])
-            # Mapear opções em português para valores em inglês
-            weights_map = {'uniforme': 'uniform', 'distância': 'distance'}
-            weights = weights_map[weights]
-
-        # Treino com parâmetros ajustáveis
-        knn_model = KNeighborsClassifier(n_neighbors=n_neighbors, weights=weights)
-        knn_model.fit(X_train, y_train)
-        knn_pred = knn_model.predict(X_test)
-
-        # Métricas
-        col1, col2 = st.columns([1, 1])
-
-        with col1:
-            st.subheader("📊 Métricas de Desempenho")
-            knn_accuracy = accuracy_score(y_test, knn_pred)
-            knn_f1 = f1_score(y_test, knn_pred)
-
-            metrics_col1, metrics_col2 = st.columns(2)
-            with metrics_col1:
-                st.metric("🎯 Precisão", f"{knn_accuracy:.3f}")
-            with metrics_col2:
-                st.metric("📈 Pontuação F1", f"{knn_f1:.3f}")
-
-        with col2:
-            st.subheader("🔄 Validação Cruzada")
-            cv_scores = cross_val_score(knn_model, X, y, cv=5)
-            st.metric("🔄 Média VC", f"{cv_scores.mean():.3f}")
-            st.metric("📊 Desvio Padrão VC", f"{cv_scores.std():.3f}")
-
-        # Matriz de Confusão
-        st.subheader("📊 Matriz de Confusão")
-        knn_conf_matrix = confusion_matrix(y_test, knn_pred)
-        fig, ax = plt.subplots(figsize=(8, 6))
-        sns.heatmap(knn_conf_matrix, annot=True, fmt='d', cmap='RdYlBu_r',
-                    xticklabels=['Não Sobreviveu', 'Sobreviveu'],
-                    yticklabels=['Não Sobreviveu', 'Sobreviveu'])
-        plt.title('Matriz de Confusão - KNN', pad=20)
-        st.pyplot(fig)
-
-    # Separador 4: Comparação e Conclusões
-    with tab4:
-        st.header("📈 Comparação dos Modelos e Conclusões")
-
-        # Comparação visual das métricas
-        comparison_df = pd.DataFrame({
-            'Modelo': ['Árvore de Decisão', 'KNN'],
-            'Precisão': [dt_accuracy, knn_accuracy],
-            'Pontuação F1': [dt_f1, knn_f1]
-        })
-
-        # Gráfico de comparação
-        fig, ax = plt.subplots(figsize=(10, 6))
-        x = np.arange(len(comparison_df['Modelo']))
-        width = 0.35
-
-        bars1 = ax.bar(x - width / 2, comparison_df['Precisão'], width, label='Precisão',
-                       color='skyblue')
-        bars2 = ax.bar(x + width / 2, comparison_df['Pontuação F1'], width, label='Pontuação F1',
-                       color='lightcoral')
-
-        ax.set_ylabel('Pontuação')
-        ax.set_title('Comparação de Métricas entre Modelos')
-        ax.set_xticks(x)
-        ax.set_xticklabels(comparison_df['Modelo'])
-        ax.legend()
-
-        def autolabel(bars):
-            for bar in bars:
-                height = bar.get_height()
-                ax.annotate(f'{height:.3f}',
-                            xy=(bar.get_x() + bar.get_width() / 2, height),
-                            xytext=(0, 3),
-                            textcoords="offset points",
-                            ha='center', va='bottom')
-
-        autolabel(bars1)
-        autolabel(bars2)
-
-        plt.tight_layout()
-        st.pyplot(fig)
-
-        # Conclusões em markdown
-        st.markdown("""
-        #### 🎯 Desempenho Global
-        - A Árvore de Decisão alcançou uma precisão de {:.1f}% vs {:.1f}% do KNN
-        - A Pontuação F1 mostra uma diferença de {:.1f} pontos entre os modelos
-        - A estabilidade da Árvore de Decisão é {}
-        """.format(
-            dt_accuracy * 100,
-            knn_accuracy * 100,
-            abs(dt_f1 - knn_f1) * 100,
-            "superior" if dt_accuracy > knn_accuracy else "inferior"
-        ))
-
-        st.markdown("""
-        #### 🔍 Análise de Características
-        - As 3 características mais importantes são: {}
-        - Características com menor impacto: {}
-        - Recomendação: considerar remover características com importância < 5%
-        """.format(
-            ", ".join(feature_importance['Característica'].tail(3).tolist()),
-            ", ".join(feature_importance['Característica'].head(2).tolist())
-        ))
-
-        st.divider()
-
-        st.subheader("📥 Download dos Resultados")
-
-        results_dict = {
-            'Métrica': ['Precisão', 'Pontuação F1', 'Média da Validação Cruzada'],
-            'Árvore de Decisão': [dt_accuracy, dt_f1, cv_scores.mean()],
-            'KNN': [knn_accuracy, knn_f1, cv_scores.mean()]
-        }
-        results_df = pd.DataFrame(results_dict)
 
-        st.download_button(
-            "Download Resultados",
-            data=results_df.to_csv(index=False).encode('utf-8'),
-            file_name='resultados.csv',
-            mime='text/csv'
+    with col3:
+        class_balance = f"{(y_train == 1).mean() * 100:.1f}% / {(y_test == 1).mean() * 100:.1f}%"
+        st.metric(
+            label="⚖️ Equilíbrio das Classes",
+            value=class_balance
         )
 
-        st.divider()
\ No newline at end of file
+    st.subheader("🔍 Características Utilizadas no Modelo")
+
+    feature_df = pd.DataFrame({
+        'Característica': features,
+        'Tipo': [str(X[f].dtype) for f in features],
+        'Valores Únicos': [X[f].nunique() for f in features],
+        'Valores em Falta': [X[f].isnull().sum() for f in features]
+    })
+
+    paginated_table(feature_df, key='model_features_table',
+                    gradients={'Valores Únicos': 'YlOrRd', 'Valores em Falta': 'RdYlGn_r'},
+                    hide_index=True, use_container_width=False)
+
+
+def _registry_version(model_type, params, split):
+    X_train, _, y_train, _ = split
+    return model_version(model_type, dict(params), MODEL_FEATURES, make_key(X_train, y_train))
+
+
+def _registered_result(model_type, params, split):
+    """Resultado do modelo do registo local com os hiperparâmetros actuais, ou None se não existir
+
+    As métricas são as guardadas com o modelo; só as previsões do teste são
+    recalculadas, com o pipeline carregado.
+    """
+    version = _registry_version(model_type, params, split)
+    pipeline, metadata = load_model(model_type, version)
+    if pipeline is None:
+        return None
+    metrics = metadata['metrics']
+    _, X_test, _, y_test = split
+    return cached_fit('registry', {'model_type': model_type, 'version': version}, X_test, y_test, SPLIT_PARAMS,
+                      lambda: {
+                          'model': pipeline,
+                          'pred': pipeline.predict(X_test),
+                          'accuracy': metrics['accuracy'],
+                          'f1': metrics['f1'],
+                          'cv_scores': np.array(metrics['cv_scores']),
+                          'cv_f1_scores': np.array(metrics['cv_f1_scores']),
+                          'feature_importances': getattr(pipeline[-1], 'feature_importances_', None),
+                          'metadata': metadata,
+                      })
+
+
+def _show_registry(model_type, params, X, y, split, result):
+    """Estado do modelo no registo local; um modelo novo só é guardado a pedido
+
+    O modelo guardado é ajustado e avaliado de novo, para que as métricas do
+    registo sejam as do pipeline que fica no disco.
+    """
+    metadata = result.get('metadata')
+    if metadata is not None:
+        st.caption(f"💾 Modelo carregado do registo local "
+                   f"(versão {metadata['version']}, {metadata['size_bytes'] / 1024:.0f} KB)")
+        return
+    if not st.button("💾 Guardar no registo", key=f'modeling_register_{model_type}',
+                     help="Guarda o modelo com os hiperparâmetros actuais para o scoring em lote e o serviço"):
+        return
+
+    X_train, _, y_train, _ = split
+    with st.spinner("A treinar e a avaliar o modelo a guardar..."):
+        evaluation = evaluate_model(model_pipeline(build_model(model_type, params, SPLIT_SEED)),
+                                    X, y, split, fold_indices(X, y))
+        metrics = {
+            'accuracy': float(evaluation['accuracy']),
+            'f1': float(evaluation['f1']),
+            'cv_mean': float(evaluation['cv_scores'].mean()),
+            'cv_std': float(evaluation['cv_scores'].std()),
+            'cv_scores': evaluation['cv_scores'].tolist(),
+            'cv_f1_scores': evaluation['cv_f1_scores'].tolist(),
+        }
+        save_model(model_type, evaluation['model'], dict(params), MODEL_FEATURES,
+                   make_key(X_train, y_train), metrics)
+    st.rerun()
+
+
+def _show_model_metrics(result, validation="🔄 Validação Cruzada", score_unit="partição"):
+    """Apresenta as métricas de teste e de validação (cruzada, por omissão) de um modelo"""
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.subheader("📊 Métricas de Desempenho")
+        metrics_col1, metrics_col2 = st.columns(2)
+        with metrics_col1:
+            st.metric("🎯 Precisão", f"{result['accuracy']:.3f}")
+        with metrics_col2:
+            st.metric("📈 Pontuação F1", f"{result['f1']:.3f}")
+
+    with col2:
+        st.subheader(validation)
+        st.metric("🔄 Média VC", f"{result['cv_scores'].mean():.3f}")
+        st.metric("📊 Desvio Padrão VC", f"{result['cv_scores'].std():.3f}")
+        scores = result['cv_scores']
+        per_unit = (" · ".join(f"{score:.3f}" for score in scores) if len(scores) <= 10
+                    else f"{len(scores)} valores entre {scores.min():.3f} e {scores.max():.3f}")
+        st.caption(f"Precisão por {score_unit}: {per_unit} — F1 médio VC: {result['cv_f1_scores'].mean():.3f}")
+
+
+def _plot_confusion_matrix(y_test, pred, model_name):
+    st.subheader("📊 Matriz de Confusão")
+    conf_matrix = confusion_matrix(y_test, pred)
+    fig, ax = new_figure(figsize=(8, 6))
+    sns.heatmap(conf_matrix, annot=True, fmt='d', cmap='RdYlBu_r',
+                xticklabels=['Não Sobreviveu', 'Sobreviveu'],
+                yticklabels=['Não Sobreviveu', 'Sobreviveu'])
+    plt.title(f'Matriz de Confusão - {model_name}', pad=20)
+    show_figure(fig)
+
+
+def _plot_depth_curve(curve, selected_depth):
+    st.subheader("📉 Precisão por Profundidade")
+    depths = list(curve)
+    accuracy = np.array([curve[depth]['accuracy'] for depth in depths])
+    cv_mean = np.array([curve[depth]['cv_scores'].mean() for depth in depths])
+    cv_std = np.array([curve[depth]['cv_scores'].std() for depth in depths])
+
+    fig, ax = new_figure(figsize=(10, 5))
+    ax.plot(depths, accuracy, 'o-', label='Precisão (teste)', color='skyblue')
+    ax.plot(depths, cv_mean, 's-', label='Média VC', color='lightcoral')
+    ax.fill_between(depths, cv_mean - cv_std, cv_mean + cv_std, color='lightcoral', alpha=0.2)
+    ax.axvline(selected_depth, color='gray', linestyle='--', label='Profundidade seleccionada')
+
+    ax.set_xlabel('Profundidade Máxima')
+    ax.set_ylabel('Pontuação')
+    ax.set_title('Precisão da Árvore de Decisão por Profundidade')
+    ax.set_xticks(depths)
+    ax.legend()
+
+    plt.tight_layout()
+    show_figure(fig)
+
+
+def _feature_importance(result, features):
+    return pd.DataFrame({
+        'Característica': features,
+        'Importância': result['feature_importances']
+    }).sort_values('Importância', ascending=True)
+
+
+def _show_decision_tree(X, y, split, features):
+    st.header("🌳 Modelo: Árvore de Decisão")
+
+    # Parâmetros ajustáveis na mesma página
+    params = _dt_params()
+    col1, col2 = st.columns(2)
+    with col1:
+        params['max_depth'] = st.slider("Profundidade Máxima", 1, 20, params['max_depth'])
+    with col2:
+        params['min_samples_split'] = st.slider("Mínimo para Divisão", 2, 20, params['min_samples_split'])
+
+    # Treino com parâmetros ajustáveis (ou o modelo do registo, se já existir)
+    result = _train_decision_tree(X, y, split)
+    _show_registry('decision_tree', params, X, y, split, result)
+
+    _show_model_metrics(result)
+    # Com o modelo do registo, a curva (todas as profundidades) só é calculada a pedido
+    if 'metadata' not in result or st.toggle("📉 Mostrar a precisão por profundidade",
+                                             key='modeling_dt_depth_curve'):
+        _plot_depth_curve(_depth_curve(X, y, split, params['min_samples_split']), params['max_depth'])
+    _plot_confusion_matrix(split[3], result['pred'], 'Árvore de Decisão')
+
+    # Importância das Características
+    st.subheader("🔍 Importância das Características")
+    feature_importance = _feature_importance(result, features)
+
+    fig, ax = new_figure(figsize=(10, 6))
+    bars = ax.barh(feature_importance['Característica'], feature_importance['Importância'])
+    ax.set_title('Importância das Características na Árvore de Decisão')
+
+    for i, v in enumerate(feature_importance['Importância']):
+        ax.text(v, i, f'{v:.3f}', va='center')
+
+    sm = plt.cm.ScalarMappable(cmap='viridis',
+                               norm=plt.Normalize(0, max(feature_importance['Importância'])))
+    for bar, importance in zip(bars, feature_importance['Importância']):
+        bar.set_color(sm.to_rgba(importance))
+
+    plt.tight_layout()
+    show_figure(fig)
+
+
+def _show_knn(X, y, split):
+    st.header("🎯 Modelo: K-Vizinhos Mais Próximos (KNN)")
+
+    # Parâmetros ajustáveis na mesma página
+    params = _knn_params()
+    # Mapear opções em português para valores em inglês
+    weights_map = {'uniforme': 'uniform', 'distância': 'distance'}
+    weights_labels = list(weights_map)
+    col1, col2 = st.columns(2)
+    with col1:
+        params['n_neighbors'] = st.slider("Número de Vizinhos (K)", 1, 20, params['n_neighbors'])
+    with col2:
+        current = weights_labels[list(weights_map.values()).index(params['weights'])]
+        weights = st.selectbox("Peso dos Vizinhos", weights_labels,
+                               index=weights_labels.index(current))
+        params['weights'] = weights_map[weights]
+
+    # Treino com parâmetros ajustáveis (ou o modelo do registo, se já existir)
+    result = _train_knn(X, y, split)
+    _show_registry('knn', params, X, y, split, result)
+
+    _show_model_metrics(result)
+    _plot_confusion_matrix(split[3], result['pred'], 'KNN')
+    _show_approximate_search(split)
+
+
+def _show_approximate_search(split):
+    """Precisão e tempo de consulta da floresta de projecções aleatórias face à pesquisa exacta"""
+    st.subheader("⚡ Pesquisa Aproximada de Vizinhos")
+    st.markdown("""
+    Para manifestos com milhões de linhas, os vizinhos podem ser procurados numa floresta de projecções
+    aleatórias em vez de por pesquisa exacta. Mais árvores aumentam a revocação (vizinhos exactos
+    encontrados) e o tempo de consulta. Os índices maiores do que o treino usam linhas reamostradas com
+    um pequeno ruído.
+    """)
+    X_train, X_test, y_train, y_test = split
+    params = _knn_params()
+    sizes = {f"Treino ({len(X_train):,} linhas)": None}
+    sizes.update({f"Sintético ({rows:,} linhas)": rows for rows in ANN_CONFIG['scale_rows']})
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        size_label = st.selectbox("Tamanho do índice", list(sizes), key='modeling_ann_rows')
+    with col2:
+        n_trees = st.select_slider("Árvores", [1, 2, 4, 8, 16, 32], ANN_CONFIG['n_trees'],
+                                   key='modeling_ann_trees')
+    with col3:
+        leaf_size = st.select_slider("Pontos por folha", [8, 16, 32, 64, 128], ANN_CONFIG['leaf_size'],
+                                     key='modeling_ann_leaf_size')
+
+    options = {'n_rows': sizes[size_label], 'n_trees': n_trees, 'leaf_size': leaf_size, **params}
+    with st.spinner("A construir os índices e a medir as consultas..."):
+        comparison = cached_fit('knn_ann_comparison', options, X_train, y_train, SPLIT_PARAMS,
+                                lambda: compare_search(X_train, y_train, X_test, y_test,
+                                                       params['n_neighbors'], params['weights'],
+                                                       n_trees, leaf_size, sizes[size_label], SPLIT_SEED))
+
+    exact = comparison['exact']
+    searches = pd.DataFrame(comparison['approximate']['searches'])
+    searches['accuracy_drop'] = exact['accuracy'] - searches['accuracy']
+    searches['query_ms'] = searches['query_seconds'] * 1000
+    columns = {'n_trees': 'Árvores consultadas', 'recall': 'Revocação', 'fallback': 'Consultas exactas',
+               'accuracy': 'Precisão', 'accuracy_drop': 'Perda de Precisão', 'query_ms': 'Consulta (ms)',
+               'speedup': 'Aceleração'}
+    table = searches[list(columns)].rename(columns=columns)
+    st.dataframe(table.style.format({'Revocação': "{:.1%}", 'Consultas exactas': "{:.1%}", 'Precisão': "{:.3f}",
+                                     'Perda de Precisão': "{:+.3f}", 'Consulta (ms)': "{:.1f}",
+                                     'Aceleração': "{:.1f}×"}),
+                 use_container_width=True, hide_index=True)
+    st.caption(f"Pesquisa exacta em {comparison['n_rows']:,} linhas: precisão {exact['accuracy']:.3f}, "
+               f"consulta {exact['query_seconds'] * 1000:.1f} ms, índice {exact['build_seconds']:.2f} s — "
+               f"floresta (com o índice exacto de recurso) construída em "
+               f"{comparison['approximate']['build_seconds']:.2f} s")
+    if (searches['fallback'] > 0.5).any():
+        st.caption("⚠️ Com poucas árvores ou folhas pequenas, a maioria das consultas tem menos de k candidatos "
+                   "e recorre à pesquisa exacta; nessas linhas a aceleração não é a do índice aproximado.")
+
+
+def _show_gradient_boosting(X, y, split):
+    st.header("🚀 Modelo: Gradient Boosting com Histogramas")
+    st.markdown(f"""
+    As características são discretizadas em até 255 intervalos antes do treino, pelo que cada divisão
+    percorre histogramas em vez de valores ordenados; o treino usa todos os núcleos disponíveis
+    ({os.cpu_count()}). Com paragem antecipada, {HGB_CONFIG['validation_fraction']:.0%} do treino é
+    reservado para validação e o treino termina quando a perda não melhora durante
+    {HGB_CONFIG['n_iter_no_change']} iterações.
+    """)
+
+    # Parâmetros ajustáveis na mesma página
+    params = _hgb_params()
+    col1, col2 = st.columns(2)
+    with col1:
+        params['learning_rate'] = st.select_slider("Taxa de Aprendizagem", [0.01, 0.03, 0.05, 0.1, 0.2, 0.3],
+                                                   params['learning_rate'])
+        params['max_iter'] = st.slider("Iterações Máximas", 50, 500, params['max_iter'], step=50)
+    with col2:
+        params['max_leaf_nodes'] = st.slider("Folhas por Árvore", 4, 64, params['max_leaf_nodes'])
+        params['early_stopping'] = st.toggle("Paragem antecipada", params['early_stopping'])
+
+    result = cached_fit('hist_gradient_boosting', params, X, y, SPLIT_PARAMS,
+                        lambda: evaluate_model(build_model('hist_gradient_boosting', params, SPLIT_SEED),
+                                               X, y, split, fold_indices(X, y)))
+    st.caption(f"🌲 {result['model'].n_iter_} iterações de boosting"
+               + (" (paragem antecipada)" if result['model'].n_iter_ < params['max_iter'] else ""))
+
+    _show_model_metrics(result)
+    _plot_confusion_matrix(split[3], result['pred'], 'Gradient Boosting')
+    _show_model_benchmark(split)
+
+
+def _show_model_benchmark(split):
+    """Tempo de treino e de previsão, memória e tamanho da árvore, do KNN e do gradient boosting
+
+    Usa os hiperparâmetros escolhidos nos separadores de cada modelo.
+    """
+    st.subheader("⏱️ Tempo e Memória")
+    X_train, _, y_train, _ = split
+    sizes = {f"Treino ({len(X_train):,} linhas)": None}
+    sizes.update({f"Sintético ({rows:,} linhas)": rows for rows in HGB_CONFIG['benchmark_rows']})
+    size_label = st.selectbox("Linhas de treino", list(sizes), key='modeling_benchmark_rows')
+
+    models = {'decision_tree': dict(_dt_params()), 'knn': dict(_knn_params()),
+              'hist_gradient_boosting': dict(_hgb_params())}
+    with st.spinner("A treinar e a medir os modelos..."):
+        benchmark = cached_fit('model_benchmark', {'models': models, 'n_rows': sizes[size_label]},
+                               X_train, y_train, SPLIT_PARAMS,
+                               lambda: benchmark_models(models, split, sizes[size_label], SPLIT_SEED))
+
+    st.dataframe(benchmark.style.format({
+        'Linhas de Treino': "{:,}", 'Treino (s)': "{:.3f}", 'Previsão (ms)': "{:.1f}",
+        'Pico de Memória (MB)': "{:.1f}", 'Tamanho do Modelo (MB)': "{:.2f}", 'Precisão': "{:.3f}"}),
+        use_container_width=True, hide_index=True)
+    st.caption("Pico de memória: alocações registadas durante o treino, num processo separado. A previsão é "
+               "feita sobre o conjunto de teste; os conjuntos sintéticos reamostram o treino com um pequeno ruído.")
+
+
+def _show_out_of_core(split):
+    st.header("💾 Treino Incremental (fora de memória)")
+    st.markdown("""
+    Modelos lineares e Naive Bayes treinados com `partial_fit` sobre um fluxo de blocos: só um bloco
+    está em memória de cada vez, pelo que o pico de memória depende do tamanho dos blocos e não do
+    número de linhas. Uma em cada dez linhas forma o holdout, avaliado depois de cada bloco; a validação
+    progressiva avalia cada bloco antes de o modelo treinar com ele. Os fluxos sintéticos são gerados à
+    medida, reamostrando o treino com um pequeno ruído.
+    """)
+    X_train, X_test, y_train, y_test = split
+    sources = {f"Treino ({len(X_train):,} linhas)": None}
+    sources.update({f"Sintético ({rows:,} linhas)": rows for rows in OUT_OF_CORE_CONFIG['stream_rows']})
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        model_type = st.selectbox("Modelo", INCREMENTAL_MODELS, format_func=MODEL_LABELS.get,
+                                  key='modeling_ooc_model')
+    with col2:
+        source = st.selectbox("Dados", list(sources), key='modeling_ooc_rows')
+    with col3:
+        chunksize = st.select_slider("Linhas por bloco", [100, 1_000, 10_000, 100_000], 100,
+                                     key='modeling_ooc_chunksize')
+
+    n_rows = sources[source]
+    with st.spinner(f"A treinar em {math.ceil((n_rows or len(X_train)) / chunksize):,} blocos..."):
+        # Num processo separado: o pico de memória medido não inclui as outras sessões do servidor
+        result = cached_fit('out_of_core', {'model_type': model_type, 'n_rows': n_rows, 'chunksize': chunksize},
+                            X_train, y_train, SPLIT_PARAMS,
+                            lambda: run_isolated(train_stream, X_train, y_train, X_test, y_test,
+                                                 model_type, n_rows, chunksize, SPLIT_SEED))
+    st.caption(f"🧮 {result['history']['rows'].iloc[-1]:,} linhas em {result['seconds']:.1f} s "
+               f"({result['rows_per_second']:,.0f} linhas/s) — pico de memória do treino "
+               f"{result['peak_mb']:.1f} MB")
+
+    if len(result['cv_scores']):
+        _show_model_metrics(result, validation="🔄 Validação Progressiva", score_unit="bloco")
+    else:
+        st.info("Com um único bloco não há validação progressiva; escolha blocos mais pequenos.")
+    _plot_confusion_matrix(y_test, result['pred'], MODEL_LABELS[model_type])
+    _plot_incremental_holdout(result['history'])
+
+
+def _plot_incremental_holdout(history):
+    st.subheader("📈 Holdout ao Longo do Treino")
+    # Os blocos processados antes do primeiro treino (ou sem holdout) não têm avaliação
+    history = history.reindex(columns=['rows', 'holdout_accuracy', 'holdout_f1']).dropna()
+    if history.empty:
+        st.info("O holdout ainda não foi avaliado: nenhum bloco chegou a treinar o modelo.")
+        return
+    fig, ax = new_figure(figsize=(10, 5))
+    ax.plot(history['rows'], history['holdout_accuracy'], 'o-', label='Precisão (holdout)', color='skyblue')
+    ax.plot(history['rows'], history['holdout_f1'], 's-', label='F1 (holdout)', color='lightcoral')
+    ax.set_xlabel('Linhas processadas')
+    ax.set_ylabel('Pontuação')
+    ax.legend(loc='lower right')
+    ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    show_figure(fig)
+
+
+def _plot_learning_curve(points, model_name):
+    sizes = [point['n_samples'] for point in points]
+    train_mean = np.array([point['train_scores'].mean() for point in points])
+    train_std = np.array([point['train_scores'].std() for point in points])
+    val_mean = np.array([point['val_scores'].mean() for point in points])
+    val_std = np.array([point['val_scores'].std() for point in points])
+
+    fig, ax = new_figure(figsize=(10, 5))
+    ax.plot(sizes, train_mean, 'o-', label='Treino', color='skyblue')
+    ax.fill_between(sizes, train_mean - train_std, train_mean + train_std, color='skyblue', alpha=0.2)
+    ax.plot(sizes, val_mean, 's-', label='Validação Cruzada', color='lightcoral')
+    ax.fill_between(sizes, val_mean - val_std, val_mean + val_std, color='lightcoral', alpha=0.2)
+
+    ax.set_xlabel('Número de Exemplos de Treino')
+    ax.set_ylabel('Precisão')
+    ax.set_title(f'Curva de Aprendizagem - {model_name}')
+    ax.legend(loc='lower right')
+
+    plt.tight_layout()
+    show_figure(fig)
+
+
+def _show_learning_curves(X, y):
+    st.header("📚 Curvas de Aprendizagem")
+    st.markdown("""
+    Precisão de treino e de validação cruzada à medida que o conjunto de treino cresce, com os
+    hiperparâmetros seleccionados nos separadores de cada modelo. Os pontos aparecem à medida
+    que são calculados. Os modelos incrementais (SGD e Naive Bayes) crescem de fracção em fracção
+    com `partial_fit`, vendo cada exemplo uma única vez.
+    """)
+
+    folds = fold_indices(X, y)
+    models = {'decision_tree': _dt_params(), 'knn': _knn_params()}
+    # Modelos com partial_fit: uma única passagem por partição, com os exemplos novos de cada fracção
+    models.update({model_type: {} for model_type in INCREMENTAL_MODELS})
+    curves = {
+        MODEL_LABELS[model_type]: learning_curve_futures(
+            model_type, build_model(model_type, params, SPLIT_SEED), X, y, folds)
+        for model_type, params in models.items()
+    }
+
+    for model_name, futures in curves.items():
+        st.subheader(model_name)
+        placeholder = st.empty()
+        pending = {future for future in futures if not future.done()}
+        while True:
+            points = [future.result() for future in futures
+                      if future.done() and future.exception() is None]
+            if points:
+                with placeholder.container():
+                    if pending:
+                        st.caption(f"A calcular: {len(points)}/{len(futures)} pontos")
+                    _plot_learning_curve(points, model_name)
+            if not pending:
+                break
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+
+def _show_auto_tune(X, y):
+    st.header("🤖 Auto-ajuste de Hiperparâmetros")
+    st.markdown("""
+    Pesquisa por divisões sucessivas: todas as combinações das grelhas da Árvore de Decisão e do
+    KNN são avaliadas com uma pequena parte dos dados de treino; em cada ronda só o melhor terço
+    de cada modelo passa à seguinte, com três vezes mais dados, até à ronda final com os dados
+    completos. As rondas concluídas ficam guardadas: uma pesquisa interrompida retoma onde parou.
+    """)
+
+    started_key = 'modeling_autotune_started'
+    if not st.session_state.get(started_key):
+        if st.button("▶️ Iniciar auto-ajuste"):
+            st.session_state[started_key] = True
+            st.rerun()
+        return
+
+    status = st.empty()
+    placeholder = st.empty()
+    for rung, fraction, evaluated, total, board in successive_halving(X, y, fold_indices(X, y), SPLIT_SEED):
+        status.caption(f"Ronda {rung + 1} ({fraction * 100:.0f}% do treino): {evaluated}/{total} configurações")
+        placeholder.dataframe(
+            board.drop(columns=['model_type', 'params']).head(15).style.format(
+                {'Fracção do Treino': "{:.0%}", 'Precisão VC': "{:.3f}"}),
+            use_container_width=True, hide_index=True)
+    status.caption("Auto-ajuste concluído")
+
+    best = best_params(board)
+    st.subheader("🏆 Melhores Hiperparâmetros")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"**Árvore de Decisão:** {best.get('decision_tree', '—')}")
+    with col2:
+        st.markdown(f"**KNN:** {best.get('knn', '—')}")
+
+    if st.button("✅ Aplicar aos modelos"):
+        if 'decision_tree' in best:
+            _dt_params().update(best['decision_tree'])
+        if 'knn' in best:
+            _knn_params().update(best['knn'])
+        st.success("Hiperparâmetros aplicados aos separadores da Árvore de Decisão e do KNN")
+
+
+def _plot_metric_comparison(comparison_df):
+    """Gráfico matplotlib de comparação das métricas (usado quando o Vega-Lite está desactivado)"""
+    fig, ax = new_figure(figsize=(10, 6))
+    x = np.arange(len(comparison_df['Modelo']))
+    width = 0.35
+
+    bars1 = ax.bar(x - width / 2, comparison_df['Precisão'], width, label='Precisão',
+                   color='skyblue')
+    bars2 = ax.bar(x + width / 2, comparison_df['Pontuação F1'], width, label='Pontuação F1',
+                   color='lightcoral')
+
+    ax.set_ylabel('Pontuação')
+    ax.set_title('Comparação de Métricas entre Modelos')
+    ax.set_xticks(x)
+    ax.set_xticklabels(comparison_df['Modelo'])
+    ax.legend()
+
+    def autolabel(bars):
+        for bar in bars:
+            height = bar.get_height()
+            ax.annotate(f'{height:.3f}',
+                        xy=(bar.get_x() + bar.get_width() / 2, height),
+                        xytext=(0, 3),
+                        textcoords="offset points",
+                        ha='center', va='bottom')
+
+    autolabel(bars1)
+    autolabel(bars2)
+
+    plt.tight_layout()
+    show_figure(fig)
+
+
+def _show_comparison(X, y, split, features):
+    st.header("📈 Comparação dos Modelos e Conclusões")
+
+    dt_result = _train_decision_tree(X, y, split)
+    knn_result = _train_knn(X, y, split)
+    dt_accuracy, dt_f1 = dt_result['accuracy'], dt_result['f1']
+    knn_accuracy, knn_f1 = knn_result['accuracy'], knn_result['f1']
+    feature_importance = _feature_importance(dt_result, features)
+
+    # Comparação visual das métricas
+    comparison_df = pd.DataFrame({
+        'Modelo': ['Árvore de Decisão', 'KNN'],
+        'Precisão': [dt_accuracy, knn_accuracy],
+        'Pontuação F1': [dt_f1, knn_f1]
+    })
+
+    # Gráfico de comparação
+    chart_data = comparison_df.melt(id_vars='Modelo', var_name='Métrica', value_name='Pontuação')
+    spec = bar_chart_spec(chart_data, 'Modelo', 'Pontuação',
+                          'Comparação de Métricas entre Modelos', None, 'Pontuação',
+                          group='Métrica',
+                          group_colors={'Precisão': 'skyblue', 'Pontuação F1': 'lightcoral'},
+                          value_format='.3f')
+    show_chart(chart_data, spec, lambda: _plot_metric_comparison(comparison_df))
+
+    # Conclusões em markdown
+    st.markdown("""
+    #### 🎯 Desempenho Global
+    - A Árvore de Decisão alcançou uma precisão de {:.1f}% vs {:.1f}% do KNN
+    - A Pontuação F1 mostra uma diferença de {:.1f} pontos entre os modelos
+    - A estabilidade da Árvore de Decisão é {}
+    """.format(
+        dt_accuracy * 100,
+        knn_accuracy * 100,
+        abs(dt_f1 - knn_f1) * 100,
+        "superior" if dt_accuracy > knn_accuracy else "inferior"
+    ))
+
+    st.markdown("""
+    #### 🔍 Análise de Características
+    - As 3 características mais importantes são: {}
+    - Características com menor impacto: {}
+    - Recomendação: considerar remover características com importância < 5%
+    """.format(
+        ", ".join(feature_importance['Característica'].tail(3).tolist()),
+        ", ".join(feature_importance['Característica'].head(2).tolist())
+    ))
+
+    st.divider()
+
+    st.subheader("📥 Download dos Resultados")
+
+    results_dict = {
+        'Métrica': ['Precisão', 'Pontuação F1', 'Média da Validação Cruzada'],
+        'Árvore de Decisão': [dt_accuracy, dt_f1, dt_result['cv_scores'].mean()],
+        'KNN': [knn_accuracy, knn_f1, knn_result['cv_scores'].mean()]
+    }
+    results_df = pd.DataFrame(results_dict)
+
+    download_dataframe("Download Resultados", results_df,
+                       file_name='resultados', key='download_model_results')
+
+    st.divider()
\ No newline at end of file
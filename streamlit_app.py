@@ -1,3 +1,4 @@
+import sys
 import streamlit as st
 
 # Configuração da página
@@ -9,36 +10,79 @@ st.set_page_config(
     menu_items={}
 )
 
-from config import APP_CONFIG
-from utils.data_loader import load_data
-from pages import intro, initial_analysis, data_cleaning, exploratory_analysis, modeling, conclusions
+from config import DEFAULT_RENDER_QUALITY, PLOT_CONFIG, RENDER_QUALITIES
+from utils.diagnostics import set_metric, show_diagnostics
+from utils.lazy_loader import import_timed, report_cold_imports
 
-def main():
-    pages = {
-        "1. Introdução": intro.show,
-        "2. Integração e Análise Inicial": initial_analysis.show,
-        "3. Limpeza e Transformação": data_cleaning.show,
-        "4. Análise Exploratória": exploratory_analysis.show,
-        "5. Modelação": modeling.show,
-    }
+# Os módulos das páginas (e as dependências pesadas: matplotlib, seaborn, scikit-learn)
+# só são importados na primeira vez que o utilizador navega para cada página
+PAGES = {
+    "1. Introdução": "pages.intro",
+    "2. Integração e Análise Inicial": "pages.initial_analysis",
+    "3. Limpeza e Transformação": "pages.data_cleaning",
+    "4. Análise Exploratória": "pages.exploratory_analysis",
+    "5. Modelação": "pages.modeling",
+}
+
+# Tempo de import a frio (num interpretador novo) da aplicação e de cada página, medido em fundo
+report_cold_imports(['streamlit', 'config', *PAGES.values()])
 
+def main():
     with st.sidebar:
         st.title("Navegação")
         st.divider()
-        selection = st.radio("", list(pages.keys()), label_visibility="collapsed")
-
-    with st.container():
-        if selection == "4. Análise Exploratória":
-            data = pages[selection]()
-            if data is not None:
-                st.session_state['processed_data'] = data
-        elif selection == "5. Modelação":
-            if 'processed_data' in st.session_state:
-                pages[selection](st.session_state['processed_data'])
+        selection = st.radio("", list(PAGES.keys()), label_visibility="collapsed")
+        st.divider()
+        qualities = list(RENDER_QUALITIES.keys())
+        st.selectbox(
+            "Qualidade dos gráficos",
+            qualities,
+            index=qualities.index(DEFAULT_RENDER_QUALITY),
+            key='render_quality',
+            help="A pré-visualização é mais rápida; escolha alta resolução para ampliar ou exportar."
+        )
+        st.toggle(
+            "Gráficos simples no browser",
+            value=PLOT_CONFIG['chart_backend'] == 'vega-lite',
+            key='lightweight_charts',
+            help="Barras e gráficos circulares são desenhados pelo browser (Vega-Lite); desactive para usar o matplotlib."
+        )
+
+    try:
+        with st.container():
+            page = import_timed(PAGES[selection])
+            if selection == "4. Análise Exploratória":
+                data = page.show()
+                if data is not None:
+                    st.session_state['processed_data'] = data
+            elif selection == "5. Modelação":
+                if 'processed_data' in st.session_state:
+                    page.show(st.session_state['processed_data'])
+                else:
+                    st.error("É necessário executar primeiro a Análise Exploratória para processar os dados.")
             else:
-                st.error("É necessário executar primeiro a Análise Exploratória para processar os dados.")
-        else:
-            pages[selection]()
+                page.show()
+    finally:
+        _report_figures()
+        show_diagnostics()
+
+def _report_figures():
+    """Liberta figuras que ficaram abertas e publica as métricas de figuras"""
+    # Se nenhuma página desenhou ainda, não vale a pena importar o matplotlib
+    if 'utils.visualization' not in sys.modules:
+        return
+
+    from utils.visualization import close_all_figures, figure_stats, pop_payload_stats
+
+    leaked = close_all_figures()
+    stats = figure_stats()
+    payload = pop_payload_stats()
+    set_metric("Gráficos enviados (último rerun)", payload['images'])
+    set_metric("Payload de gráficos (último rerun)", f"{payload['bytes'] / 1024:.0f} KB")
+    set_metric("Figuras criadas", stats['created'])
+    set_metric("Figuras fechadas", stats['closed'])
+    set_metric("Figuras activas", stats['live'])
+    set_metric("Figuras órfãs (último rerun)", leaked)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
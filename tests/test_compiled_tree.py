@@ -0,0 +1,85 @@
+# tests/test_compiled_tree.py
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+from utils.compiled_tree import CompiledTree
+
+N_FEATURES = 4
+
+
+def _training_set(seed, missing_fraction):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(400, N_FEATURES))
+    y = (X[:, 0] + 0.5 * X[:, 1] - X[:, 2] * X[:, 3] > 0).astype(int)
+    if missing_fraction:
+        X[rng.random(X.shape) < missing_fraction] = np.nan
+    return X, y
+
+
+def _threshold_rows(model, X):
+    """Linhas com a característica de cada nó exactamente no limiar e nos float32/float64 vizinhos"""
+    tree = model.tree_
+    rows = []
+    for node in np.flatnonzero(tree.children_left != -1):
+        threshold = tree.threshold[node]
+        candidates = [threshold, np.nextafter(threshold, np.inf), np.nextafter(threshold, -np.inf),
+                      float(np.float32(threshold)),
+                      float(np.nextafter(np.float32(threshold), np.float32(np.inf))),
+                      float(np.nextafter(np.float32(threshold), np.float32(-np.inf)))]
+        for value in candidates:
+            row = X[node % len(X)].copy()
+            row[tree.feature[node]] = value
+            rows.append(row)
+    return np.array(rows)
+
+
+def _missing_rows(X, seed):
+    """Linhas com NaN em cada característica, sozinho e em conjunto"""
+    rng = np.random.default_rng(seed)
+    rows = X[rng.integers(0, len(X), 50)].copy()
+    rows[np.arange(len(rows)), np.arange(len(rows)) % N_FEATURES] = np.nan
+    return np.vstack([rows, np.full((1, N_FEATURES), np.nan)])
+
+
+@pytest.fixture(params=[0.0, 0.1], ids=['treino-sem-nan', 'treino-com-nan'])
+def fitted(request):
+    X, y = _training_set(0, request.param)
+    model = DecisionTreeClassifier(max_depth=8, random_state=0).fit(X, y)
+    X_check = np.vstack([np.nan_to_num(X), _threshold_rows(model, np.nan_to_num(X)), _missing_rows(X, 1)])
+    return model, X_check
+
+
+def test_predict_matches_sklearn(fitted):
+    model, X = fitted
+    compiled = CompiledTree(model)
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X))
+
+
+def test_row_scorer_matches_sklearn(fitted):
+    model, X = fitted
+    score_row = CompiledTree(model).row_scorer()
+    row_proba = np.array([score_row(row) for row in X.tolist()])
+    np.testing.assert_allclose(row_proba, model.predict_proba(X))
+
+
+def test_missing_values_follow_missing_go_to_left():
+    # Os NaN da característica 0 são todos da classe dos valores baixos: vão para a esquerda na raiz
+    rng = np.random.default_rng(2)
+    X = rng.random((400, N_FEATURES))
+    y = (X[:, 0] < 0.5).astype(int)
+    X[(y == 1) & (rng.random(len(X)) < 0.3), 0] = np.nan
+    model = DecisionTreeClassifier(max_depth=4, random_state=0).fit(X, y)
+    compiled = CompiledTree(model)
+    assert compiled.missing_left[0]
+
+    X_missing = _missing_rows(X, 3)
+    np.testing.assert_array_equal(compiled.apply(X_missing), model.apply(X_missing.astype(np.float32)))
+    np.testing.assert_array_equal(compiled.predict(X_missing), model.predict(X_missing))
+
+
+def test_single_feature_tree():
+    X = np.linspace(0, 1, 50)[:, None]
+    y = (X[:, 0] > 0.4).astype(int)
+    model = DecisionTreeClassifier(random_state=0).fit(X, y)
+    np.testing.assert_array_equal(CompiledTree(model).predict(X), model.predict(X))
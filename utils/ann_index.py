@@ -0,0 +1,262 @@
+# utils/ann_index.py
+import time
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.metrics import accuracy_score
+from sklearn.neighbors import NearestNeighbors
+from config import ANN_CONFIG
+from utils.knn_sweep import distance_weights
+
+LEAF = -1
+
+# Elementos (consultas × candidatos × características) calculados de cada vez na pesquisa aproximada
+CHUNK_ELEMENTS = 4_000_000
+
+
+class ExactIndex:
+    """Pesquisa exacta dos vizinhos (o índice do scikit-learn escolhido automaticamente)"""
+
+    def __init__(self, **_):
+        self._index = None
+
+    def fit(self, X):
+        self._index = NearestNeighbors().fit(np.asarray(X, dtype=float))
+        return self
+
+    def kneighbors(self, X, n_neighbors, n_trees=None):
+        return self._index.kneighbors(np.asarray(X, dtype=float), n_neighbors)
+
+
+class _ProjectionTree:
+    """Uma árvore de projecções aleatórias em arrays planos
+
+    Cada nó interno divide os seus pontos ao meio pela projecção numa direcção
+    aleatória; as folhas guardam os índices de no máximo `leaf_size` pontos
+    (completados com -1).
+    """
+
+    def __init__(self, X, leaf_size, rng):
+        n_features = X.shape[1]
+        normals, offsets, left, right, leaf_of, leaves = [], [], [], [], [], []
+
+        def new_node():
+            normals.append(np.zeros(n_features))
+            offsets.append(0.0)
+            left.append(LEAF)
+            right.append(LEAF)
+            leaf_of.append(LEAF)
+            return len(left) - 1
+
+        self.max_depth = 0
+        stack = [(new_node(), np.arange(len(X)), 0)]
+        while stack:
+            node, points, depth = stack.pop()
+            self.max_depth = max(self.max_depth, depth)
+            if len(points) <= leaf_size:
+                leaf_of[node] = len(leaves)
+                leaves.append(points)
+                continue
+            direction = rng.standard_normal(n_features)
+            projection = X[points] @ direction
+            half = len(points) // 2
+            order = np.argpartition(projection, half)
+            normals[node] = direction
+            offsets[node] = (projection[order[:half]].max() + projection[order[half:]].min()) / 2
+            left[node], right[node] = new_node(), new_node()
+            stack.append((left[node], points[order[:half]], depth + 1))
+            stack.append((right[node], points[order[half:]], depth + 1))
+
+        self.normals = np.array(normals)
+        self.offsets = np.array(offsets)
+        self.left = np.array(left, dtype=np.intp)
+        self.right = np.array(right, dtype=np.intp)
+        self.leaf_of = np.array(leaf_of, dtype=np.intp)
+        self.leaves = np.full((len(leaves), leaf_size), LEAF, dtype=np.intp)
+        for i, points in enumerate(leaves):
+            self.leaves[i, :len(points)] = points
+
+    def candidates(self, X):
+        """Pontos da folha de cada consulta: (consultas, leaf_size)"""
+        nodes = np.zeros(len(X), dtype=np.intp)
+        for _ in range(self.max_depth):
+            internal = self.left[nodes] != LEAF
+            if not internal.any():
+                break
+            go_left = np.einsum('ij,ij->i', X, self.normals[nodes]) <= self.offsets[nodes]
+            nodes = np.where(internal, np.where(go_left, self.left[nodes], self.right[nodes]), nodes)
+        return self.leaves[self.leaf_of[nodes]]
+
+
+class RandomProjectionForest:
+    """Índice aproximado: floresta de árvores de projecções aleatórias
+
+    Os candidatos de cada consulta são a união das folhas onde cai em cada árvore;
+    as distâncias só são calculadas para esses candidatos. Mais árvores (ou folhas
+    maiores) aumentam a revocação e o tempo de consulta. As consultas podem usar só
+    as primeiras `n_trees` árvores, sem reconstruir o índice.
+    """
+
+    def __init__(self, n_trees=8, leaf_size=32, seed=0):
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.seed = seed
+
+    def fit(self, X):
+        self._X = np.asarray(X, dtype=float)
+        rng = np.random.default_rng(self.seed)
+        self._trees = [_ProjectionTree(self._X, self.leaf_size, rng) for _ in range(self.n_trees)]
+        # Índice exacto para as consultas com poucos candidatos (construído uma única vez)
+        self._exact = NearestNeighbors().fit(self._X)
+        self.last_fallback_fraction = 0.0
+        return self
+
+    def kneighbors(self, X, n_neighbors, n_trees=None):
+        """(distâncias, índices) dos n_neighbors vizinhos encontrados, por ordem crescente de distância
+
+        As consultas com menos de n_neighbors candidatos distintos são resolvidas
+        por pesquisa exacta; a fracção dessas consultas fica em `last_fallback_fraction`.
+        """
+        X = np.asarray(X, dtype=float)
+        trees = self._trees[:n_trees or self.n_trees]
+        distances = np.empty((len(X), n_neighbors))
+        indices = np.empty((len(X), n_neighbors), dtype=np.intp)
+
+        n_candidates = max(len(trees) * self.leaf_size, n_neighbors)
+        chunk = max(1, CHUNK_ELEMENTS // (n_candidates * X.shape[1]))
+        for start in range(0, len(X), chunk):
+            queries = X[start:start + chunk]
+            candidates = np.concatenate([tree.candidates(queries) for tree in trees], axis=1)
+            if candidates.shape[1] < n_neighbors:
+                padding = np.full((len(queries), n_neighbors - candidates.shape[1]), LEAF)
+                candidates = np.concatenate([candidates, padding], axis=1)
+            candidates.sort(axis=1)
+            invalid = candidates == LEAF
+            invalid[:, 1:] |= candidates[:, 1:] == candidates[:, :-1]
+
+            diff = self._X[np.maximum(candidates, 0)] - queries[:, None, :]
+            squared = np.einsum('ijk,ijk->ij', diff, diff)
+            squared[invalid] = np.inf
+            nearest = np.argpartition(squared, n_neighbors - 1, axis=1)[:, :n_neighbors]
+            nearest = np.take_along_axis(nearest, np.argsort(np.take_along_axis(squared, nearest, axis=1)), axis=1)
+            distances[start:start + chunk] = np.sqrt(np.take_along_axis(squared, nearest, axis=1))
+            indices[start:start + chunk] = np.take_along_axis(candidates, nearest, axis=1)
+
+        missing = ~np.isfinite(distances).all(axis=1)
+        if missing.any():
+            distances[missing], indices[missing] = self._exact.kneighbors(X[missing], n_neighbors)
+        self.last_fallback_fraction = float(missing.mean()) if len(X) else 0.0
+        return distances, indices
+
+
+NEIGHBOR_INDEXES = {
+    'exact': ExactIndex,
+    'rp_forest': RandomProjectionForest,
+}
+
+
+class IndexedKNeighborsClassifier(BaseEstimator, ClassifierMixin):
+    """KNN com o índice de vizinhos escolhido por nome ('exact' ou 'rp_forest')
+
+    `n_trees` e `leaf_size` definem a floresta construída no ajuste; `search_trees`
+    (por omissão todas) pode ser alterado depois do ajuste para trocar revocação
+    por tempo de consulta.
+    """
+
+    def __init__(self, n_neighbors=5, weights='uniform', index='rp_forest', n_trees=None,
+                 leaf_size=None, search_trees=None, random_state=None):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.index = index
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.search_trees = search_trees
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        self.classes_, self._encoded = np.unique(np.asarray(y), return_inverse=True)
+        self.n_features_in_ = np.asarray(X).shape[1]
+        self.index_ = NEIGHBOR_INDEXES[self.index](
+            n_trees=self.n_trees or ANN_CONFIG['n_trees'],
+            leaf_size=self.leaf_size or ANN_CONFIG['leaf_size'],
+            seed=self.random_state or 0).fit(X)
+        return self
+
+    def kneighbors(self, X):
+        return self.index_.kneighbors(X, self.n_neighbors, n_trees=self.search_trees)
+
+    def predict_proba(self, X):
+        return self.proba_from_neighbors(*self.kneighbors(X))
+
+    def proba_from_neighbors(self, distances, neighbors):
+        """Probabilidades a partir de uma consulta já feita (evita repetir a pesquisa)"""
+        weights = distance_weights(distances) if self.weights == 'distance' else np.ones_like(distances)
+        labels = self._encoded[neighbors]
+        votes = np.stack([(weights * (labels == c)).sum(axis=1) for c in range(len(self.classes_))], axis=1)
+        return votes / votes.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def scaled_training_set(X, y, n_rows, seed=0):
+    """Conjunto de treino sintético com n_rows linhas: reamostragem com um pequeno ruído gaussiano
+
+    Serve para medir a pesquisa com índices do tamanho dos manifestos sintéticos.
+    """
+    X, y = np.asarray(X, dtype=float), np.asarray(y)
+    if n_rows <= len(X):
+        return X, y
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(X), n_rows)
+    noise = rng.standard_normal((n_rows, X.shape[1])) * (X.std(axis=0) * 0.01)
+    return X[rows] + noise, y[rows]
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def compare_search(X_train, y_train, X_test, y_test, n_neighbors, weights, n_trees, leaf_size,
+                   n_rows=None, seed=0):
+    """Compara a pesquisa exacta com a floresta de projecções para 1, 2, 4, … n_trees árvores
+
+    Devolve {'n_rows', 'exact', 'approximate'}: os tempos de construção e consulta
+    e a precisão no teste de cada pesquisa, e, para a aproximada, a revocação
+    (fracção dos vizinhos devolvidos que estão entre os k exactos, tolerante a
+    empates), a fracção de consultas resolvidas pela pesquisa exacta de recurso e
+    a aceleração da consulta face à exacta. Cada pesquisa é feita uma só vez: o
+    tempo medido é o da consulta ao índice e os votos reutilizam os seus vizinhos.
+    """
+    X_fit, y_fit = scaled_training_set(X_train, y_train, n_rows or 0, seed)
+    X_query = np.asarray(X_test, dtype=float)
+    params = {'n_neighbors': n_neighbors, 'weights': weights, 'random_state': seed}
+
+    exact, exact_build = _timed(lambda: IndexedKNeighborsClassifier(index='exact', **params).fit(X_fit, y_fit))
+    (exact_distances, exact_neighbors), exact_query = _timed(lambda: exact.kneighbors(X_query))
+    exact_pred = exact.classes_[exact.proba_from_neighbors(exact_distances, exact_neighbors).argmax(axis=1)]
+    kth = exact_distances[:, -1:] * (1 + 1e-9)
+
+    forest, forest_build = _timed(lambda: IndexedKNeighborsClassifier(
+        index='rp_forest', n_trees=n_trees, leaf_size=leaf_size, **params).fit(X_fit, y_fit))
+    rows = []
+    for trees in sorted({min(2 ** i, n_trees) for i in range(n_trees.bit_length() + 1)}):
+        forest.set_params(search_trees=trees)
+        (distances, neighbors), query = _timed(lambda: forest.kneighbors(X_query))
+        pred = forest.classes_[forest.proba_from_neighbors(distances, neighbors).argmax(axis=1)]
+        rows.append({
+            'n_trees': trees,
+            'fallback': forest.index_.last_fallback_fraction,
+            'recall': float((distances <= kth).mean()),
+            'accuracy': accuracy_score(y_test, pred),
+            'query_seconds': query,
+            'speedup': exact_query / query,
+        })
+
+    return {
+        'n_rows': len(X_fit),
+        'exact': {'build_seconds': exact_build, 'query_seconds': exact_query,
+                  'accuracy': accuracy_score(y_test, exact_pred)},
+        'approximate': {'build_seconds': forest_build, 'searches': rows},
+    }
@@ -0,0 +1,116 @@
+# utils/auto_tune.py
+import math
+from concurrent.futures import as_completed
+from itertools import product
+import numpy as np
+import pandas as pd
+from config import AUTO_TUNE_CONFIG
+from utils.cache import LRUCache, make_key
+from utils.grid_precompute import process_pool
+from utils.learning_curve import curve_point
+from utils.models import MODEL_GRIDS, MODEL_LABELS, build_model
+
+# Rondas concluídas (linhas do leaderboard e configurações promovidas) por versão dos dados,
+# configuração da pesquisa e número da ronda: um rerun interrompido retoma na ronda seguinte
+_rungs = LRUCache(max_items=32)
+
+
+def all_configs():
+    """Todas as combinações (tipo de modelo, hiperparâmetros) das grelhas"""
+    return [(model_type, dict(zip(grid, values)))
+            for model_type, grid in MODEL_GRIDS.items()
+            for values in product(*grid.values())]
+
+
+def rung_fractions(eta, min_fraction):
+    """Fracções do treino de cada ronda, a crescer por um factor eta até aos dados completos"""
+    n_rungs = int(math.floor(math.log(1 / min_fraction, eta))) + 1
+    return [eta ** (rung - n_rungs + 1) for rung in range(n_rungs)]
+
+
+def _evaluate_chunk(configs, X, y, folds, fraction, seed):
+    """Precisão média de validação cruzada de um bloco de configurações (corre num processo)"""
+    return [(model_type, params,
+             curve_point(build_model(model_type, params, seed), X, y, folds, fraction)['val_scores'].mean())
+            for model_type, params in configs]
+
+
+def promote(rung_scores, eta):
+    """Configurações que passam à ronda seguinte: o melhor 1/eta de cada tipo de modelo
+
+    A selecção é feita dentro de cada família, para que nenhum tipo de modelo seja
+    eliminado por inteiro numa ronda com poucos dados; cada família mantém pelo
+    menos uma configuração.
+    """
+    promoted = []
+    for model_type in dict.fromkeys(model_type for model_type, _, _ in rung_scores):
+        family = sorted((entry for entry in rung_scores if entry[0] == model_type),
+                        key=lambda entry: entry[2], reverse=True)
+        promoted += [(model_type, params) for _, params, _ in family[:max(1, len(family) // eta)]]
+    return promoted
+
+
+def _leaderboard(rows):
+    board = pd.DataFrame(rows, columns=['Modelo', 'Hiperparâmetros', 'Ronda', 'Fracção do Treino',
+                                        'Precisão VC', 'model_type', 'params'])
+    return board.sort_values(['Ronda', 'Precisão VC'], ascending=False).reset_index(drop=True)
+
+
+def successive_halving(X, y, folds, seed, eta=None, min_fraction=None, chunk_size=None):
+    """Pesquisa por divisões sucessivas sobre as grelhas da árvore e do KNN
+
+    Todas as configurações começam com uma fracção pequena do treino de cada
+    partição; em cada ronda só o melhor 1/eta de cada tipo de modelo passa à
+    seguinte, com eta vezes mais dados, até à última ronda com os dados completos.
+    É um gerador: depois de cada bloco avaliado devolve (ronda, fracção, avaliadas,
+    total da ronda, leaderboard), para que a página possa mostrar o progresso à
+    medida que chega. As rondas concluídas ficam em cache e não são repetidas.
+    """
+    eta = eta or AUTO_TUNE_CONFIG['eta']
+    min_fraction = min_fraction or AUTO_TUNE_CONFIG['min_fraction']
+    chunk_size = chunk_size or AUTO_TUNE_CONFIG['chunk_size']
+    fractions = rung_fractions(eta, min_fraction)
+    X, y = np.asarray(X), np.asarray(y)
+
+    search_key = make_key(X, y, folds, seed, eta, min_fraction)
+    survivors = all_configs()
+    rows = []
+    for rung, fraction in enumerate(fractions):
+        rung_key = make_key(search_key, rung)
+        completed = _rungs.get(rung_key)
+        if completed is not None:
+            rung_rows, promoted = completed
+            rows += rung_rows
+            yield rung, fraction, len(rung_rows), len(rung_rows), _leaderboard(rows)
+            survivors = promoted
+            continue
+
+        pool = process_pool()
+        rung_rows = []
+        chunks = [survivors[i:i + chunk_size] for i in range(0, len(survivors), chunk_size)]
+        futures = [pool.submit(_evaluate_chunk, chunk, X, y, folds, fraction, seed) for chunk in chunks]
+
+        rung_scores = []
+        for future in as_completed(futures):
+            for model_type, params, score in future.result():
+                rung_scores.append((model_type, params, score))
+                rung_rows.append((MODEL_LABELS[model_type], _format_params(params), rung + 1,
+                                  fraction, score, model_type, params))
+            yield rung, fraction, len(rung_scores), len(survivors), _leaderboard(rows + rung_rows)
+
+        rows += rung_rows
+        survivors = promote(rung_scores, eta)
+        _rungs.put(rung_key, (rung_rows, survivors))
+
+
+def _format_params(params):
+    return ", ".join(f"{name}={value}" for name, value in params.items())
+
+
+def best_params(board):
+    """Melhores hiperparâmetros de cada tipo de modelo na ronda mais alta que atingiu"""
+    best = {}
+    for row in board.itertuples():
+        if row.model_type not in best:
+            best[row.model_type] = row.params
+    return best
@@ -0,0 +1,140 @@
+# utils/batch_scoring.py
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from utils.compiled_tree import compile_estimator
+from utils.downloads import PARQUET_AVAILABLE
+from utils.model_registry import latest_version, load_model
+
+# Colunas copiadas da entrada para o ficheiro de previsões, quando existem
+ID_COLUMNS = ['PassengerId']
+
+# Modelo carregado uma vez por processo do pool (mapeado em memória a partir do registo;
+# as árvores de decisão são compiladas para a travessia vectorizada)
+_worker_model = None
+
+
+def _init_worker(model_type, version):
+    global _worker_model
+    estimator, metadata = load_model(model_type, version)
+    _worker_model = compile_estimator(estimator), metadata
+
+
+def score_chunk(chunk, pipeline):
+    """Previsões de um bloco do manifesto: identificadores, classe prevista e probabilidade
+
+    `pipeline` é o pipeline do registo, que prepara as características a partir
+    das colunas originais do manifesto.
+    """
+    result = chunk[[column for column in ID_COLUMNS if column in chunk.columns]].copy()
+    result['Survived_pred'] = pipeline.predict(chunk)
+    if hasattr(pipeline, 'predict_proba'):
+        result['Survived_proba'] = pipeline.predict_proba(chunk)[:, 1]
+    return result
+
+
+def _score_in_worker(chunk):
+    pipeline, _ = _worker_model
+    return score_chunk(chunk, pipeline)
+
+
+def read_chunks(path, chunksize):
+    """Lê o manifesto (CSV ou Parquet) em blocos de `chunksize` linhas"""
+    if path.endswith('.parquet'):
+        if not PARQUET_AVAILABLE:
+            raise RuntimeError("A leitura de Parquet requer o pyarrow")
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class _ChunkWriter:
+    """Escreve os blocos de previsões à medida que chegam, sem os manter em memória"""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._first = True
+
+    def write(self, frame):
+        if self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_file(input_path, output_path, model_type, version=None, chunksize=100_000,
+               workers=None, report=print):
+    """Pontua o manifesto bloco a bloco num pool de processos e escreve as previsões por ordem
+
+    No máximo 2 × workers blocos estão em memória de cada vez, pelo que o consumo de
+    memória não depende do tamanho do ficheiro. Devolve (linhas, segundos).
+    """
+    version = version or latest_version(model_type)
+    if version is None or load_model(model_type, version)[0] is None:
+        raise RuntimeError(f"Não existe no registo nenhum modelo '{model_type}'"
+                           + (f" com a versão {version}" if version else ""))
+
+    workers = workers or os.cpu_count()
+    writer = _ChunkWriter(output_path)
+    start = time.perf_counter()
+    rows = 0
+    pending = []
+
+    def flush_oldest():
+        nonlocal rows
+        frame = pending.pop(0).result()
+        writer.write(frame)
+        rows += len(frame)
+        elapsed = time.perf_counter() - start
+        report(f"{rows:>12,} linhas  {rows / elapsed:>10,.0f} linhas/s")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_type, version)) as pool:
+        for chunk in read_chunks(input_path, chunksize):
+            pending.append(pool.submit(_score_in_worker, chunk))
+            if len(pending) >= 2 * workers:
+                flush_oldest()
+        while pending:
+            flush_oldest()
+    writer.close()
+
+    return rows, time.perf_counter() - start
+
+
+def _main(argv=None):
+    parser = argparse.ArgumentParser(description="Scoring em lote de manifestos de passageiros")
+    parser.add_argument('input', help="manifesto de entrada (.csv ou .parquet)")
+    parser.add_argument('output', help="ficheiro de previsões (.csv ou .parquet)")
+    parser.add_argument('--model', default='decision_tree',
+                        choices=['decision_tree', 'knn', 'sgd', 'naive_bayes'],
+                        help="tipo de modelo do registo")
+    parser.add_argument('--version', default=None, help="versão do registo (por omissão a mais recente)")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="linhas por bloco")
+    parser.add_argument('--workers', type=int, default=None, help="processos (por omissão, um por CPU)")
+    args = parser.parse_args(argv)
+
+    rows, seconds = score_file(args.input, args.output, args.model, args.version,
+                               args.chunksize, args.workers,
+                               report=lambda line: print(line, file=sys.stderr))
+    print(f"{rows:,} linhas em {seconds:.1f} s ({rows / max(seconds, 1e-9):,.0f} linhas/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    # python -m utils.batch_scoring manifesto.csv previsoes.csv [--model knn] [--workers 8]
+    _main()
@@ -0,0 +1,131 @@
+# utils/cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+def dataframe_fingerprint(df):
+    """Calcula uma impressão digital estável do conteúdo de um DataFrame ou Series"""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(df, pd.DataFrame):
+        digest.update(repr(list(df.columns)).encode('utf-8'))
+        digest.update(repr(df.dtypes.astype(str).tolist()).encode('utf-8'))
+    else:
+        digest.update(repr((df.name, str(df.dtype))).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def value_fingerprint(value):
+    """Impressão digital de um argumento arbitrário (DataFrame, array ou valor simples)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return dataframe_fingerprint(value)
+    if isinstance(value, np.ndarray):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((value.shape, str(value.dtype))).encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+        return digest.hexdigest()
+    if isinstance(value, dict):
+        return repr(sorted((k, value_fingerprint(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return repr([value_fingerprint(v) for v in value])
+    return repr(value)
+
+
+def make_key(*parts):
+    """Combina várias partes numa chave de cache compacta"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(value_fingerprint(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def approximate_nbytes(value, _depth=0, _seen=None):
+    """Estimativa da memória ocupada por um resultado: soma dos arrays e DataFrames que contém
+
+    Percorre dicionários, listas, tuplos e os atributos de objectos (por exemplo,
+    estimadores ajustados e os seus índices) até alguns níveis de profundidade; os
+    restantes valores contam como 0. Serve para limitar caches em bytes sem serializar.
+    """
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen or _depth > 6:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        children = value.values()
+    elif isinstance(value, (list, tuple)):
+        children = value
+    elif hasattr(value, '__dict__') and not isinstance(value, type):
+        children = vars(value).values()
+    else:
+        return 0
+    return sum(approximate_nbytes(child, _depth + 1, _seen) for child in children)
+
+
+class LRUCache:
+    """Cache LRU limitada em número de entradas e (opcionalmente) em bytes
+
+    É partilhada entre as sessões do processo, pelo que todas as operações são
+    protegidas por um lock.
+    """
+
+    def __init__(self, max_items=128, max_bytes=None, sizeof=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_items or
+                                     (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Devolve acertos, falhas, número de entradas e bytes ocupados"""
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'items': len(self._entries),
+                'bytes': self._bytes,
+            }
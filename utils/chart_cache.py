@@ -0,0 +1,97 @@
+# utils/chart_cache.py
+import os
+import tempfile
+import matplotlib.pyplot as plt
+import streamlit as st
+from config import CHART_CACHE_CONFIG
+from utils.cache import LRUCache, make_key
+from utils.visualization import COLORS, current_render_quality, figure_to_bytes, show_image
+
+# Parâmetros do matplotlib que alteram o aspecto final dos gráficos
+THEME_RCPARAMS = [
+    'figure.figsize', 'figure.dpi', 'font.size', 'font.family',
+    'axes.facecolor', 'axes.edgecolor', 'axes.prop_cycle', 'grid.color',
+]
+
+_memory_cache = LRUCache(
+    max_items=CHART_CACHE_CONFIG['max_items'],
+    max_bytes=CHART_CACHE_CONFIG['max_bytes'],
+    sizeof=len,
+)
+
+
+def theme_fingerprint():
+    """Identifica o tema activo (rcParams relevantes e cores globais)"""
+    return make_key([repr(plt.rcParams[name]) for name in THEME_RCPARAMS], repr(COLORS))
+
+
+def _disk_path(key, fmt):
+    disk_dir = CHART_CACHE_CONFIG['disk_dir']
+    return os.path.join(disk_dir, f"{key}.{fmt}") if disk_dir else None
+
+
+def _read_disk(key, fmt):
+    path = _disk_path(key, fmt)
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    return None
+
+
+def _write_disk(key, fmt, payload):
+    path = _disk_path(key, fmt)
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def chart_key(chart_id, args=(), kwargs=None, fmt='png', dpi=None):
+    """Chave de cache: identificador, impressão digital dos argumentos, formato, resolução e tema"""
+    return make_key(chart_id, args, kwargs or {}, fmt, dpi, theme_fingerprint())
+
+
+def get_cached_chart(key, fmt='png'):
+    """Procura o gráfico na memória e depois no disco; devolve None se não existir"""
+    payload = _memory_cache.get(key)
+    if payload is None:
+        payload = _read_disk(key, fmt)
+        if payload is not None:
+            _memory_cache.put(key, payload)
+    return payload
+
+
+def store_chart(key, payload, fmt='png'):
+    """Guarda o gráfico renderizado na memória e, se configurado, no disco"""
+    _memory_cache.put(key, payload)
+    _write_disk(key, fmt, payload)
+
+
+def render_chart_bytes(chart_id, builder, *args, fmt='png', dpi=None, **kwargs):
+    """Devolve os bytes do gráfico, construindo-o apenas se não estiver em cache
+
+    A chave combina o identificador do gráfico, a impressão digital dos dados e
+    parâmetros recebidos, o formato, a resolução e o tema activo. O `builder` deve ser uma
+    função pura que recebe `*args, **kwargs` e devolve a figura sem a apresentar.
+    """
+    key = chart_key(chart_id, args, kwargs, fmt, dpi)
+    payload = get_cached_chart(key, fmt)
+    if payload is None:
+        payload = figure_to_bytes(builder(*args, **kwargs), fmt=fmt, dpi=dpi)
+        store_chart(key, payload, fmt)
+    return payload
+
+
+def cached_chart(chart_id, builder, *args, **kwargs):
+    """Apresenta um gráfico a partir da cache, na qualidade activa, evitando o matplotlib em visitas repetidas"""
+    quality = current_render_quality()
+    payload = render_chart_bytes(chart_id, builder, *args, fmt=quality['format'], dpi=quality['dpi'], **kwargs)
+    show_image(payload, fmt=quality['format'])
+
+
+def chart_cache_stats():
+    """Estatísticas da cache em memória"""
+    return _memory_cache.stats()
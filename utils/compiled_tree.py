@@ -0,0 +1,204 @@
+# utils/compiled_tree.py
+import argparse
+import sys
+import time
+from array import array
+import numpy as np
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeClassifier
+
+LEAF = -1
+
+
+class CompiledTree:
+    """Árvore de decisão exportada para arrays planos, sem a validação do scikit-learn
+
+    Cada nó tem a característica, o limiar, os filhos (-1 nas folhas), o lado
+    para onde vão os valores em falta e as probabilidades das classes. As
+    comparações são feitas em float32 e os NaN seguem `missing_go_to_left`, como
+    no scikit-learn, pelo que as previsões coincidem com as de `model.predict`.
+    """
+
+    def __init__(self, model):
+        tree = model.tree_
+        # As folhas têm característica -2 no scikit-learn; 0 mantém a indexação válida
+        self.feature = np.maximum(tree.feature, 0).astype(np.intp)
+        self.threshold = tree.threshold.copy()
+        self.missing_left = np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)),
+                                       dtype=bool)
+        self.left = tree.children_left.astype(np.intp)
+        self.right = tree.children_right.astype(np.intp)
+        values = tree.value[:, 0, :]
+        self.proba = values / values.sum(axis=1, keepdims=True)
+        self.classes_ = model.classes_.copy()
+        self.max_depth = tree.max_depth
+        self.n_features_in_ = model.n_features_in_
+        self.feature_names_in_ = getattr(model, 'feature_names_in_', None)
+
+    def apply(self, X):
+        """Folha de cada linha: todas as linhas descem a árvore em simultâneo, um nível por passo"""
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))
+        nodes = np.zeros(len(X), dtype=np.intp)
+        for _ in range(self.max_depth):
+            internal = self.left[nodes] != LEAF
+            if not internal.any():
+                break
+            values = X[rows, self.feature[nodes]]
+            go_left = (values <= self.threshold[nodes]) | (np.isnan(values) & self.missing_left[nodes])
+            nodes = np.where(internal, np.where(go_left, self.left[nodes], self.right[nodes]), nodes)
+        return nodes
+
+    def predict_proba(self, X):
+        return self.proba[self.apply(X)]
+
+    def predict(self, X):
+        return self.classes_[self.proba[self.apply(X)].argmax(axis=1)]
+
+    def python_source(self, function_name='score_row'):
+        """Código Python puro (if/else encaixados) que devolve as probabilidades de uma linha
+
+        Um NaN falha qualquer comparação; nos nós em que os valores em falta vão
+        para a esquerda, o teste inclui também `x != x`.
+        """
+        lines = [f"def {function_name}(x):"]
+
+        def emit(node, indent):
+            pad = '    ' * indent
+            if self.left[node] == LEAF:
+                lines.append(f"{pad}return {tuple(float(p) for p in self.proba[node])!r}")
+                return
+            value = f"x[{self.feature[node]}]"
+            test = f"{value} <= {float(self.threshold[node])!r}"
+            if self.missing_left[node]:
+                test += f" or {value} != {value}"
+            lines.append(f"{pad}if {test}:")
+            emit(self.left[node], indent + 1)
+            lines.append(f"{pad}else:")
+            emit(self.right[node], indent + 1)
+
+        emit(0, 1)
+        return "\n".join(lines) + "\n"
+
+    def row_scorer(self):
+        """Função para uma única linha (sequência de valores pela ordem das características)
+
+        A linha é convertida para float32 com array('f'), tal como o scikit-learn faz
+        antes de comparar com os limiares.
+        """
+        namespace = {}
+        exec(compile(self.python_source('_score'), '<compiled_tree>', 'exec'), namespace)
+        score = namespace['_score']
+
+        def score_row(row):
+            return score(array('f', row))
+
+        return score_row
+
+
+def compile_estimator(estimator):
+    """Substitui uma árvore de decisão pela versão compilada; os restantes modelos ficam iguais
+
+    Num pipeline do registo só o último passo é substituído; a preparação das
+    características mantém-se.
+    """
+    if isinstance(estimator, Pipeline) and isinstance(estimator[-1], DecisionTreeClassifier):
+        return _CompiledPipeline(estimator[:-1], CompiledTree(estimator[-1]))
+    return CompiledTree(estimator) if isinstance(estimator, DecisionTreeClassifier) else estimator
+
+
+class _CompiledPipeline:
+    """Preparação das características do pipeline seguida da árvore compilada"""
+
+    def __init__(self, prepare, tree):
+        self.prepare = prepare
+        self.tree = tree
+
+    def predict(self, X):
+        return self.tree.predict(self.prepare.transform(X))
+
+    def predict_proba(self, X):
+        return self.tree.predict_proba(self.prepare.transform(X))
+
+
+def check_parity(model, X):
+    """Compara o scikit-learn com a travessia vectorizada e com o código gerado
+
+    Devolve o número de previsões diferentes e a maior diferença de probabilidade
+    em cada um dos caminhos compilados.
+    """
+    compiled = CompiledTree(model)
+    score_row = compiled.row_scorer()
+    X = np.asarray(X, dtype=float)
+
+    expected_pred = model.predict(X)
+    expected_proba = model.predict_proba(X)
+    batch_proba = compiled.predict_proba(X)
+    row_proba = np.array([score_row(row) for row in X.tolist()])
+    return {
+        'batch_mismatches': int((compiled.predict(X) != expected_pred).sum()),
+        'batch_max_proba_diff': float(np.abs(batch_proba - expected_proba).max()),
+        'row_mismatches': int((compiled.classes_[row_proba.argmax(axis=1)] != expected_pred).sum()),
+        'row_max_proba_diff': float(np.abs(row_proba - expected_proba).max()),
+    }
+
+
+def _time_per_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def benchmark(model, X, batch_sizes=(1, 10, 100, 1000), repeat=200):
+    """Tempo médio por chamada (µs) do scikit-learn e dos caminhos compilados, por tamanho de lote"""
+    compiled = CompiledTree(model)
+    score_row = compiled.row_scorer()
+    X = np.asarray(X, dtype=float)
+    results = []
+    for size in batch_sizes:
+        batch = X[np.arange(size) % len(X)]
+        timings = {
+            'batch_size': size,
+            'sklearn_us': _time_per_call(lambda: model.predict_proba(batch), repeat) * 1e6,
+            'compiled_us': _time_per_call(lambda: compiled.predict_proba(batch), repeat) * 1e6,
+        }
+        if size == 1:
+            row = batch[0].tolist()
+            timings['python_us'] = _time_per_call(lambda: score_row(row), repeat) * 1e6
+        results.append(timings)
+    return results
+
+
+def _main(argv=None):
+    from utils.model_registry import latest_version, load_model
+
+    parser = argparse.ArgumentParser(description="Paridade e benchmark da árvore de decisão compilada")
+    parser.add_argument('data', help="CSV do Titanic (formato original) usado nas comparações")
+    parser.add_argument('--version', default=None, help="versão do registo (por omissão a mais recente)")
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+    version = args.version or latest_version('decision_tree')
+    pipeline, _ = load_model('decision_tree', version) if version else (None, None)
+    if pipeline is None:
+        sys.exit("Não existe no registo nenhuma árvore de decisão")
+
+    # O benchmark compara só a inferência: a preparação é feita uma vez, fora das medições
+    model = pipeline[-1]
+    X = pipeline[:-1].transform(pd.read_csv(args.data)).to_numpy(dtype=float)
+
+    parity = check_parity(model, X)
+    print(f"Paridade em {len(X)} linhas: {parity}")
+    print(f"{'lote':>6} {'sklearn µs':>12} {'compilada µs':>13} {'python µs':>10}")
+    for row in benchmark(model, X, repeat=args.repeat):
+        python_us = f"{row['python_us']:10.1f}" if 'python_us' in row else f"{'':>10}"
+        print(f"{row['batch_size']:>6} {row['sklearn_us']:12.1f} {row['compiled_us']:13.1f} {python_us}")
+    if parity['batch_mismatches'] or parity['row_mismatches']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # python -m utils.compiled_tree titanic.csv [--version VERSÃO]
+    _main()
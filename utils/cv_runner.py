@@ -0,0 +1,79 @@
+# utils/cv_runner.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import StratifiedKFold
+from config import CV_CONFIG
+from utils.cache import LRUCache, make_key
+
+# Partições de validação cruzada por versão dos dados, partilhadas por todos os modelos
+_folds = LRUCache(max_items=8)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=CV_CONFIG['max_workers'])
+        return _pool
+
+
+def fold_indices(X, y, cv=None):
+    """Índices (treino, validação) das partições estratificadas, calculados uma vez por versão dos dados
+
+    São as mesmas partições que o cross_val_score(cv=5) usaria para um classificador.
+    """
+    cv = cv or CV_CONFIG['folds']
+    key = make_key(X, y, cv)
+    folds = _folds.get(key)
+    if folds is None:
+        folds = tuple(StratifiedKFold(n_splits=cv).split(np.asarray(X), np.asarray(y)))
+        _folds.put(key, folds)
+    return folds
+
+
+def submit(func, *args, **kwargs):
+    """Submete uma tarefa ao pool partilhado; a tarefa não deve ela própria usar map_folds em paralelo"""
+    return _get_pool().submit(func, *args, **kwargs)
+
+
+def map_folds(func, folds, n_jobs=None):
+    """Aplica `func(train_idx, val_idx)` a cada partição, em paralelo no pool partilhado
+
+    Com n_jobs=1 corre em série (por exemplo, dentro de um processo do pool da grelha).
+    """
+    if n_jobs == 1:
+        return [func(train_idx, val_idx) for train_idx, val_idx in folds]
+    return list(_get_pool().map(lambda fold: func(*fold), folds))
+
+
+def _take(data, idx):
+    return data.iloc[idx] if hasattr(data, 'iloc') else data[idx]
+
+
+def run_cv(model, X, y, folds, n_jobs=None):
+    """Validação cruzada nas partições dadas, reutilizando cada modelo ajustado para várias métricas
+
+    Devolve 'scores' (precisão por partição), 'f1_scores', 'mean', 'std' e os
+    modelos ajustados em cada partição ('fold_models').
+    """
+    def fit_fold(train_idx, val_idx):
+        fold_model = clone(model).fit(_take(X, train_idx), _take(y, train_idx))
+        y_val = _take(y, val_idx)
+        pred = fold_model.predict(_take(X, val_idx))
+        return fold_model, accuracy_score(y_val, pred), f1_score(y_val, pred)
+
+    fold_models, scores, f1_scores = zip(*map_folds(fit_fold, folds, n_jobs=n_jobs))
+    scores = np.array(scores)
+    return {
+        'scores': scores,
+        'f1_scores': np.array(f1_scores),
+        'mean': scores.mean(),
+        'std': scores.std(),
+        'fold_models': list(fold_models),
+    }
@@ -26,4 +26,33 @@ def prepare_features(df):
     features = ['Pclass', 'Sex', 'Age', 'Fare', 'FamilySize', 'IsAlone']
     X = df[features].copy()
     y = df['Survived']
-    return X, y
\ No newline at end of file
+    return X, y
+
+# Colunas de entrada (dados originais) e características usadas pelos modelos da página de modelação
+MODEL_INPUTS = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked']
+MODEL_FEATURES = ['Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'Embarked_C', 'Embarked_Q', 'Embarked_S']
+EMBARKED_PORTS = ['C', 'Q', 'S']
+
+
+def model_fill_values(df):
+    """Valores de substituição calculados nos dados de treino (guardados com o modelo)"""
+    return {'Age': float(df['Age'].median()), 'Fare': float(df['Fare'].median())}
+
+
+def prepare_model_features(df, fill_values=None):
+    """Prepara os dados para os modelos (a mesma preparação na página e no scoring em lote)
+
+    Codifica 'Sex' (female=1, como em clean_data) e cria as variáveis dummy de
+    'Embarked' com as categorias fixas, pelo que o resultado não depende de quais
+    portos aparecem num bloco de dados. Com `fill_values`, preenche os valores em falta.
+    """
+    df = df.copy()
+    if df['Sex'].dtype == 'object':
+        df['Sex'] = (df['Sex'] == 'female').astype(int)
+    for port in EMBARKED_PORTS:
+        column = f'Embarked_{port}'
+        if column not in df.columns:
+            df[column] = df['Embarked'] == port
+    if fill_values:
+        df = df.fillna(fill_values)
+    return df
@@ -0,0 +1,30 @@
+# utils/diagnostics.py
+import threading
+import streamlit as st
+
+# Métricas de desempenho do processo, apresentadas na barra lateral
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def set_metric(name, value):
+    """Regista o valor de uma métrica"""
+    with _metrics_lock:
+        _metrics[name] = value
+
+
+def get_metrics():
+    """Devolve uma cópia das métricas registadas"""
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+def show_diagnostics():
+    """Apresenta as métricas registadas num painel da barra lateral"""
+    metrics = get_metrics()
+    if not metrics:
+        return
+
+    with st.sidebar.expander("⚙️ Diagnóstico"):
+        for name, value in metrics.items():
+            st.caption(f"**{name}:** {value}")
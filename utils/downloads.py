@@ -0,0 +1,68 @@
+# utils/downloads.py
+import gzip
+import importlib.util
+import io
+import streamlit as st
+from utils.cache import dataframe_fingerprint
+
+# Formatos disponíveis: rótulo -> (extensão, tipo MIME)
+DOWNLOAD_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+# O Parquet depende do pyarrow (instalado com o Streamlit), mas não o importamos no arranque
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+
+def available_formats():
+    """Devolve os formatos de transferência suportados neste ambiente"""
+    return [label for label in DOWNLOAD_FORMATS
+            if label != 'Parquet' or PARQUET_AVAILABLE]
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _serialize(fingerprint, extension, _data):
+    """Serializa o DataFrame; a cache é indexada pela impressão digital dos dados"""
+    if extension == 'parquet':
+        buffer = io.BytesIO()
+        _data.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+
+    payload = _data.to_csv(index=False).encode('utf-8')
+    if extension == 'csv.gz':
+        return gzip.compress(payload, compresslevel=6)
+    return payload
+
+
+def download_dataframe(label, data, file_name, key, formats=None):
+    """Botão de transferência que só serializa os dados quando pedido
+
+    O ficheiro é gerado apenas depois de o utilizador carregar em "Preparar" e fica
+    em cache pela impressão digital dos dados, pelo que os reruns seguintes não
+    voltam a pagar a serialização.
+    """
+    formats = formats or available_formats()
+    ready_key = f"{key}_ready"
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox("Formato", formats, key=f"{key}_format",
+                           label_visibility="collapsed")
+    with col2:
+        if not st.session_state.get(ready_key):
+            if st.button(f"⚙️ Preparar: {label}", key=f"{key}_prepare"):
+                st.session_state[ready_key] = True
+                st.rerun()
+            return
+
+        extension, mime = DOWNLOAD_FORMATS[fmt]
+        payload = _serialize(dataframe_fingerprint(data), extension, data)
+        st.download_button(
+            label=f"{label} ({len(payload) / 1024:.0f} KB)",
+            data=payload,
+            file_name=f"{file_name}.{extension}",
+            mime=mime,
+            key=key,
+        )
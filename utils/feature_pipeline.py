@@ -0,0 +1,57 @@
+# utils/feature_pipeline.py
+from joblib import Memory
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.pipeline import Pipeline
+from config import FEATURE_PIPELINE_CONFIG
+from utils.cache import LRUCache, dataframe_fingerprint
+from utils.data_processor import MODEL_FEATURES, model_fill_values, prepare_model_features
+
+# Matrizes de características já preparadas, por versão dos dados
+_matrices = LRUCache(max_items=FEATURE_PIPELINE_CONFIG['max_matrices'])
+
+
+class ModelFeatures(BaseEstimator, TransformerMixin):
+    """Passo de preparação partilhado pela página, pelo registo, pelo scoring em lote e pelo serviço
+
+    O ajuste guarda os valores de substituição de 'Age' e 'Fare' calculados no
+    treino; a transformação aplica `prepare_model_features` e selecciona as
+    características dos modelos. Aceita tanto os dados originais como dados já
+    preparados, pelo que pode ser aplicado mais de uma vez sem alterar o resultado.
+    """
+
+    def fit(self, X, y=None):
+        self.fill_values_ = model_fill_values(X)
+        return self
+
+    def transform(self, X):
+        return prepare_model_features(X, self.fill_values_)[MODEL_FEATURES]
+
+    def get_feature_names_out(self, input_features=None):
+        return list(MODEL_FEATURES)
+
+
+def _memory():
+    return Memory(FEATURE_PIPELINE_CONFIG['memory_dir'], verbose=0)
+
+
+def model_pipeline(estimator):
+    """Pipeline preparação → modelo; a preparação ajustada fica em cache no disco
+
+    Ajustar vários modelos sobre os mesmos dados de treino reutiliza o passo de
+    preparação já ajustado em vez de o repetir em cada ajuste.
+    """
+    return Pipeline([('features', ModelFeatures()), ('model', estimator)], memory=_memory())
+
+
+def feature_matrix(df):
+    """Características dos modelos para um DataFrame, preparadas uma vez por versão dos dados
+
+    É esta matriz que alimenta o treino, a validação cruzada e as pesquisas da
+    página de modelação.
+    """
+    key = dataframe_fingerprint(df)
+    X = _matrices.get(key)
+    if X is None:
+        X = ModelFeatures().fit_transform(df)
+        _matrices.put(key, X)
+    return X
@@ -0,0 +1,138 @@
+# utils/grid_precompute.py
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import streamlit as st
+from config import GRID_CONFIG
+from utils.cache import LRUCache, make_key
+from utils.diagnostics import set_metric
+from utils.knn_sweep import knn_sweep
+from utils.models import MODEL_GRIDS, grid_params
+from utils.tree_paths import tree_depth_sweep
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Um trabalho por versão dos dados (impressão digital de X, y e parâmetros da divisão)
+_jobs = LRUCache(max_items=GRID_CONFIG['max_jobs'])
+_jobs_lock = threading.Lock()
+
+
+def process_pool():
+    """Pool de processos partilhado pelos cálculos de modelos em segundo plano
+
+    Os processos são criados com 'spawn': o servidor do Streamlit tem várias threads
+    (loop do Tornado, scripts de outras sessões, pools de threads) e um fork a partir
+    dele pode herdar locks adquiridos e bloquear o processo filho.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=GRID_CONFIG['max_workers'],
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _params_key(params):
+    return tuple(sorted(params.items()))
+
+
+def _evaluate_tree_paths(X, y, split, folds, min_samples_split, seed):
+    """Avalia todas as profundidades da árvore para um valor de min_samples_split"""
+    max_depth = max(MODEL_GRIDS['decision_tree']['max_depth'])
+    sweep = tree_depth_sweep(X, y, split, folds, min_samples_split,
+                             max_depth=max_depth, seed=seed, n_jobs=1)
+    return [({'max_depth': depth, 'min_samples_split': min_samples_split}, result)
+            for depth, result in sweep.items()]
+
+
+def _evaluate_knn_grid(X, y, split, folds):
+    """Avalia toda a grelha do KNN com uma consulta de vizinhos por partição"""
+    max_k = max(MODEL_GRIDS['knn']['n_neighbors'])
+    return [({'n_neighbors': k, 'weights': weights}, result)
+            for (k, weights), result in knn_sweep(X, y, split, folds, max_k=max_k, n_jobs=1).items()]
+
+
+class GridJob:
+    """Avaliação em segundo plano de toda a grelha de hiperparâmetros de todos os modelos"""
+
+    def __init__(self, X, y, split, folds, split_params):
+        self.total = sum(len(params_list) for model_type in MODEL_GRIDS
+                         for params_list in grid_params(model_type))
+        self.failed = 0
+        self._results = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+        seed = split_params[0]
+        pool = process_pool()
+        future = pool.submit(_evaluate_knn_grid, X, y, split, folds)
+        future.add_done_callback(self._collect('knn', sum(map(len, grid_params('knn')))))
+
+        depths = len(MODEL_GRIDS['decision_tree']['max_depth'])
+        for min_samples_split in MODEL_GRIDS['decision_tree']['min_samples_split']:
+            future = pool.submit(_evaluate_tree_paths, X, y, split, folds, min_samples_split, seed)
+            future.add_done_callback(self._collect('decision_tree', depths))
+
+    def _collect(self, model_type, size):
+        def callback(future):
+            with self._lock:
+                if future.exception() is not None:
+                    self.failed += size
+                    return
+                for params, result in future.result():
+                    self._results[(model_type, _params_key(params))] = result
+                if self.done():
+                    set_metric("Grelha de hiperparâmetros",
+                               f"{len(self._results)} combinações em "
+                               f"{time.perf_counter() - self._start:.1f} s")
+
+        return callback
+
+    def lookup(self, model_type, params):
+        """Resultado pré-calculado para os hiperparâmetros dados, ou None se ainda não existir"""
+        with self._lock:
+            return self._results.get((model_type, _params_key(params)))
+
+    def completed(self):
+        return len(self._results) + self.failed
+
+    def done(self):
+        return self.completed() >= self.total
+
+
+def start_grid_job(X, y, split, folds, split_params):
+    """Inicia (uma única vez por versão dos dados) a avaliação da grelha e devolve o trabalho"""
+    key = make_key(X, y, split_params)
+    with _jobs_lock:
+        job = _jobs.get(key)
+        if job is None:
+            job = GridJob(X, y, split, folds, split_params)
+            _jobs.put(key, job)
+    return job
+
+
+def grid_job(X, y, split_params):
+    """Trabalho já iniciado para estes dados, ou None"""
+    with _jobs_lock:
+        return _jobs.get(make_key(X, y, split_params))
+
+
+def show_grid_progress(job):
+    """Progresso da grelha no momento do rerun (sem esperar que termine)
+
+    Os resultados já calculados são usados à medida que chegam; o progresso é
+    actualizado no rerun seguinte (qualquer interacção ou o botão de actualizar).
+    """
+    if job.done():
+        return
+
+    completed = job.completed()
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.progress(completed / job.total,
+                    text=f"A pré-calcular a grelha de hiperparâmetros: {completed}/{job.total}")
+    with col2:
+        # O clique basta para provocar o rerun que actualiza o progresso
+        st.button("🔄 Actualizar", key='grid_progress_refresh')
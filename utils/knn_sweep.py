@@ -0,0 +1,75 @@
+# utils/knn_sweep.py
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.neighbors import NearestNeighbors
+from utils.cv_runner import map_folds
+
+WEIGHTS = ('uniform', 'distance')
+
+
+def _prefix_votes(labels, weights, n_classes):
+    """Votos acumulados por classe para os k primeiros vizinhos: (amostras, k, classes)"""
+    one_hot = np.zeros(labels.shape + (n_classes,))
+    np.put_along_axis(one_hot, labels[..., None], weights[..., None], axis=2)
+    return np.cumsum(one_hot, axis=1)
+
+
+def distance_weights(distances):
+    """Pesos 1/d como no KNeighborsClassifier: se houver vizinhos a distância zero, só esses contam"""
+    with np.errstate(divide='ignore'):
+        weights = 1.0 / distances
+    exact = distances[:, 0] == 0
+    weights[exact] = (distances[exact] == 0).astype(float)
+    return weights
+
+
+def _predict_all(X_train, y_train, X_query, max_k):
+    """Previsões para todos os k <= max_k e ambos os pesos, com uma única consulta ao índice
+
+    Devolve {(k, weights): previsões}. Os empates são resolvidos a favor da primeira
+    classe (por ordem crescente), tal como no scikit-learn.
+    """
+    classes, encoded = np.unique(y_train, return_inverse=True)
+    index = NearestNeighbors(n_neighbors=max_k).fit(X_train)
+    distances, neighbors = index.kneighbors(X_query)
+    labels = encoded[neighbors]
+
+    votes = {
+        'uniform': _prefix_votes(labels, np.ones_like(distances), len(classes)),
+        'distance': _prefix_votes(labels, distance_weights(distances), len(classes)),
+    }
+    return {(k, weights): classes[votes[weights][:, k - 1].argmax(axis=1)]
+            for weights in WEIGHTS for k in range(1, max_k + 1)}
+
+
+def knn_sweep(X, y, split, folds, max_k=20, n_jobs=None):
+    """Avalia o KNN para todos os k <= max_k e ambos os pesos
+
+    Por cada partição (a divisão treino/teste e as partições de validação cruzada
+    `folds`, de cv_runner.fold_indices) faz uma única consulta dos max_k vizinhos
+    mais próximos; as previsões de cada k obtêm-se por somas acumuladas dos votos.
+    Devolve {(k, weights): resultado} com 'pred', 'accuracy', 'f1', 'cv_scores'
+    e 'cv_f1_scores'.
+    """
+    X_train, X_test, y_train, y_test = (np.asarray(part) for part in split)
+    X_all, y_all = np.asarray(X, dtype=float), np.asarray(y)
+
+    test_preds = _predict_all(X_train.astype(float), y_train, X_test.astype(float), max_k)
+
+    def score_fold(train_idx, val_idx):
+        fold_preds = _predict_all(X_all[train_idx], y_all[train_idx], X_all[val_idx], max_k)
+        return {combo: (accuracy_score(y_all[val_idx], pred), f1_score(y_all[val_idx], pred))
+                for combo, pred in fold_preds.items()}
+
+    fold_scores = map_folds(score_fold, folds, n_jobs=n_jobs)
+
+    return {
+        combo: {
+            'pred': pred,
+            'accuracy': accuracy_score(y_test, pred),
+            'f1': f1_score(y_test, pred),
+            'cv_scores': np.array([scores[combo][0] for scores in fold_scores]),
+            'cv_f1_scores': np.array([scores[combo][1] for scores in fold_scores]),
+        }
+        for combo, pred in test_preds.items()
+    }
@@ -0,0 +1,31 @@
+# utils/layout.py
+import streamlit as st
+
+
+def lazy_tabs(sections, key):
+    """Separadores que só executam o conteúdo da secção seleccionada
+
+    Ao contrário do st.tabs, que corre o corpo de todos os separadores em cada
+    rerun, aqui apenas a função da secção visível é chamada. `sections` é um
+    dicionário rótulo -> função sem argumentos; devolve o rótulo seleccionado.
+    """
+    selection = st.radio(
+        "Secção",
+        list(sections.keys()),
+        horizontal=True,
+        key=key,
+        label_visibility="collapsed",
+    )
+    sections[selection]()
+    return selection
+
+
+def selected_section(labels, key):
+    """Rótulo que lazy_tabs vai apresentar, lido antes de os separadores serem desenhados
+
+    Permite preparar com antecedência (por exemplo, submeter ao executor de
+    renderização) o trabalho das secções visíveis de vários grupos de separadores.
+    """
+    labels = list(labels)
+    selection = st.session_state.get(key)
+    return selection if selection in labels else labels[0]
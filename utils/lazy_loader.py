@@ -0,0 +1,85 @@
+# utils/lazy_loader.py
+import importlib
+import subprocess
+import sys
+import threading
+import time
+from utils.diagnostics import set_metric
+
+
+def import_timed(module_name):
+    """Importa um módulo na primeira utilização e regista quanto tempo demorou"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    set_metric(f"Import {module_name}", f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    return module
+
+
+def lazy_submodules(package_name, names):
+    """Cria o __getattr__ (PEP 562) de um pacote cujos submódulos só são importados quando usados
+
+    `names` é uma lista de submódulos directos ou um dicionário {nome: caminho relativo},
+    para expor no pacote submódulos de subpacotes (por exemplo 'survival.age_survival').
+    """
+    paths = names if isinstance(names, dict) else {name: name for name in names}
+
+    def __getattr__(name):
+        if name in paths:
+            return importlib.import_module(f"{package_name}.{paths[name]}")
+        raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+    return __getattr__
+
+
+def measure_cold_imports(module_names):
+    """Mede o tempo de import de cada módulo num processo Python novo (arranque a frio)"""
+    timings = {}
+    for module_name in module_names:
+        code = (
+            "import time; start = time.perf_counter(); "
+            f"import {module_name}; "
+            "print(time.perf_counter() - start)"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        timings[module_name] = float(result.stdout.strip()) if result.returncode == 0 else None
+    return timings
+
+
+_cold_imports_started = threading.Event()
+
+
+def report_cold_imports(module_names):
+    """Mede os imports a frio numa thread de fundo, uma vez por processo, e publica-os como métricas
+
+    Cada módulo é importado num interpretador novo, pelo que o tempo inclui as
+    dependências que o servidor do Streamlit já tinha carregado.
+    """
+    if _cold_imports_started.is_set():
+        return
+    _cold_imports_started.set()
+
+    def measure():
+        for module_name in module_names:
+            seconds = measure_cold_imports([module_name])[module_name]
+            set_metric(f"Import a frio {module_name}",
+                       f"{seconds * 1000:.0f} ms" if seconds is not None else "falhou")
+
+    threading.Thread(target=measure, name='cold-imports', daemon=True).start()
+
+
+if __name__ == "__main__":
+    # python -m utils.lazy_loader [módulo ...]
+    modules = sys.argv[1:] or [
+        'pages.intro',
+        'pages.initial_analysis',
+        'pages.data_cleaning',
+        'pages.exploratory_analysis',
+        'pages.modeling',
+    ]
+    for module_name, seconds in measure_cold_imports(modules).items():
+        timing = f"{seconds * 1000:8.0f} ms" if seconds is not None else "    falhou"
+        print(f"{timing}  {module_name}")
@@ -0,0 +1,140 @@
+# utils/learning_curve.py
+import threading
+from concurrent.futures import Future
+import numpy as np
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+from utils.cache import LRUCache, make_key
+from utils.cv_runner import map_folds, submit
+
+# Fracções do conjunto de treino de cada partição (as mesmas do learning_curve do scikit-learn)
+TRAIN_FRACTIONS = tuple(float(fraction) for fraction in np.round(np.linspace(0.1, 1.0, 10), 2))
+
+# Um ponto da curva por modelo, hiperparâmetros, versão dos dados e fracção
+_points = LRUCache(max_items=512)
+
+# Pontos em cálculo, para que um rerun não volte a submeter o mesmo trabalho
+_pending = {}
+_pending_lock = threading.RLock()
+
+
+def is_incremental(model):
+    """O modelo pode crescer com mais dados sem recomeçar (partial_fit)
+
+    O warm_start não conta: com os mesmos n_estimators/max_iter, um novo fit com
+    mais dados refaz o treino inteiro e não é mais barato do que um modelo novo.
+    """
+    return hasattr(model, 'partial_fit')
+
+
+def _size(train_idx, fraction):
+    return max(1, int(round(fraction * len(train_idx))))
+
+
+def _score(model, X, y, idx):
+    return model.score(X[idx], y[idx])
+
+
+def curve_point(model, X, y, folds, fraction):
+    """Ajusta um modelo novo por partição com os primeiros n exemplos de treino"""
+    def fit_fold(train_idx, val_idx):
+        subset = train_idx[:_size(train_idx, fraction)]
+        fold_model = clone(model).fit(X[subset], y[subset])
+        return _score(fold_model, X, y, subset), _score(fold_model, X, y, val_idx)
+
+    train_scores, val_scores = zip(*map_folds(fit_fold, folds, n_jobs=1))
+    return {'fraction': fraction, 'n_samples': int(np.mean([_size(t, fraction) for t, _ in folds])),
+            'train_scores': np.array(train_scores), 'val_scores': np.array(val_scores)}
+
+
+def _incremental_curve(model, X, y, folds, fractions):
+    """Curva completa com um único modelo por partição que cresce de fracção em fracção
+
+    Em cada fracção só os exemplos novos são apresentados ao modelo (partial_fit);
+    a normalização é actualizada com os mesmos exemplos, como no treino incremental.
+    """
+    classes = np.unique(y)
+
+    def fit_fold(train_idx, val_idx):
+        fold_model, scaler = clone(model), StandardScaler()
+        scores, seen = [], 0
+        for fraction in fractions:
+            size = _size(train_idx, fraction)
+            new = train_idx[seen:size]
+            if len(new):
+                scaler.partial_fit(X[new])
+                fold_model.partial_fit(scaler.transform(X[new]), y[new], classes=classes)
+            seen = size
+            subset = train_idx[:size]
+            scores.append((fold_model.score(scaler.transform(X[subset]), y[subset]),
+                           fold_model.score(scaler.transform(X[val_idx]), y[val_idx])))
+        return scores
+
+    per_fold = map_folds(fit_fold, folds, n_jobs=1)
+    return {
+        fraction: {
+            'fraction': fraction,
+            'n_samples': int(np.mean([_size(t, fraction) for t, _ in folds])),
+            'train_scores': np.array([scores[i][0] for scores in per_fold]),
+            'val_scores': np.array([scores[i][1] for scores in per_fold]),
+        }
+        for i, fraction in enumerate(fractions)
+    }
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def _store_when_done(key):
+    def callback(future):
+        if future.exception() is None:
+            _points.put(key, future.result())
+        with _pending_lock:
+            _pending.pop(key, None)
+
+    return callback
+
+
+def learning_curve_futures(model_id, model, X, y, folds, fractions=TRAIN_FRACTIONS):
+    """Submete os pontos da curva de aprendizagem e devolve um Future por fracção, pela mesma ordem
+
+    Os pontos já calculados vêm da cache como Futures concluídos. Nos modelos comuns
+    cada fracção é uma tarefa independente do pool (as fracções correm em paralelo);
+    nos incrementais a curva inteira é uma única passagem por partição.
+    """
+    X, y = np.asarray(X), np.asarray(y)
+    data_key = make_key(model_id, model.get_params(), X, y, folds)
+    keys = [make_key(data_key, fraction) for fraction in fractions]
+    with _pending_lock:
+        futures = []
+        for key in keys:
+            point = _points.get(key)
+            futures.append(_done(point) if point is not None else _pending.get(key))
+        missing = [i for i, future in enumerate(futures) if future is None]
+        if not missing:
+            return futures
+
+        if is_incremental(model):
+            for i in missing:
+                futures[i] = _pending[keys[i]] = Future()
+            curve = submit(_incremental_curve, model, X, y, folds, [fractions[i] for i in missing])
+
+            def distribute(curve_future):
+                for i in missing:
+                    if curve_future.exception() is not None:
+                        futures[i].set_exception(curve_future.exception())
+                    else:
+                        futures[i].set_result(curve_future.result()[fractions[i]])
+
+            for i in missing:
+                futures[i].add_done_callback(_store_when_done(keys[i]))
+            curve.add_done_callback(distribute)
+            return futures
+
+        for i in missing:
+            futures[i] = _pending[keys[i]] = submit(curve_point, model, X, y, folds, fractions[i])
+            futures[i].add_done_callback(_store_when_done(keys[i]))
+        return futures
@@ -0,0 +1,39 @@
+# utils/model_cache.py
+from config import MODEL_CACHE_CONFIG
+from utils.cache import LRUCache, approximate_nbytes, make_key
+from utils.diagnostics import set_metric
+
+# Modelos treinados e respectivos resultados, partilhados pelas sessões do processo
+_model_cache = LRUCache(
+    max_items=MODEL_CACHE_CONFIG['max_items'],
+    max_bytes=MODEL_CACHE_CONFIG['max_bytes'],
+    sizeof=approximate_nbytes,
+)
+
+
+def model_key(model_type, params, X, y, split_params):
+    """Chave: impressão digital dos dados, tipo de modelo, hiperparâmetros e divisão (semente, proporção de teste)"""
+    return make_key(model_type, params, X, y, split_params)
+
+
+def cached_fit(model_type, params, X, y, split_params, train):
+    """Devolve o resultado em cache ou chama `train()` (sem argumentos) e guarda-o
+
+    O resultado (modelo ajustado, previsões, métricas e pontuações de validação
+    cruzada) é partilhado entre reruns e sessões, pelo que não deve ser alterado.
+    """
+    key = model_key(model_type, params, X, y, split_params)
+    result = _model_cache.get(key)
+    if result is None:
+        result = train()
+        _model_cache.put(key, result)
+
+    stats = _model_cache.stats()
+    set_metric("Cache de modelos", f"{stats['hits']} acertos / {stats['misses']} treinos "
+                                   f"({stats['items']} em cache, {stats['bytes'] / 2 ** 20:.0f} MB)")
+    return result
+
+
+def model_cache_stats():
+    """Estatísticas da cache de modelos"""
+    return _model_cache.stats()
@@ -0,0 +1,143 @@
+# utils/model_registry.py
+import json
+import os
+import shutil
+import tempfile
+import time
+import joblib
+import sklearn
+from config import REGISTRY_CONFIG
+from utils.cache import LRUCache, make_key
+
+MODEL_FILE = 'model.joblib'
+METADATA_FILE = 'metadata.json'
+
+# Formato dos artefactos: 2 = pipeline completo (preparação das características + modelo);
+# 3 = métricas com as pontuações de cada partição da validação cruzada
+ARTIFACT_FORMAT = 3
+
+# Modelos já carregados neste processo (o disco só é lido na primeira utilização)
+_loaded = LRUCache(max_items=16)
+
+
+def _registry_dir():
+    return REGISTRY_CONFIG['dir']
+
+
+def model_version(model_type, params, features, data_key):
+    """Versão do modelo: tipo, hiperparâmetros, características e impressão digital dos dados de treino"""
+    return make_key(model_type, params, list(features), data_key, sklearn.__version__, ARTIFACT_FORMAT)[:16]
+
+
+def _version_dir(model_type, version):
+    return os.path.join(_registry_dir(), model_type, version)
+
+
+def _read_metadata(path):
+    with open(os.path.join(path, METADATA_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_metadata(path, metadata):
+    fd, tmp_path = tempfile.mkstemp(dir=path, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(path, METADATA_FILE))
+
+
+def save_model(model_type, estimator, params, features, data_key, metrics):
+    """Guarda o pipeline ajustado (preparação + modelo) e os metadados numa nova versão do registo
+
+    A versão é escrita numa pasta temporária e movida para o lugar final de uma só
+    vez; se outra sessão já a tiver registado, a cópia temporária é descartada.
+    """
+    version = model_version(model_type, params, features, data_key)
+    target = _version_dir(model_type, version)
+    if os.path.exists(target):
+        return version
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(target), prefix='.tmp-')
+    joblib.dump(estimator, os.path.join(tmp_dir, MODEL_FILE))
+    now = time.time()
+    _write_metadata(tmp_dir, {
+        'model_type': model_type,
+        'version': version,
+        'params': params,
+        'features': list(features),
+        'data_key': data_key,
+        'metrics': metrics,
+        'sklearn_version': sklearn.__version__,
+        'artifact_format': ARTIFACT_FORMAT,
+        'size_bytes': os.path.getsize(os.path.join(tmp_dir, MODEL_FILE)),
+        'created_at': now,
+        'last_used': now,
+    })
+    try:
+        os.rename(tmp_dir, target)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    evict()
+    return version
+
+
+def load_model(model_type, version):
+    """Carrega uma versão do registo: (estimador, metadados), ou (None, None) se não existir
+
+    Os arrays grandes (por exemplo, os dados de treino guardados pelo KNN) são
+    mapeados em memória em vez de lidos para a RAM.
+    """
+    loaded = _loaded.get((model_type, version))
+    if loaded is not None:
+        return loaded
+
+    path = _version_dir(model_type, version)
+    if not os.path.exists(os.path.join(path, MODEL_FILE)):
+        return None, None
+
+    estimator = joblib.load(os.path.join(path, MODEL_FILE), mmap_mode='r')
+    metadata = _read_metadata(path)
+    metadata['last_used'] = time.time()
+    _write_metadata(path, metadata)
+    _loaded.put((model_type, version), (estimator, metadata))
+    return estimator, metadata
+
+
+def latest_version(model_type):
+    """Versão registada mais recentemente para o tipo de modelo, ou None"""
+    for entry in list_models():
+        if entry['model_type'] == model_type:
+            return entry['version']
+    return None
+
+
+def list_models():
+    """Metadados de todas as versões registadas, da mais recente para a mais antiga"""
+    entries = []
+    root = _registry_dir()
+    if not os.path.isdir(root):
+        return entries
+    for model_type in os.listdir(root):
+        type_dir = os.path.join(root, model_type)
+        if not os.path.isdir(type_dir):
+            continue
+        for version in os.listdir(type_dir):
+            if version.startswith('.'):
+                continue
+            path = os.path.join(type_dir, version)
+            if os.path.exists(os.path.join(path, METADATA_FILE)):
+                entries.append(_read_metadata(path))
+    return sorted(entries, key=lambda entry: entry['created_at'], reverse=True)
+
+
+def evict(max_bytes=None):
+    """Remove as versões usadas há mais tempo até o registo caber no limite de tamanho"""
+    max_bytes = max_bytes or REGISTRY_CONFIG['max_bytes']
+    entries = sorted(list_models(), key=lambda entry: entry['last_used'])
+    total = sum(entry['size_bytes'] for entry in entries)
+    for entry in entries[:-1]:
+        if total <= max_bytes:
+            break
+        shutil.rmtree(_version_dir(entry['model_type'], entry['version']), ignore_errors=True)
+        total -= entry['size_bytes']
@@ -0,0 +1,153 @@
+# utils/models.py
+import multiprocessing
+import pickle
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+from config import HGB_CONFIG
+from utils.ann_index import IndexedKNeighborsClassifier, scaled_training_set
+from utils.cv_runner import fold_indices, run_cv
+
+MODEL_LABELS = {'decision_tree': 'Árvore de Decisão', 'knn': 'KNN',
+                'hist_gradient_boosting': 'Gradient Boosting',
+                'sgd': 'Regressão Logística (SGD)', 'naive_bayes': 'Naive Bayes'}
+
+# Grelhas de hiperparâmetros (os mesmos intervalos dos controlos da página de modelação)
+MODEL_GRIDS = {
+    'decision_tree': {
+        'max_depth': list(range(1, 21)),
+        'min_samples_split': list(range(2, 21)),
+    },
+    'knn': {
+        'n_neighbors': list(range(1, 21)),
+        'weights': ['uniform', 'distance'],
+    },
+}
+
+def build_model(model_type, params, seed):
+    """Cria o estimador não treinado para o tipo de modelo e hiperparâmetros dados"""
+    if model_type == 'decision_tree':
+        return DecisionTreeClassifier(random_state=seed, **params)
+    if model_type == 'knn':
+        return KNeighborsClassifier(**params)
+    if model_type == 'knn_ann':
+        return IndexedKNeighborsClassifier(random_state=seed, **params)
+    if model_type == 'hist_gradient_boosting':
+        return HistGradientBoostingClassifier(
+            random_state=seed, validation_fraction=HGB_CONFIG['validation_fraction'],
+            n_iter_no_change=HGB_CONFIG['n_iter_no_change'], **params)
+    if model_type == 'sgd':
+        return SGDClassifier(loss='log_loss', random_state=seed, **params)
+    if model_type == 'naive_bayes':
+        return GaussianNB(**params)
+    raise ValueError(f"Tipo de modelo desconhecido: {model_type!r}")
+
+
+def evaluate_model(model, X, y, split, folds=None, n_jobs=None):
+    """Treina o modelo e calcula as métricas de teste e de validação cruzada"""
+    X_train, X_test, y_train, y_test = split
+    model.fit(X_train, y_train)
+    pred = model.predict(X_test)
+    cv = run_cv(model, X, y, folds or fold_indices(X, y), n_jobs=n_jobs)
+    return {
+        'model': model,
+        'pred': pred,
+        'accuracy': accuracy_score(y_test, pred),
+        'f1': f1_score(y_test, pred),
+        'cv_scores': cv['scores'],
+        'cv_f1_scores': cv['f1_scores'],
+        'feature_importances': getattr(model, 'feature_importances_', None),
+    }
+
+
+def grid_params(model_type):
+    """Todas as combinações da grelha, agrupadas pelo valor do primeiro hiperparâmetro"""
+    (first, first_values), (second, second_values) = MODEL_GRIDS[model_type].items()
+    return [[{first: a, second: b} for b in second_values] for a in first_values]
+
+
+@contextmanager
+def traced_memory():
+    """Mede o pico de memória alocada dentro do bloco; à saída, o dicionário devolvido tem 'peak_mb'
+
+    O tracemalloc regista as alocações de todas as threads do processo: a medida só
+    é fiável num processo dedicado (a linha de comandos ou `run_isolated`).
+    """
+    memory = {}
+    tracemalloc.start()
+    try:
+        yield memory
+    finally:
+        memory['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+
+def run_isolated(func, *args):
+    """Executa func(*args) num processo novo e devolve o resultado
+
+    Usado para as medições de memória feitas a partir do servidor do Streamlit, onde
+    as outras sessões alocam memória nas suas threads ao mesmo tempo. O processo é
+    criado com 'spawn', como os do pool de segundo plano.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(func, *args).result()
+
+
+def profile_fit(model, X_train, y_train, X_test):
+    """Treina e prevê medindo os tempos, o pico de memória do treino e o tamanho do modelo serializado
+
+    O pico inclui os arrays NumPy alocados durante o treino (por exemplo, as
+    características discretizadas do gradient boosting), registados pelo tracemalloc.
+    """
+    with traced_memory() as memory:
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pred = model.predict(X_test)
+    return {
+        'pred': pred,
+        'fit_seconds': fit_seconds,
+        'predict_seconds': time.perf_counter() - start,
+        'peak_mb': memory['peak_mb'],
+        'model_mb': len(pickle.dumps(model)) / 2 ** 20,
+    }
+
+
+def _profile_models(models, X_fit, y_fit, X_test, seed):
+    return {model_type: profile_fit(build_model(model_type, params, seed), X_fit, y_fit, X_test)
+            for model_type, params in models.items()}
+
+
+def benchmark_models(models, split, n_rows=None, seed=42):
+    """Tempo e memória de treino e previsão de cada modelo {tipo: hiperparâmetros}
+
+    Com `n_rows`, o treino é reamostrado (com um pequeno ruído) até esse número de
+    linhas, para medir os modelos com volumes de dados maiores; a precisão é
+    sempre calculada no conjunto de teste original. Os modelos são treinados num
+    processo separado, para que o pico de memória seja só o do treino.
+    """
+    X_train, X_test, y_train, y_test = split
+    X_fit, y_fit = scaled_training_set(X_train, y_train, n_rows or 0, seed)
+    profiles = run_isolated(_profile_models, models, X_fit, y_fit, X_test.to_numpy(dtype=float), seed)
+    rows = []
+    for model_type, profile in profiles.items():
+        rows.append({
+            'Modelo': MODEL_LABELS[model_type],
+            'Linhas de Treino': len(X_fit),
+            'Treino (s)': profile['fit_seconds'],
+            'Previsão (ms)': profile['predict_seconds'] * 1000,
+            'Pico de Memória (MB)': profile['peak_mb'],
+            'Tamanho do Modelo (MB)': profile['model_mb'],
+            'Precisão': accuracy_score(y_test, profile['pred']),
+        })
+    return pd.DataFrame(rows)
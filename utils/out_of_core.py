@@ -0,0 +1,205 @@
+# utils/out_of_core.py
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from config import OUT_OF_CORE_CONFIG
+from utils.batch_scoring import read_chunks
+from utils.cache import make_key
+from utils.data_processor import MODEL_FEATURES, MODEL_INPUTS
+from utils.feature_pipeline import ModelFeatures
+from utils.models import build_model, traced_memory
+
+# Modelos com partial_fit disponíveis no treino incremental
+INCREMENTAL_MODELS = ['sgd', 'naive_bayes']
+CLASSES = np.array([0, 1])
+TARGET = 'Survived'
+
+
+def synthetic_chunks(X, y, n_rows, chunksize, seed=0):
+    """Fluxo de blocos sintéticos gerados à medida: reamostragem do treino com um pequeno ruído
+
+    Só um bloco existe em memória de cada vez, seja qual for o número de linhas.
+    """
+    X, y = pd.DataFrame(X), np.asarray(y)
+    values = X.to_numpy(dtype=float)
+    noise_scale = values.std(axis=0) * 0.01
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, chunksize):
+        size = min(chunksize, n_rows - start)
+        rows = rng.integers(0, len(values), size)
+        noisy = values[rows] + rng.standard_normal((size, values.shape[1])) * noise_scale
+        yield pd.DataFrame(noisy, columns=X.columns), y[rows]
+
+
+def frame_chunks(X, y, chunksize):
+    """Fluxo de blocos de um conjunto já em memória (para comparar com o treino completo)"""
+    for start in range(0, len(X), chunksize):
+        yield X.iloc[start:start + chunksize], np.asarray(y)[start:start + chunksize]
+
+
+def file_chunks(path, chunksize):
+    """Fluxo de blocos (características originais, alvo) lidos de um CSV ou Parquet"""
+    for chunk in read_chunks(path, chunksize):
+        yield chunk[MODEL_INPUTS], chunk[TARGET].to_numpy()
+
+
+class IncrementalTrainer:
+    """Treino com partial_fit sobre um fluxo de blocos, com avaliação incremental
+
+    A preparação das características é ajustada no primeiro bloco e a normalização
+    é actualizada com cada bloco. Uma linha em cada 1/holdout_fraction fica de fora
+    do treino e entra no holdout (limitado a `max_holdout_rows` linhas), avaliado
+    depois de cada bloco; antes de treinar com um bloco, o modelo é também avaliado
+    nele (validação progressiva). Nenhuma avaliação é feita enquanto o modelo não
+    tiver treinado com pelo menos uma linha (um bloco pode ir todo para o holdout).
+    A memória usada depende do tamanho dos blocos e
+    do holdout, não do tamanho do conjunto de treino.
+    """
+
+    def __init__(self, model_type, params=None, seed=42, holdout_fraction=None, max_holdout_rows=None):
+        self.model_type = model_type
+        self.features = ModelFeatures()
+        self.scaler = StandardScaler()
+        self.model = build_model(model_type, params or {}, seed)
+        self.holdout_every = round(1 / (holdout_fraction or OUT_OF_CORE_CONFIG['holdout_fraction']))
+        self.max_holdout_rows = max_holdout_rows or OUT_OF_CORE_CONFIG['max_holdout_rows']
+        self.rows_seen = 0
+        self.history = []
+        self._trained = False
+        self._holdout_X = []
+        self._holdout_y = []
+        self._holdout_rows = 0
+
+    @property
+    def fitted(self):
+        """Se o modelo já treinou com alguma linha (e pode portanto prever)"""
+        return self._trained
+
+    def partial_fit(self, X, y):
+        if self.rows_seen == 0:
+            self.features.fit(X)
+        X = self.features.transform(X).to_numpy(dtype=float)
+        y = np.asarray(y)
+
+        held_out = (self.rows_seen + np.arange(len(X))) % self.holdout_every == 0
+        room = self.max_holdout_rows - self._holdout_rows
+        if room > 0 and held_out.any():
+            self._holdout_X.append(X[held_out][:room])
+            self._holdout_y.append(y[held_out][:room])
+            self._holdout_rows += len(self._holdout_y[-1])
+        X_train, y_train = X[~held_out], y[~held_out]
+
+        entry = {'rows': self.rows_seen + len(X)}
+        if self.fitted and len(y_train):
+            pred = self.model.predict(self.scaler.transform(X_train))
+            entry['progressive_accuracy'] = accuracy_score(y_train, pred)
+            entry['progressive_f1'] = f1_score(y_train, pred, zero_division=0)
+
+        if len(y_train):
+            self.scaler.partial_fit(X_train)
+            self.model.partial_fit(self.scaler.transform(X_train), y_train, classes=CLASSES)
+            self._trained = True
+        self.rows_seen += len(X)
+
+        if self.fitted and self._holdout_rows:
+            X_holdout, y_holdout = np.concatenate(self._holdout_X), np.concatenate(self._holdout_y)
+            self._holdout_X, self._holdout_y = [X_holdout], [y_holdout]
+            pred = self.model.predict(self.scaler.transform(X_holdout))
+            entry['holdout_accuracy'] = accuracy_score(y_holdout, pred)
+            entry['holdout_f1'] = f1_score(y_holdout, pred, zero_division=0)
+        self.history.append(entry)
+        return self
+
+    def pipeline(self):
+        """Pipeline ajustado (preparação → normalização → modelo), no formato do registo"""
+        return Pipeline([('features', self.features), ('scale', self.scaler), ('model', self.model)])
+
+
+def train_out_of_core(chunks, model_type, params=None, seed=42, total_chunks=None, report=None):
+    """Consome o fluxo de blocos (X, y) com partial_fit e devolve (treinador, estatísticas)
+
+    As estatísticas incluem o pico de memória durante o treino, o tempo e as linhas
+    por segundo. `report(blocos, total_chunks, treinador)` é chamado depois de cada bloco.
+    """
+    trainer = IncrementalTrainer(model_type, params, seed)
+    start = time.perf_counter()
+    with traced_memory() as memory:
+        for i, (X, y) in enumerate(chunks, start=1):
+            trainer.partial_fit(X, y)
+            if report:
+                report(i, total_chunks, trainer)
+    seconds = time.perf_counter() - start
+    return trainer, {'peak_mb': memory['peak_mb'], 'seconds': seconds,
+                     'rows_per_second': trainer.rows_seen / max(seconds, 1e-9)}
+
+
+def incremental_result(trainer, stats, X_test, y_test):
+    """Resultado no formato da página de modelação
+
+    Os 'cv_scores' são as precisões de validação progressiva de cada bloco (o
+    modelo avaliado num bloco antes de treinar com ele).
+    """
+    if not trainer.fitted:
+        raise ValueError("O fluxo não tem linhas de treino: todas ficaram no holdout")
+    pred = trainer.pipeline().predict(X_test)
+    progressive = [entry for entry in trainer.history if 'progressive_accuracy' in entry]
+    return {
+        'pred': pred,
+        'accuracy': accuracy_score(y_test, pred),
+        'f1': f1_score(y_test, pred),
+        'cv_scores': np.array([entry['progressive_accuracy'] for entry in progressive]),
+        'cv_f1_scores': np.array([entry['progressive_f1'] for entry in progressive]),
+        'history': pd.DataFrame(trainer.history),
+        **stats,
+    }
+
+
+def train_stream(X_train, y_train, X_test, y_test, model_type, n_rows=None, chunksize=None, seed=42):
+    """Treino incremental com os blocos do treino (ou de um fluxo sintético de n_rows linhas)
+
+    Devolve o resultado de `incremental_result`. Corre do princípio ao fim num só
+    processo, para poder ser executado com `run_isolated` e o pico de memória ser
+    só o do treino.
+    """
+    chunksize = chunksize or OUT_OF_CORE_CONFIG['chunksize']
+    chunks = (synthetic_chunks(X_train, y_train, n_rows, chunksize, seed) if n_rows
+              else frame_chunks(X_train, y_train, chunksize))
+    trainer, stats = train_out_of_core(chunks, model_type, seed=seed)
+    return incremental_result(trainer, stats, X_test, y_test)
+
+
+def _main(argv=None):
+    from utils.model_registry import save_model
+
+    parser = argparse.ArgumentParser(description="Treino incremental (partial_fit) a partir de um ficheiro em blocos")
+    parser.add_argument('input', help="dados de treino (.csv ou .parquet) com a coluna 'Survived'")
+    parser.add_argument('--model', default='sgd', choices=INCREMENTAL_MODELS)
+    parser.add_argument('--chunksize', type=int, default=OUT_OF_CORE_CONFIG['chunksize'], help="linhas por bloco")
+    args = parser.parse_args(argv)
+
+    def report(i, _, trainer):
+        last = trainer.history[-1]
+        holdout = f"  holdout {last['holdout_accuracy']:.3f}" if 'holdout_accuracy' in last else ""
+        print(f"bloco {i:>5}  {trainer.rows_seen:>12,} linhas{holdout}", file=sys.stderr)
+
+    trainer, stats = train_out_of_core(file_chunks(args.input, args.chunksize), args.model, report=report)
+    if not trainer.fitted:
+        sys.exit("O ficheiro de treino não tem linhas suficientes para treinar o modelo")
+
+    last = trainer.history[-1]
+    data_key = make_key(os.path.abspath(args.input), os.path.getsize(args.input), os.path.getmtime(args.input))
+    metrics = {name: float(last[name]) for name in ('holdout_accuracy', 'holdout_f1') if name in last}
+    version = save_model(args.model, trainer.pipeline(), {}, MODEL_FEATURES, data_key, metrics)
+    print(f"{trainer.rows_seen:,} linhas em {stats['seconds']:.1f} s ({stats['rows_per_second']:,.0f} linhas/s), "
+          f"pico de memória {stats['peak_mb']:.1f} MB -> registo {args.model}/{version}")
+
+
+if __name__ == "__main__":
+    # python -m utils.out_of_core treino.csv [--model naive_bayes] [--chunksize 100000]
+    _main()
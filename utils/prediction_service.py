@@ -0,0 +1,306 @@
+# utils/prediction_service.py
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+from utils.batch_scoring import score_chunk
+from utils.compiled_tree import compile_estimator
+from utils.data_processor import EMBARKED_PORTS
+from utils.model_registry import latest_version, load_model
+
+# Latências guardadas para os percentis de /metrics
+LATENCY_WINDOW = 10_000
+
+# Campos obrigatórios de cada passageiro ('Age' e 'Fare' em falta são preenchidos com os valores do treino)
+REQUIRED_FIELDS = ['Pclass', 'Sex', 'SibSp', 'Parch', 'Embarked']
+OPTIONAL_FIELDS = ['Age', 'Fare']
+# Tamanho máximo de um passageiro em JSON; o corpo de um pedido pode ter até max_batch passageiros
+MAX_RECORD_BYTES = 1024
+PCLASSES = (1, 2, 3)
+SEXES = ('male', 'female')
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class MicroBatcher:
+    """Junta pedidos concorrentes de um passageiro em lotes para um único predict_proba
+
+    O primeiro pedido abre um lote que fecha ao fim de `max_wait_ms` ou quando tem
+    `max_batch` pedidos; o lote é pontuado numa thread para não bloquear o loop.
+    """
+
+    def __init__(self, estimator, metadata, max_batch=64, max_wait_ms=5):
+        self.estimator = estimator
+        self.metadata = metadata
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def predict(self, record):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            records, futures = zip(*batch)
+            self.batch_sizes.append(len(batch))
+            try:
+                scored = await loop.run_in_executor(None, self._score, list(records))
+            except Exception:
+                # Um registo inválido não deve fazer falhar os pedidos que partilham o lote:
+                # cada registo é pontuado sozinho e só o que falha recebe o erro
+                await self._score_one_by_one(loop, records, futures)
+                continue
+            for future, row in zip(futures, scored):
+                if not future.done():
+                    future.set_result(row)
+
+    async def _score_one_by_one(self, loop, records, futures):
+        for record, future in zip(records, futures):
+            try:
+                row, = await loop.run_in_executor(None, self._score, [record])
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if not future.done():
+                    future.set_result(row)
+
+    def _score(self, records):
+        chunk = pd.DataFrame.from_records(records)
+        for field in OPTIONAL_FIELDS:
+            if field not in chunk.columns:
+                chunk[field] = np.nan
+        result = score_chunk(chunk, self.estimator)
+        return [
+            {'survived': int(row.Survived_pred),
+             'probability': float(getattr(row, 'Survived_proba', row.Survived_pred))}
+            for row in result.itertuples()
+        ]
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _is_count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def validate_record(record):
+    """Mensagem de erro para um passageiro inválido, ou None se puder ser pontuado"""
+    missing = [field for field in REQUIRED_FIELDS if field not in record]
+    if missing:
+        return f"campos em falta: {', '.join(missing)}"
+    if record['Pclass'] not in PCLASSES or isinstance(record['Pclass'], bool):
+        return f"'Pclass' deve ser um de {list(PCLASSES)}"
+    if record['Sex'] not in SEXES:
+        return f"'Sex' deve ser um de {list(SEXES)}"
+    if record['Embarked'] not in EMBARKED_PORTS:
+        return f"'Embarked' deve ser um de {EMBARKED_PORTS}"
+    for field in ('SibSp', 'Parch'):
+        if not _is_count(record[field]):
+            return f"'{field}' deve ser um inteiro não negativo"
+    for field in OPTIONAL_FIELDS:
+        value = record.get(field)
+        if value is not None and not (_is_number(value) and value >= 0):
+            return f"'{field}' deve ser um número não negativo ou null"
+    return None
+
+
+class PredictionService:
+    """Serviço HTTP local: POST /predict, GET /metrics e GET /health"""
+
+    def __init__(self, model_types, max_batch=64, max_wait_ms=5, max_body_bytes=None):
+        self.max_body_bytes = max_body_bytes or max_batch * MAX_RECORD_BYTES
+        self.batchers = {}
+        self.versions = {}
+        for model_type in model_types:
+            version = latest_version(model_type)
+            estimator, metadata = load_model(model_type, version) if version else (None, None)
+            if estimator is None:
+                raise RuntimeError(f"Não existe no registo nenhum modelo '{model_type}'")
+            self.batchers[model_type] = MicroBatcher(compile_estimator(estimator), metadata,
+                                                     max_batch, max_wait_ms)
+            self.versions[model_type] = version
+        self.default_model = model_types[0]
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+
+    async def predict(self, payload, model_type):
+        """Aceita um passageiro (objecto JSON) ou uma lista de passageiros"""
+        batcher = self.batchers[model_type]
+        records = payload if isinstance(payload, list) else [payload]
+        results = await asyncio.gather(*(batcher.predict(record) for record in records))
+        return results if isinstance(payload, list) else results[0]
+
+    def metrics(self):
+        latencies = np.array(self.latencies) * 1000
+        percentiles = ({f'p{p}': float(np.percentile(latencies, p)) for p in (50, 90, 99)}
+                       if len(latencies) else {})
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_ms': percentiles,
+            'models': {
+                model_type: {
+                    'version': self.versions[model_type],
+                    'batches': len(batcher.batch_sizes),
+                    'mean_batch_size': float(np.mean(batcher.batch_sizes)) if batcher.batch_sizes else 0.0,
+                }
+                for model_type, batcher in self.batchers.items()
+            },
+        }
+
+    async def route(self, method, path, body):
+        route, _, query = path.partition('?')
+        params = dict(part.split('=', 1) for part in query.split('&') if '=' in part)
+        if route == '/health':
+            return 200, {'status': 'ok', 'models': self.versions}
+        if route == '/metrics':
+            return 200, self.metrics()
+        if route != '/predict':
+            return 404, {'error': 'not found'}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}
+
+        model_type = params.get('model', self.default_model)
+        if model_type not in self.batchers:
+            return 400, {'error': f"modelo desconhecido: {model_type}"}
+        try:
+            payload = json.loads(body or b'null')
+        except json.JSONDecodeError as error:
+            return 400, {'error': f"JSON inválido: {error}"}
+        records = payload if isinstance(payload, list) else [payload]
+        if not payload or not all(isinstance(record, dict) for record in records):
+            return 400, {'error': 'esperado um passageiro ou uma lista de passageiros'}
+        # Validados antes de entrar na fila, para não chegarem aos lotes de outros clientes
+        errors = {i: error for i, error in enumerate(map(validate_record, records)) if error}
+        if errors:
+            if not isinstance(payload, list):
+                return 400, {'error': errors[0]}
+            return 400, {'error': 'passageiros inválidos',
+                         'details': {str(i): error for i, error in errors.items()}}
+        return 200, await self.predict(payload, model_type)
+
+    async def handle(self, reader, writer):
+        """Atende os pedidos de uma ligação (HTTP/1.1 com keep-alive)"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                start = time.perf_counter()
+                self.requests += 1
+                try:
+                    method, path, headers = _parse_head(head)
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Sem um pedido válido não é possível saber onde começa o seguinte
+                    self.errors += 1
+                    await _respond(writer, 400, {'error': 'pedido HTTP mal formado'}, keep_alive=False)
+                    break
+                if length > self.max_body_bytes:
+                    # O corpo não é lido: a ligação é fechada depois da resposta
+                    self.errors += 1
+                    await _respond(writer, 413, {'error': f"corpo do pedido acima de {self.max_body_bytes} bytes"},
+                                   keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                try:
+                    status, response = await self.route(method, path, body)
+                except Exception as error:
+                    status, response = 500, {'error': str(error)}
+                if status >= 400:
+                    self.errors += 1
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await _respond(writer, status, response, keep_alive)
+                if path.startswith('/predict'):
+                    self.latencies.append(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        for batcher in self.batchers.values():
+            batcher.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serviço de previsão em http://{host}:{port} (modelos: {', '.join(self.versions)})")
+        async with server:
+            await server.serve_forever()
+
+
+def _parse_head(head):
+    """(método, caminho, cabeçalhos) do pedido; ValueError se a linha de pedido for inválida"""
+    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+    method, path, _ = request_line.split(' ', 2)
+    headers = {name.strip().lower(): value.strip()
+               for name, _, value in (line.partition(':') for line in header_lines if line)}
+    return method, path, headers
+
+
+async def _respond(writer, status, response, keep_alive):
+    payload = json.dumps(response, ensure_ascii=False).encode('utf-8')
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+        + payload)
+    await writer.drain()
+
+
+def _main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de previsão de sobrevivência")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--models', nargs='+', default=['decision_tree'],
+                        choices=['decision_tree', 'knn', 'sgd', 'naive_bayes'],
+                        help="modelos do registo a manter em memória (o primeiro é o de omissão)")
+    parser.add_argument('--max-batch', type=int, default=64, help="pedidos por lote")
+    parser.add_argument('--max-wait-ms', type=float, default=5, help="espera máxima para formar um lote")
+    parser.add_argument('--max-body-bytes', type=int, default=None,
+                        help=f"tamanho máximo do corpo (por omissão, max-batch × {MAX_RECORD_BYTES} bytes)")
+    args = parser.parse_args(argv)
+
+    service = PredictionService(args.models, args.max_batch, args.max_wait_ms, args.max_body_bytes)
+    asyncio.run(service.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    # python -m utils.prediction_service [--models decision_tree knn] [--port 8765]
+    # curl -X POST localhost:8765/predict -d '{"Pclass": 1, "Sex": "female", "Age": 29, ...}'
+    _main()
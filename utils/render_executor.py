@@ -0,0 +1,82 @@
+# utils/render_executor.py
+import threading
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from config import RENDER_CONFIG
+from utils.chart_cache import chart_key, get_cached_chart, store_chart
+from utils.visualization import current_render_quality, figure_to_bytes, show_image
+
+# Especificação de um gráfico: o builder (função pura, ao nível do módulo, que usa
+# new_offscreen_figure e só a API orientada a objectos) e os seus argumentos
+FigureSpec = namedtuple('FigureSpec', ['chart_id', 'builder', 'args', 'kwargs', 'fmt', 'dpi'])
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def figure_spec(chart_id, builder, *args, fmt=None, dpi=None, **kwargs):
+    """Cria a especificação de um gráfico a renderizar pelo executor
+
+    Por omissão usa a qualidade de renderização activa, que tem de ser resolvida
+    aqui, na thread do script, e não nas threads do pool.
+    """
+    if fmt is None:
+        quality = current_render_quality()
+        fmt, dpi = quality['format'], quality['dpi']
+    return FigureSpec(chart_id, builder, args, kwargs, fmt, dpi)
+
+
+def _get_executor(mode):
+    """Pool partilhado pelo processo (threads por omissão, processos se configurado)"""
+    with _executors_lock:
+        if mode not in _executors:
+            pool_class = ProcessPoolExecutor if mode == 'process' else ThreadPoolExecutor
+            _executors[mode] = pool_class(max_workers=RENDER_CONFIG['max_workers'])
+        return _executors[mode]
+
+
+def _render(builder, args, kwargs, fmt, dpi):
+    """Constrói e rasteriza a figura no backend Agg (corre numa thread ou processo do pool)"""
+    return figure_to_bytes(builder(*args, **kwargs), fmt=fmt, dpi=dpi)
+
+
+def _store_when_done(key, fmt):
+    """Callback que guarda o resultado na cache quando a renderização termina sem erros"""
+    def callback(future):
+        if future.exception() is None:
+            store_chart(key, future.result(), fmt)
+
+    return callback
+
+
+def render_async(specs, mode=None):
+    """Submete os gráficos ao pool e devolve um Future por especificação, pela mesma ordem
+
+    Os gráficos que já estão em cache são devolvidos como Futures concluídos; os
+    restantes são rasterizados em paralelo e guardados na cache ao terminar.
+    """
+    mode = mode or RENDER_CONFIG['mode']
+    futures = []
+    for spec in specs:
+        key = chart_key(spec.chart_id, spec.args, spec.kwargs, spec.fmt, spec.dpi)
+        payload = get_cached_chart(key, spec.fmt)
+        if payload is not None:
+            future = Future()
+            future.set_result(payload)
+        else:
+            future = _get_executor(mode).submit(_render, spec.builder, spec.args, spec.kwargs,
+                                                spec.fmt, spec.dpi)
+            future.add_done_callback(_store_when_done(key, spec.fmt))
+        future.chart_format = spec.fmt
+        futures.append(future)
+    return futures
+
+
+def show_rendered(future):
+    """Espera pelo gráfico (no script) e apresenta-o na posição actual da página"""
+    show_image(future.result(), fmt=future.chart_format)
+
+
+def render_parallel(specs, mode=None):
+    """Renderiza os gráficos em paralelo e devolve os bytes pela ordem das especificações"""
+    return [future.result() for future in render_async(specs, mode=mode)]
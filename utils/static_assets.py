@@ -0,0 +1,202 @@
+# utils/static_assets.py
+import argparse
+import functools
+import importlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+import streamlit as st
+from config import RENDER_QUALITIES, STATIC_ASSETS_CONFIG
+from utils.cache import LRUCache, make_key
+from utils.chart_cache import cached_chart, theme_fingerprint
+from utils.diagnostics import set_metric
+from utils.visualization import current_render_quality, figure_to_bytes, show_image
+
+# Conteúdo que não depende dos dados: gráficos, tabelas e texto fixos das páginas
+StaticAsset = namedtuple('StaticAsset', ['name', 'kind', 'builder'])
+
+ASSET_KINDS = ('figure', 'table', 'markdown')
+MANIFEST_NAME = 'manifest.json'
+
+_registry = {}
+_payloads = LRUCache(max_items=64)
+
+
+def static_asset(name, kind):
+    """Regista o builder de um recurso estático (gráfico, tabela ou markdown)
+
+    O builder não recebe argumentos e devolve uma figura, um DataFrame ou texto.
+    """
+    if kind not in ASSET_KINDS:
+        raise ValueError(f"Tipo de recurso desconhecido: {kind!r}")
+
+    def decorator(builder):
+        _registry[name] = StaticAsset(name, kind, builder)
+        return builder
+
+    return decorator
+
+
+def _variant(quality):
+    return f"{quality['format']}-{quality['dpi']}"
+
+
+@functools.lru_cache(maxsize=None)
+def asset_version(asset):
+    """Versão do recurso: código do builder e, nos gráficos, o tema e as qualidades"""
+    parts = [asset.kind, inspect.getsource(asset.builder)]
+    if asset.kind == 'figure':
+        parts += [theme_fingerprint(), RENDER_QUALITIES]
+    return make_key(*parts)
+
+
+def _render_asset(asset):
+    """Gera os ficheiros de um recurso: {variante: (extensão, bytes)}"""
+    if asset.kind == 'figure':
+        files = {}
+        for quality in RENDER_QUALITIES.values():
+            fig = asset.builder()
+            payload = figure_to_bytes(fig, fmt=quality['format'], dpi=quality['dpi'])
+            files[_variant(quality)] = (quality['format'], payload)
+        return files
+    if asset.kind == 'table':
+        html = asset.builder().to_html(index=False, border=0)
+        return {'html': ('html', html.encode('utf-8'))}
+    return {'md': ('md', asset.builder().encode('utf-8'))}
+
+
+def _load_modules():
+    for module_name in STATIC_ASSETS_CONFIG['modules']:
+        importlib.import_module(module_name)
+
+
+def build_bundle(out_dir=None):
+    """Renderiza todos os recursos registados para um bundle versionado e devolve o manifesto
+
+    Os ficheiros são escritos numa pasta nova e o manifesto é substituído de forma
+    atómica no fim, pelo que uma aplicação em execução nunca vê um bundle incompleto.
+    """
+    out_dir = out_dir or STATIC_ASSETS_CONFIG['dir']
+    _load_modules()
+
+    assets = {name: _registry[name] for name in sorted(_registry)}
+    versions = {name: asset_version(asset) for name, asset in assets.items()}
+    bundle_version = make_key(versions)[:12]
+    bundle_dir = os.path.join(out_dir, bundle_version)
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    manifest = {'version': bundle_version, 'assets': {}}
+    for name, asset in assets.items():
+        files = {}
+        for variant, (extension, payload) in _render_asset(asset).items():
+            file_name = f"{name}.{variant}.{extension}"
+            with open(os.path.join(bundle_dir, file_name), 'wb') as f:
+                f.write(payload)
+            files[variant] = file_name
+        manifest['assets'][name] = {'kind': asset.kind, 'version': versions[name], 'files': files}
+
+    previous = _read_manifest(out_dir)
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+
+    # Mantém o bundle anterior para sessões que ainda o estejam a servir
+    keep = {bundle_version, previous['version'] if previous else None}
+    for entry in os.listdir(out_dir):
+        path = os.path.join(out_dir, entry)
+        if os.path.isdir(path) and entry not in keep:
+            shutil.rmtree(path)
+
+    return manifest
+
+
+def _read_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _manifest():
+    """Manifesto do bundle activo, relido apenas quando o ficheiro muda"""
+    path = os.path.join(STATIC_ASSETS_CONFIG['dir'], MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        set_metric("Recursos estáticos", "sem bundle (renderização em directo)")
+        return None
+
+    manifest = _payloads.get(('manifest', mtime))
+    if manifest is None:
+        manifest = _read_manifest(STATIC_ASSETS_CONFIG['dir'])
+        _payloads.put(('manifest', mtime), manifest)
+        set_metric("Recursos estáticos", f"bundle {manifest['version']}")
+    return manifest
+
+
+def _bundled_payload(asset, variant):
+    """Bytes do recurso no bundle, ou None se não existir ou estiver desactualizado"""
+    manifest = _manifest()
+    entry = manifest and manifest['assets'].get(asset.name)
+    if not entry or variant not in entry['files'] or entry['version'] != asset_version(asset):
+        return None
+
+    path = os.path.join(STATIC_ASSETS_CONFIG['dir'], manifest['version'], entry['files'][variant])
+    payload = _payloads.get(path)
+    if payload is None and os.path.exists(path):
+        with open(path, 'rb') as f:
+            payload = f.read()
+        _payloads.put(path, payload)
+    return payload
+
+
+def show_static_asset(name):
+    """Apresenta um recurso estático a partir do bundle, renderizando-o se não existir"""
+    asset = _registry[name]
+
+    if asset.kind == 'figure':
+        quality = current_render_quality()
+        payload = _bundled_payload(asset, _variant(quality))
+        if payload is None:
+            cached_chart(name, asset.builder)
+        else:
+            show_image(payload, fmt=quality['format'])
+        return
+
+    variant = 'html' if asset.kind == 'table' else 'md'
+    payload = _bundled_payload(asset, variant)
+    if payload is None:
+        key = ('live', name, asset_version(asset))
+        payload = _payloads.get(key)
+        if payload is None:
+            payload = _render_asset(asset)[variant][1]
+            _payloads.put(key, payload)
+    st.markdown(payload.decode('utf-8'), unsafe_allow_html=asset.kind == 'table')
+
+
+def _main(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle de recursos estáticos das páginas")
+    parser.add_argument('command', choices=['build', 'list'])
+    parser.add_argument('--out', default=None, help="pasta do bundle (por omissão a de config.py)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        _load_modules()
+        for name, asset in sorted(_registry.items()):
+            print(f"{asset.kind:<9} {name}")
+        return
+
+    manifest = build_bundle(args.out)
+    print(f"Bundle {manifest['version']}: {len(manifest['assets'])} recursos em "
+          f"{args.out or STATIC_ASSETS_CONFIG['dir']}")
+
+
+if __name__ == "__main__":
+    # python -m utils.static_assets build [--out PASTA] | list
+    # As páginas registam os recursos em utils.static_assets e não em __main__
+    importlib.import_module('utils.static_assets')._main()
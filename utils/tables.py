@@ -0,0 +1,79 @@
+# utils/tables.py
+import math
+import numpy as np
+import pandas as pd
+import streamlit as st
+from matplotlib import colormaps
+from utils.cache import dataframe_fingerprint
+
+# Limiar de luminância usado pelo pandas Styler para escolher texto claro ou escuro
+TEXT_COLOR_THRESHOLD = 0.408
+
+
+def _relative_luminance(rgb):
+    """Luminância relativa (WCAG) de um array de cores RGB em [0, 1]"""
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _gradient_css(fingerprint, gradients, _data):
+    """Calcula o CSS dos gradientes de forma vectorizada, uma vez por versão dos dados"""
+    css = {}
+    for column, cmap in gradients:
+        values = pd.to_numeric(_data[column], errors='coerce').to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        styles = np.full(len(values), '', dtype=object)
+        if not valid.any():
+            css[column] = styles
+            continue
+
+        vmin, vmax = values[valid].min(), values[valid].max()
+        norm = (values[valid] - vmin) / (vmax - vmin) if vmax > vmin else np.zeros(valid.sum())
+        rgb = colormaps[cmap](norm)[:, :3]
+
+        channels = np.rint(rgb * 255).astype(int)
+        dark = _relative_luminance(rgb) < TEXT_COLOR_THRESHOLD
+        styles[valid] = [
+            f"background-color: #{r:02x}{g:02x}{b:02x}; color: {'#f1f1f1' if is_dark else '#000000'}"
+            for (r, g, b), is_dark in zip(channels, dark)
+        ]
+        css[column] = styles
+    return css
+
+
+def paginated_table(data, key, gradients=None, formats=None, page_size=25,
+                    hide_index=False, use_container_width=True):
+    """Apresenta uma tabela paginada com gradientes de cor pré-calculados
+
+    Os gradientes são calculados de forma vectorizada para a tabela inteira (e ficam
+    em cache), mas só a página visível passa pelo Styler e é enviada ao browser.
+    """
+    gradients = tuple((gradients or {}).items())
+    n_pages = max(1, math.ceil(len(data) / page_size))
+
+    page = 1
+    if n_pages > 1:
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            page = st.number_input("Página", min_value=1, max_value=n_pages, value=1,
+                                   step=1, key=f"{key}_page")
+        with col2:
+            start = (page - 1) * page_size
+            st.caption(f"Linhas {start + 1}–{min(start + page_size, len(data))} de {len(data)}")
+
+    start = (page - 1) * page_size
+    page_data = data.iloc[start:start + page_size]
+    styler = page_data.style
+
+    if gradients:
+        css = _gradient_css(dataframe_fingerprint(data), gradients, data)
+        columns = [column for column, _ in gradients]
+        page_css = pd.DataFrame({column: css[column][start:start + page_size] for column in columns},
+                                index=page_data.index)
+        styler = styler.apply(lambda _: page_css, axis=None, subset=columns)
+
+    if formats:
+        styler = styler.format(formats)
+
+    st.dataframe(styler, use_container_width=use_container_width, hide_index=hide_index)
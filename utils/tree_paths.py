@@ -0,0 +1,102 @@
+# utils/tree_paths.py
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.tree import DecisionTreeClassifier
+from utils.cv_runner import map_folds
+
+
+def _node_depths(tree):
+    """Profundidade de cada nó da árvore (a raiz tem profundidade 0)"""
+    depths = np.zeros(tree.node_count, dtype=int)
+    for node in range(tree.node_count):
+        for child in (tree.children_left[node], tree.children_right[node]):
+            if child != -1:
+                depths[child] = depths[node] + 1
+    return depths
+
+
+def _depth_predictions(model, X, max_depth):
+    """Previsões da árvore truncada em cada profundidade 1..max_depth: (max_depth, amostras)
+
+    Todas as amostras descem a árvore em simultâneo, um nível por passo; a previsão
+    a cada profundidade é a classe maioritária do nó onde a amostra se encontra.
+    """
+    tree = model.tree_
+    X = np.asarray(X, dtype=np.float32)
+    rows = np.arange(len(X))
+    nodes = np.zeros(len(X), dtype=int)
+    node_classes = model.classes_[tree.value[:, 0, :].argmax(axis=1)]
+
+    predictions = np.empty((max_depth, len(X)), dtype=model.classes_.dtype)
+    for depth in range(max_depth):
+        internal = tree.children_left[nodes] != -1
+        go_left = X[rows, tree.feature[nodes]] <= tree.threshold[nodes]
+        nodes = np.where(internal,
+                         np.where(go_left, tree.children_left[nodes], tree.children_right[nodes]),
+                         nodes)
+        predictions[depth] = node_classes[nodes]
+    return predictions
+
+
+def _depth_importances(model, max_depth):
+    """Importância das características da árvore truncada em cada profundidade: (max_depth, características)"""
+    tree = model.tree_
+    depths = _node_depths(tree)
+    internal = np.flatnonzero(tree.children_left != -1)
+    left, right = tree.children_left[internal], tree.children_right[internal]
+    weighted = tree.weighted_n_node_samples * tree.impurity
+    decrease = weighted[internal] - weighted[left] - weighted[right]
+
+    importances = np.zeros((max_depth, model.n_features_in_))
+    for depth in range(1, max_depth + 1):
+        split = depths[internal] < depth
+        np.add.at(importances[depth - 1], tree.feature[internal][split], decrease[split])
+        total = importances[depth - 1].sum()
+        if total > 0:
+            importances[depth - 1] /= total
+    return importances
+
+
+def _fit_deepest(X, y, min_samples_split, max_depth, seed):
+    return DecisionTreeClassifier(random_state=seed, max_depth=max_depth,
+                                  min_samples_split=min_samples_split).fit(X, y)
+
+
+def tree_depth_sweep(X, y, split, folds, min_samples_split, max_depth=20, seed=42, n_jobs=None):
+    """Avalia a árvore de decisão para todas as profundidades 1..max_depth
+
+    Por cada partição (a divisão treino/teste e as partições de validação cruzada
+    `folds`, de cv_runner.fold_indices) ajusta uma única árvore com a profundidade
+    máxima e obtém as previsões de cada profundidade percorrendo os caminhos
+    guardados. O resultado
+    coincide com o de ajustar uma árvore por profundidade, salvo empates entre
+    divisões igualmente boas. Devolve {max_depth: resultado} com 'pred', 'accuracy',
+    'f1', 'cv_scores', 'cv_f1_scores' e 'feature_importances'.
+    """
+    X_train, X_test, y_train, y_test = split
+    model = _fit_deepest(X_train, y_train, min_samples_split, max_depth, seed)
+    test_preds = _depth_predictions(model, X_test, max_depth)
+    importances = _depth_importances(model, max_depth)
+
+    X_all, y_all = np.asarray(X), np.asarray(y)
+
+    def score_fold(train_idx, val_idx):
+        fold_model = _fit_deepest(X_all[train_idx], y_all[train_idx], min_samples_split, max_depth, seed)
+        fold_preds = _depth_predictions(fold_model, X_all[val_idx], max_depth)
+        return [(accuracy_score(y_all[val_idx], pred), f1_score(y_all[val_idx], pred))
+                for pred in fold_preds]
+
+    # (profundidade, partição, métrica)
+    fold_scores = np.array(map_folds(score_fold, folds, n_jobs=n_jobs)).transpose(1, 0, 2)
+
+    return {
+        depth: {
+            'pred': test_preds[depth - 1],
+            'accuracy': accuracy_score(y_test, test_preds[depth - 1]),
+            'f1': f1_score(y_test, test_preds[depth - 1]),
+            'cv_scores': fold_scores[depth - 1, :, 0],
+            'cv_f1_scores': fold_scores[depth - 1, :, 1],
+            'feature_importances': importances[depth - 1],
+        }
+        for depth in range(1, max_depth + 1)
+    }
@@ -1,5 +1,14 @@
+import io
+import json
+import threading
+from contextlib import contextmanager
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+import streamlit as st
+from config import DEFAULT_RENDER_QUALITY, PLOT_CONFIG, RENDER_QUALITIES
 
 # Configurações globais de visualização
 plt.style.use('seaborn-v0_8')
@@ -17,6 +26,34 @@ COLORS = {
     'text': '#262730',
 }
 
+# Opções de exportação comuns (o dpi vem da qualidade de renderização activa)
+SAVEFIG_OPTIONS = {'bbox_inches': 'tight'}
+
+# Contadores do ciclo de vida das figuras (partilhados entre sessões do processo)
+_figure_stats = {'created': 0, 'closed': 0}
+_figure_stats_lock = threading.Lock()
+
+# Figuras abertas por cada thread de execução (cada sessão corre o script na sua thread)
+_thread_figures = threading.local()
+
+
+def _open_figures():
+    if not hasattr(_thread_figures, 'figures'):
+        _thread_figures.figures = set()
+    return _thread_figures.figures
+
+
+def _payload_stats():
+    if not hasattr(_thread_figures, 'payload'):
+        _thread_figures.payload = {'images': 0, 'bytes': 0}
+    return _thread_figures.payload
+
+
+def _record_payload(n_bytes):
+    stats = _payload_stats()
+    stats['images'] += 1
+    stats['bytes'] += n_bytes
+
 
 def get_color_palette(n_colors):
     """Retorna uma paleta de cores consistente
@@ -33,6 +70,217 @@ def set_plot_style(ax, title, xlabel, ylabel):
     ax.grid(True, linestyle='--', alpha=0.7)
 
 
+def new_figure(*args, **kwargs):
+    """Cria uma figura (como plt.subplots) contabilizada pelo gestor de figuras
+    """
+    fig, axes = plt.subplots(*args, **kwargs)
+    _open_figures().add(fig)
+    with _figure_stats_lock:
+        _figure_stats['created'] += 1
+    return fig, axes
+
+
+def new_offscreen_figure(nrows=1, ncols=1, **kwargs):
+    """Cria uma figura fora do pyplot, ligada ao backend Agg
+
+    Estas figuras não entram no gestor de figuras do pyplot e podem ser
+    construídas e rasterizadas noutras threads ou processos. Quem as usa deve
+    recorrer apenas à API orientada a objectos (ax.*, fig.*), nunca a plt.*.
+    """
+    subplot_kw = {key: kwargs.pop(key) for key in ('sharex', 'sharey', 'squeeze') if key in kwargs}
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(nrows, ncols, **subplot_kw)
+    return fig, axes
+
+
+def is_offscreen_figure(fig):
+    """Indica se a figura foi criada fora do gestor de figuras do pyplot
+    """
+    return fig.canvas.manager is None
+
+
+def close_figure(fig):
+    """Fecha a figura e remove-a do gestor de figuras do pyplot
+    """
+    _open_figures().discard(fig)
+    plt.close(fig)
+    with _figure_stats_lock:
+        _figure_stats['closed'] += 1
+
+
+def current_render_quality():
+    """Qualidade de renderização escolhida na barra lateral (formato e dpi)
+    """
+    return RENDER_QUALITIES[st.session_state.get('render_quality', DEFAULT_RENDER_QUALITY)]
+
+
+def figure_to_bytes(fig, fmt='png', dpi=None, **savefig_kwargs):
+    """Rasteriza (ou vectoriza, em SVG) a figura e fecha-a
+    """
+    options = {**SAVEFIG_OPTIONS, 'dpi': dpi or RENDER_QUALITIES['Alta resolução']['dpi'], **savefig_kwargs}
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, **options)
+    finally:
+        # As figuras fora do pyplot são libertadas pelo garbage collector
+        if not is_offscreen_figure(fig):
+            close_figure(fig)
+    return buffer.getvalue()
+
+
+def show_image(payload, fmt='png'):
+    """Apresenta bytes PNG ou SVG com a largura da coluna e contabiliza o tamanho enviado
+    """
+    _record_payload(len(payload))
+    if fmt == 'svg':
+        st.image(payload.decode('utf-8'), use_column_width=True)
+    else:
+        st.image(payload, use_column_width=True)
+
+
+def pop_payload_stats():
+    """Devolve (e reinicia) o número de imagens e bytes enviados nesta execução
+    """
+    stats = dict(_payload_stats())
+    _thread_figures.payload = {'images': 0, 'bytes': 0}
+    return stats
+
+
+def show_figure(fig):
+    """Apresenta a figura na qualidade activa e liberta-a de seguida
+    """
+    quality = current_render_quality()
+    show_image(figure_to_bytes(fig, fmt=quality['format'], dpi=quality['dpi']), fmt=quality['format'])
+
+
+@contextmanager
+def figure(*args, **kwargs):
+    """Contexto que cria a figura, apresenta-a à saída e garante que é fechada
+    """
+    fig, axes = new_figure(*args, **kwargs)
+    try:
+        yield fig, axes
+    except BaseException:
+        close_figure(fig)
+        raise
+    show_figure(fig)
+
+
+def close_all_figures():
+    """Fecha as figuras órfãs desta thread (ex.: após uma excepção) e devolve quantas eram
+
+    Só fecha figuras criadas pela thread actual, para não interferir com outras
+    sessões que estejam a desenhar em simultâneo.
+    """
+    orphans = list(_open_figures())
+    for fig in orphans:
+        close_figure(fig)
+    return len(orphans)
+
+
+def live_figure_count():
+    """Número de figuras ainda abertas no gestor de figuras do pyplot
+    """
+    return len(plt.get_fignums())
+
+
+def figure_stats():
+    """Devolve os contadores de figuras criadas, fechadas e ainda activas
+    """
+    with _figure_stats_lock:
+        stats = dict(_figure_stats)
+    stats['live'] = live_figure_count()
+    return stats
+
+
+def current_chart_backend():
+    """Backend dos gráficos simples: 'vega-lite' (no browser) ou 'matplotlib'
+    """
+    if st.session_state.get('lightweight_charts', PLOT_CONFIG['chart_backend'] == 'vega-lite'):
+        return 'vega-lite'
+    return 'matplotlib'
+
+
+def _vega_color(color):
+    return color if isinstance(color, str) else to_hex(color)
+
+
+def bar_chart_spec(data, x, y, title, xlabel, ylabel, color=None,
+                   group=None, group_colors=None, value_format='d'):
+    """Especificação Vega-Lite de um gráfico de barras (simples ou agrupado por `group`)
+
+    `data` é um DataFrame em formato longo com poucas linhas (valores já agregados);
+    `group_colors` é um dicionário categoria -> cor, pela ordem de apresentação.
+    """
+    encoding = {
+        'x': {'field': x, 'type': 'nominal', 'title': xlabel,
+              'sort': list(dict.fromkeys(data[x])), 'axis': {'labelAngle': 0}},
+        'y': {'field': y, 'type': 'quantitative', 'title': ylabel},
+    }
+    bar_encoding = {}
+    if group:
+        encoding['xOffset'] = {'field': group, 'sort': list(group_colors)}
+        bar_encoding['color'] = {
+            'field': group, 'type': 'nominal', 'title': None,
+            'scale': {'domain': list(group_colors),
+                      'range': [_vega_color(c) for c in group_colors.values()]},
+        }
+    bar_mark = {'type': 'bar'}
+    if color is not None:
+        bar_mark['color'] = _vega_color(color)
+
+    return {
+        'title': title,
+        'encoding': encoding,
+        'layer': [
+            {'mark': bar_mark, 'encoding': bar_encoding},
+            {'mark': {'type': 'text', 'dy': -8, 'fontWeight': 'bold'},
+             'encoding': {'text': {'field': y, 'type': 'quantitative', 'format': value_format}}},
+        ],
+    }
+
+
+def pie_chart_spec(data, category, value, title, category_colors):
+    """Especificação Vega-Lite de um gráfico circular com percentagens
+    """
+    return {
+        'title': title,
+        'transform': [
+            {'joinaggregate': [{'op': 'sum', 'field': value, 'as': '_total'}]},
+            {'calculate': f"datum['{value}'] / datum._total", 'as': '_share'},
+        ],
+        'encoding': {
+            'theta': {'field': value, 'type': 'quantitative', 'stack': True},
+            'color': {
+                'field': category, 'type': 'nominal', 'title': None,
+                'scale': {'domain': list(category_colors),
+                          'range': [_vega_color(c) for c in category_colors.values()]},
+            },
+        },
+        'layer': [
+            {'mark': {'type': 'arc', 'outerRadius': 140}},
+            {'mark': {'type': 'text', 'radius': 100, 'fontWeight': 'bold'},
+             'encoding': {'text': {'field': '_share', 'type': 'quantitative', 'format': '.1%'}}},
+        ],
+    }
+
+
+def show_chart(data, spec, fallback):
+    """Apresenta um gráfico simples pelo backend activo
+
+    Com o Vega-Lite o servidor envia apenas os dados agregados e a especificação
+    JSON (algumas centenas de bytes) e o browser desenha o gráfico; com o
+    matplotlib, ou para gráficos complexos, chama-se `fallback` (função sem argumentos).
+    """
+    if current_chart_backend() != 'vega-lite':
+        fallback()
+        return
+
+    _record_payload(len(json.dumps(spec)) + len(data.to_json(orient='records')))
+    st.vega_lite_chart(data, spec, use_container_width=True)
+
+
 def format_currency(value):
     """Formata valor para moeda (£)
     """
@@ -42,4 +290,4 @@ def format_currency(value):
 def format_percentage(value):
     """Formata valor para percentagem
     """
-    return f"{value:.1f}%"
\ No newline at end of file
+    return f"{value:.1f}%"